@@ -197,8 +197,20 @@ const updateResultView = (result) => {
   }
 
   iqEl.textContent = `IQ estimado: ${result.iq}`;
-  labelEl.textContent = result.label;
+  if (result.percentile == null) {
+    labelEl.textContent = result.label;
+  } else if (result.percentile_source === 'normal') {
+    // Sin muestra suficiente el percentil sale de la curva normal, no de otros participantes.
+    labelEl.textContent = `${result.label} · percentil estimado ${Math.round(result.percentile)} (referencia teórica)`;
+  } else {
+    labelEl.textContent = `${result.label} · supera al ${Math.round(result.percentile)}% de quienes terminaron el test`;
+  }
   scoreEl.textContent = `Score: ${result.score}`;
+  const shareEl = document.getElementById('result-share');
+  if (shareEl && result.share_url) {
+    shareEl.href = result.share_url;
+    shareEl.classList.remove('d-none');
+  }
   const pct = Math.min(100, Math.max(0, ((result.iq - 80) / 70) * 100));
   markerEl.style.left = `${pct}%`;
 };
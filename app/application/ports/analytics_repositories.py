@@ -0,0 +1,24 @@
+from typing import List, Optional, Protocol
+
+from app.domain.entities.test_analytics import TestAnalytics
+
+
+class TestAnalyticsRepository(Protocol):
+    """Puerto para analytics por test y versión (IQ, Stroop, mixto)."""
+
+    def record(
+        self,
+        test: str,
+        version: int,
+        event: str,
+        duration_sec: int = 0,
+        profile: Optional[str] = None,
+        score: Optional[float] = None,
+    ) -> None:
+        ...
+
+    def get_stats(self, test: str, version: Optional[int] = None) -> TestAnalytics:
+        ...
+
+    def list_stats(self) -> List[TestAnalytics]:
+        ...
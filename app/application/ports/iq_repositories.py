@@ -1,8 +1,10 @@
-from typing import Optional, Protocol, Sequence
+from typing import Dict, List, Optional, Protocol, Sequence
 
-from app.domain.entities.iq_analytics import IqAnalytics
 from app.domain.entities.iq_item import IqItem
+from app.domain.entities.iq_item_stats import IqItemStats
 from app.domain.entities.iq_session import IqSession
+from app.domain.value_objects.item_bank import ItemBank
+from app.domain.value_objects.norm_table import NormTable
 
 
 class IqSessionRepository(Protocol):
@@ -11,20 +13,29 @@ class IqSessionRepository(Protocol):
     def save(self, session: IqSession) -> None:
         ...
 
+    def save_many(self, sessions: Sequence[IqSession]) -> None:
+        ...
+
     def get(self, session_id: str) -> Optional[IqSession]:
         ...
 
+    def count(self) -> int:
+        ...
+
+    def evict_idle(self, max_idle_sec: float) -> List[IqSession]:
+        ...
 
-class IqAnalyticsRepository(Protocol):
-    """Puerto para métricas de IQ."""
 
-    def increment_start(self) -> None:
+class IqItemStatsRepository(Protocol):
+    """Puerto para estadísticas psicométricas por ítem."""
+
+    def record_answer(self, item_id: str, correct: bool, seconds: float, timed_out: bool) -> None:
         ...
 
-    def increment_finish(self, duration_sec: int, band: str) -> None:
+    def record_outcome(self, item_id: str, correct: bool, theta: float) -> None:
         ...
 
-    def get_stats(self) -> IqAnalytics:
+    def get_all(self) -> Dict[str, IqItemStats]:
         ...
 
 
@@ -33,3 +44,23 @@ class IqItemProvider(Protocol):
 
     def get_pool(self) -> Sequence[IqItem]:
         ...
+
+    def get_bank(self, version: Optional[str] = None) -> ItemBank:
+        """Banco vigente, o el de `version` si sigue disponible (sesiones iniciadas antes de una recarga)."""
+        ...
+
+
+class NormRepository(Protocol):
+    """Puerto para muestras de resultados y tablas de normas por grupo (test + modo de scoring)."""
+
+    def add_sample(self, norm_key: str, theta: float) -> None:
+        ...
+
+    def samples(self) -> Dict[str, List[float]]:
+        ...
+
+    def get_table(self, norm_key: str) -> Optional[NormTable]:
+        ...
+
+    def set_table(self, norm_key: str, table: NormTable) -> None:
+        ...
@@ -0,0 +1,33 @@
+from typing import Dict, List, Optional, Protocol
+
+from app.domain.entities.questionnaire_session import QuestionnaireSession
+
+
+class QuestionnaireSource(Protocol):
+    """Puerto para leer definiciones de cuestionarios (tests / test_versions / questions / options / profiles)."""
+
+    def list_published(self) -> List[Dict]:
+        ...
+
+    def published_version(self, slug: str) -> Optional[int]:
+        ...
+
+    def load(self, slug: str, version: int) -> Optional[Dict]:
+        """Definición completa de una versión, con las columnas `*_json` tal como en la base."""
+        ...
+
+
+class QuestionnaireSessionRepository(Protocol):
+    """Puerto para persistir sesiones de cuestionarios."""
+
+    def save(self, session: QuestionnaireSession) -> None:
+        ...
+
+    def get(self, session_id: str) -> Optional[QuestionnaireSession]:
+        ...
+
+    def count(self) -> int:
+        ...
+
+    def evict_idle(self, max_idle_sec: float) -> List[QuestionnaireSession]:
+        ...
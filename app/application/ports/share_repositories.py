@@ -0,0 +1,56 @@
+from typing import Optional, Protocol, Tuple
+
+from app.domain.entities.share_result import ShareResult
+
+
+class ShareResultRepository(Protocol):
+    """Puerto para persistir resultados compartidos (`share_results`)."""
+
+    def save(self, share: ShareResult) -> None:
+        ...
+
+    def get(self, share_token: str) -> Optional[ShareResult]:
+        ...
+
+
+class SharePageRenderer(Protocol):
+    """Puerto para renderizar la página pública (HTML) de un resultado compartido."""
+
+    def render(self, share: ShareResult) -> bytes:
+        ...
+
+
+class SharePageStore(Protocol):
+    """Puerto para guardar páginas ya renderizadas por token, con su ETag."""
+
+    def get(self, share_token: str) -> Optional[Tuple[bytes, str]]:
+        ...
+
+    def put(self, share_token: str, page: bytes) -> str:
+        ...
+
+
+class ShareCardRenderer(Protocol):
+    """Puerto para la imagen de vista previa (Open Graph) de un resultado compartido."""
+
+    media_type: str
+
+    def render(self, share: ShareResult) -> bytes:
+        ...
+
+
+class ShareCardCache(Protocol):
+    """Puerto para las tarjetas ya renderizadas: una por token, generadas fuera del request."""
+
+    media_type: str
+
+    def get(self, share_token: str) -> Optional[Tuple[bytes, str]]:
+        ...
+
+    def prerender(self, share: ShareResult) -> None:
+        """Encola el render (sin esperar); no hace nada si la tarjeta ya existe o está en curso."""
+        ...
+
+    def render(self, share: ShareResult) -> Tuple[bytes, str]:
+        """Devuelve la tarjeta, esperando el render del pool si todavía no existe."""
+        ...
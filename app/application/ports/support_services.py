@@ -1,4 +1,7 @@
-from typing import Protocol
+from typing import Dict, Iterator, Optional, Protocol, Tuple
+
+from app.domain.services.hyperloglog import HyperLogLog
+from app.domain.services.quantile_sketch import DDSketch
 
 
 class TipProvider(Protocol):
@@ -13,3 +16,57 @@ class DbHealthChecker(Protocol):
 
     def check(self) -> bool:
         ...
+
+
+class EventJournal(Protocol):
+    """Puerto para el journal de eventos de sesión (start, answer, finish, abandon)."""
+
+    def record(self, test: str, version: int, event: str, session_id: str, data: Optional[Dict] = None) -> None:
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        ...
+
+
+class QuantileSketchRepository(Protocol):
+    """Puerto para sketches de cuantiles por test e ítem (duraciones y tiempos de respuesta)."""
+
+    def observe(self, scope: str, key: str, metric: str, value: float) -> None:
+        ...
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], DDSketch]:
+        ...
+
+
+class VisitorSketchRepository(Protocol):
+    """Puerto para visitantes únicos aproximados por día / test / campaign."""
+
+    def add(self, test: str, campaign: Optional[str], visitor: str) -> None:
+        ...
+
+    def snapshot(self) -> Dict[Tuple[str, str, str], HyperLogLog]:
+        ...
+
+
+class SessionEventSource(Protocol):
+    """Puerto para leer en streaming los eventos de sesión registrados (journal)."""
+
+    def iter_events(self, since: Optional[float], until: Optional[float], test: Optional[str]) -> Iterator[Dict]:
+        ...
+
+
+class MatrixImageRenderer(Protocol):
+    """Puerto para las imágenes SVG de matrices procedurales (grilla `base` u opción `a`-`d`)."""
+
+    def etag(self, token: str, part: str) -> str:
+        ...
+
+    def render(self, token: str, part: str) -> Tuple[bytes, str]:
+        ...
+
+
+class ImageSource(Protocol):
+    """Puerto para leer el SVG detrás de una URL de imagen de ítem (estática o procedural)."""
+
+    def load(self, url: str) -> Optional[bytes]:
+        ...
@@ -0,0 +1,39 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.application.services.matrix_image_bundler import MatrixImageBundler
+from app.domain.entities.iq_item import IqItem
+from app.domain.value_objects.iq_config import IqConfig
+
+
+class IqItemSerializer:
+    """Serializa ítems IQ para la API y cachea el payload por ítem (los ítems son inmutables)."""
+
+    def __init__(self, bundler: Optional[MatrixImageBundler] = None) -> None:
+        self._bundler = bundler
+        # (item_id, time_limit) -> (ítem, payload): tras una recarga del banco el mismo id puede ser otro ítem,
+        # y versiones con otros tiempos límite conviven sin pisarse.
+        self._cache: Dict[Tuple[str, int], Tuple[IqItem, Dict]] = {}
+
+    def serialize(self, item: IqItem, config: IqConfig) -> Dict:
+        """Payload del ítem con el tiempo límite de `config` (la de la versión de la sesión)."""
+        time_limit = config.time_limits[item.difficulty]
+        key = (item.item_id, time_limit)
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] is item:
+            return cached[1]
+        visual, options = self._bundler.bundle(item) if self._bundler else (item.visual, item.options)
+        payload = {
+            "item_id": item.item_id,
+            "domain": item.domain,
+            "difficulty": item.difficulty,
+            "prompt": item.prompt,
+            "options": options,
+            "time_limit": time_limit,
+            "visual": visual,
+        }
+        self._cache[key] = (item, payload)
+        return payload
+
+    def warm(self, pool: Iterable[IqItem], config: IqConfig) -> None:
+        for item in pool:
+            self.serialize(item, config)
@@ -0,0 +1,118 @@
+import hashlib
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from app.application.ports.support_services import ImageSource
+from app.domain.entities.iq_item import IqItem
+
+IMAGE_MODES = ("url", "inline", "sprite")
+
+_COMMENT_RE = re.compile(r"<!--.*?-->|<\?xml.*?\?>", re.S)
+_BETWEEN_TAGS_RE = re.compile(r">\s+<")
+_SPACES_RE = re.compile(r"\s+")
+_SIZE_RE = re.compile(r'<svg\b[^>]*?\bwidth="([\d.]+)"[^>]*?\bheight="([\d.]+)"')
+
+
+def minify_svg(svg: str) -> str:
+    svg = _COMMENT_RE.sub("", svg)
+    svg = _BETWEEN_TAGS_RE.sub("><", svg)
+    return _SPACES_RE.sub(" ", svg).replace(" />", "/>").strip()
+
+
+def svg_data_uri(svg: str) -> str:
+    # URL-encoding mínimo (más corto que base64): comillas simples y sólo los caracteres conflictivos escapados.
+    return "data:image/svg+xml," + quote(svg.replace('"', "'"), safe=" '=:/,;.-()")
+
+
+class MatrixImageBundler:
+    """Reescribe las imágenes de un ítem visual: data URIs inline o un sprite SVG por ítem (un solo fetch).
+
+    Los SVG se minifican una vez y quedan cacheados; `IqItemSerializer.warm` los precalcula al arrancar.
+    """
+
+    def __init__(
+        self, source: ImageSource, mode: str = "url", sprite_url: str = "/api/iq/sprite/{item_id}.svg"
+    ) -> None:
+        if mode not in IMAGE_MODES:
+            raise ValueError(f"modo de imágenes desconocido: {mode}")
+        self.mode = mode
+        self._source = source
+        self._sprite_url = sprite_url
+        self._lock = threading.Lock()
+        self._minified: Dict[str, Optional[str]] = {}
+        # item_id -> (ítem, svg, etag)
+        self._sprites: Dict[str, Tuple[IqItem, bytes, str]] = {}
+
+    def bundle(self, item: IqItem) -> Tuple[Optional[dict], List]:
+        """Devuelve (visual, options) listos para el payload; sin imágenes o en modo url, los originales."""
+        parts = _image_parts(item)
+        if self.mode == "url" or not parts:
+            return item.visual, item.options
+        if self.mode == "inline":
+            urls = {url: self._inline(url) for _, url in parts}
+        else:
+            _, etag = self.sprite(item)
+            base = f"{self._sprite_url.format(item_id=quote(item.item_id))}?v={etag}"
+            urls = {url: f"{base}#{part}" for part, url in parts}
+        visual = item.visual
+        if visual and visual.get("base", {}).get("src") in urls:
+            visual = {**visual, "base": {**visual["base"], "src": urls[visual["base"]["src"]]}}
+        options = [
+            {**option, "image": urls[option["image"]]} if isinstance(option, dict) and option.get("image") in urls
+            else option
+            for option in item.options
+        ]
+        return visual, options
+
+    def sprite(self, item: IqItem) -> Tuple[bytes, str]:
+        """SVG con todas las imágenes del ítem apiladas y una `<view>` por parte (`#base`, `#o0`...)."""
+        cached = self._sprites.get(item.item_id)
+        if cached is not None and cached[0] is item:
+            return cached[1], cached[2]
+        children, views = [], []
+        y = width = 0.0
+        for part, url in _image_parts(item):
+            svg = self._load(url)
+            size = _SIZE_RE.search(svg) if svg else None
+            if size is None:
+                continue
+            w, h = float(size.group(1)), float(size.group(2))
+            children.append(svg.replace("<svg", f'<svg x="0" y="{y:g}"', 1))
+            views.append(f'<view id="{part}" viewBox="0 {y:g} {w:g} {h:g}"/>')
+            y += h
+            width = max(width, w)
+        sprite = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width:g}" height="{y:g}" viewBox="0 0 {width:g} {y:g}">'
+            + "".join(views) + "".join(children) + "</svg>"
+        ).encode("utf-8")
+        etag = hashlib.blake2b(sprite, digest_size=12).hexdigest()
+        with self._lock:
+            self._sprites[item.item_id] = (item, sprite, etag)
+        return sprite, etag
+
+    def _inline(self, url: str) -> str:
+        svg = self._load(url)
+        return svg_data_uri(svg) if svg is not None else url
+
+    def _load(self, url: str) -> Optional[str]:
+        if url in self._minified:
+            return self._minified[url]
+        raw = self._source.load(url)
+        svg = minify_svg(raw.decode("utf-8")) if raw is not None else None
+        with self._lock:
+            self._minified[url] = svg
+        return svg
+
+
+def _image_parts(item: IqItem) -> List[Tuple[str, str]]:
+    # (id de la parte en el sprite, url): la grilla y cada opción con imagen.
+    parts = []
+    base = (item.visual or {}).get("base") or {}
+    if base.get("src"):
+        parts.append(("base", base["src"]))
+    for index, option in enumerate(item.options):
+        if isinstance(option, dict) and option.get("image"):
+            parts.append((f"o{index}", option["image"]))
+    return parts
@@ -0,0 +1,57 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.application.ports.questionnaire_repositories import QuestionnaireSource
+from app.domain.exceptions import QuestionnaireNotFoundError
+from app.domain.services.questionnaire_engine import CompiledQuestionnaire, compile_questionnaire
+from app.domain.value_objects.test_catalog import TEST_SLUGS
+
+
+class QuestionnaireCatalog:
+    """Compila cada versión de cuestionario una sola vez y la cachea (las versiones publicadas no cambian)."""
+
+    def __init__(self, source: QuestionnaireSource, published_ttl_sec: float = 60.0) -> None:
+        self._source = source
+        self._published_ttl_sec = published_ttl_sec
+        self._lock = threading.Lock()
+        self._compiled: Dict[Tuple[str, int], CompiledQuestionnaire] = {}
+        # slug -> (versión publicada, vence): la publicación de una versión nueva se ve a lo sumo tras el TTL.
+        self._published: Dict[str, Tuple[Optional[int], float]] = {}
+
+    def get(self, slug: str, version: Optional[int] = None) -> CompiledQuestionnaire:
+        if slug in TEST_SLUGS:
+            # IQ/Stroop/mixto comparten la fuente (sólo su config_json) pero tienen motor propio.
+            raise QuestionnaireNotFoundError(slug)
+        if version is None:
+            version = self._published_version(slug)
+            if version is None:
+                raise QuestionnaireNotFoundError(slug)
+        compiled = self._compiled.get((slug, version))
+        if compiled is not None:
+            return compiled
+        with self._lock:
+            compiled = self._compiled.get((slug, version))
+            if compiled is None:
+                definition = self._source.load(slug, version)
+                if definition is None:
+                    raise QuestionnaireNotFoundError(f"{slug} v{version}")
+                compiled = compile_questionnaire(definition)
+                self._compiled[(slug, version)] = compiled
+        return compiled
+
+    def list_published(self) -> List[Dict]:
+        return [test for test in self._source.list_published() if test["slug"] not in TEST_SLUGS]
+
+    def is_published(self, slug: str) -> bool:
+        """Cuestionario con versión publicada (consulta cacheada por TTL, apta para validar cada request)."""
+        return slug not in TEST_SLUGS and self._published_version(slug) is not None
+
+    def _published_version(self, slug: str) -> Optional[int]:
+        cached = self._published.get(slug)
+        now = time.monotonic()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        version = self._source.published_version(slug)
+        self._published[slug] = (version, now + self._published_ttl_sec)
+        return version
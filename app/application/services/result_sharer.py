@@ -0,0 +1,61 @@
+import secrets
+from typing import Dict, Optional, Sequence
+
+from app.application.ports.share_repositories import (
+    ShareCardCache,
+    SharePageRenderer,
+    SharePageStore,
+    ShareResultRepository,
+)
+from app.domain.entities.share_result import ShareResult
+
+SHARE_PATH = "/r/"
+CARD_SUFFIX = "/card"
+
+
+class ResultSharer:
+    """Emite el token de un resultado al finalizar y deja su página pública ya renderizada."""
+
+    def __init__(
+        self,
+        repo: ShareResultRepository,
+        renderer: SharePageRenderer,
+        store: SharePageStore,
+        cards: Optional[ShareCardCache] = None,
+    ) -> None:
+        self._repo = repo
+        self._renderer = renderer
+        self._store = store
+        self._cards = cards
+
+    def share(
+        self,
+        session_id: str,
+        test_slug: str,
+        version: int,
+        test_title: str,
+        profile_code: Optional[str],
+        title: str,
+        summary: Optional[str] = None,
+        recommendations: Sequence[str] = (),
+        score: Optional[float] = None,
+    ) -> Dict[str, str]:
+        share = ShareResult(
+            share_token=secrets.token_urlsafe(12),
+            session_id=session_id,
+            test_slug=test_slug,
+            version=version,
+            test_title=test_title,
+            profile_code=(profile_code or test_slug)[:20],
+            title=title,
+            summary=summary,
+            recommendations=tuple(recommendations),
+            score=score,
+        )
+        self._repo.save(share)
+        # Se renderiza una sola vez acá: el tráfico de la página compartida no recalcula ni toca la sesión.
+        self._store.put(share.share_token, self._renderer.render(share))
+        if self._cards is not None:
+            # La tarjeta OG se genera en el pool: el finish no espera y el primer crawler ya la encuentra.
+            self._cards.prerender(share)
+        return {"share_token": share.share_token, "share_url": SHARE_PATH + share.share_token}
@@ -0,0 +1,55 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from app.application.ports.questionnaire_repositories import QuestionnaireSource
+from app.domain.exceptions import InvalidTestConfigError
+from app.domain.value_objects.test_catalog import DEFAULT_TEST_VERSION
+from app.domain.value_objects.test_config import TestVersionConfig
+
+
+class TestConfigRegistry:
+    """Config congelada por (test, versión): se valida una vez y cada request la obtiene con un lookup O(1).
+
+    Lee `config_json` de la misma fuente que los cuestionarios (tabla test_versions o archivos JSON); una
+    versión sin fila usa los defaults. Las versiones no cambian una vez publicadas, así que no se invalidan.
+    """
+
+    def __init__(self, source: Optional[QuestionnaireSource] = None, published_ttl_sec: float = 60.0) -> None:
+        self._source = source
+        self._published_ttl_sec = published_ttl_sec
+        self._lock = threading.Lock()
+        self._configs: Dict[Tuple[str, int], TestVersionConfig] = {}
+        self._published: Dict[str, Tuple[int, float]] = {}
+
+    def get(self, test_slug: str, version: int) -> TestVersionConfig:
+        config = self._configs.get((test_slug, version))
+        if config is not None:
+            return config
+        with self._lock:
+            config = self._configs.get((test_slug, version))
+            if config is None:
+                config = self._build(test_slug, version)
+                self._configs[(test_slug, version)] = config
+        return config
+
+    def current(self, test_slug: str) -> TestVersionConfig:
+        """Config de la versión publicada: la que toman las sesiones nuevas."""
+        return self.get(test_slug, self._published_version(test_slug))
+
+    def _build(self, test_slug: str, version: int) -> TestVersionConfig:
+        definition = self._source.load(test_slug, version) if self._source is not None else None
+        try:
+            return TestVersionConfig.build(test_slug, version, (definition or {}).get("config_json"))
+        except (TypeError, ValueError) as exc:
+            raise InvalidTestConfigError(f"{test_slug} v{version}: {exc}") from exc
+
+    def _published_version(self, test_slug: str) -> int:
+        cached = self._published.get(test_slug)
+        now = time.monotonic()
+        if cached is not None and cached[1] > now:
+            return cached[0]
+        version = self._source.published_version(test_slug) if self._source is not None else None
+        version = version or DEFAULT_TEST_VERSION
+        self._published[test_slug] = (version, now + self._published_ttl_sec)
+        return version
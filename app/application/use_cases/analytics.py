@@ -1,51 +1,207 @@
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 
-from app.application.ports.iq_repositories import IqAnalyticsRepository
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.iq_repositories import IqItemProvider, IqItemStatsRepository
+from app.application.ports.support_services import QuantileSketchRepository, VisitorSketchRepository
+from app.domain.entities.iq_item_stats import IqItemStats
+from app.domain.entities.test_analytics import SCORE_BUCKET
+from app.domain.services.hyperloglog import HyperLogLog
+from app.domain.services.item_exposure import SympsonHetterExposure
+from app.domain.services.quantile_sketch import DDSketch
+from app.domain.value_objects.test_catalog import IQ_TEST_SLUG
+
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+
+
+def _quantiles(sketch: Optional[DDSketch]) -> Dict:
+    if sketch is None:
+        return {"count": 0, **{name: None for name, _ in QUANTILES}}
+    values = {name: sketch.quantile(q) for name, q in QUANTILES}
+    return {"count": sketch.count, **{name: round(v, 2) for name, v in values.items()}}
 
 
 class GetAnalyticsSummaryUseCase:
-    """Caso de uso: resumen de analytics IQ."""
+    """Caso de uso: resumen de analytics de un test (default IQ)."""
 
-    def __init__(self, analytics_repo: IqAnalyticsRepository) -> None:
+    def __init__(self, analytics_repo: TestAnalyticsRepository, sketches: QuantileSketchRepository) -> None:
         self._analytics_repo = analytics_repo
+        self._sketches = sketches
 
-    def execute(self, days: int) -> Dict:
-        stats = self._analytics_repo.get_stats()
-        finish_rate = (stats.finishes / stats.starts) if stats.starts else 0
-        avg_time = (stats.total_time_sec / stats.finishes) if stats.finishes else 0
+    def execute(self, days: int, test: str = IQ_TEST_SLUG, version: Optional[int] = None) -> Dict:
+        stats = self._analytics_repo.get_stats(test, version)
+        active_tests = sum(1 for test_stats in self._analytics_repo.list_stats() if test_stats.starts)
+        durations = _quantiles(self._sketches.snapshot().get(("test", test, "duration_sec")))
         return {
-            "active_tests": 1,
-            "finish_rate": round(finish_rate * 100, 1),
-            "avg_time_sec": int(avg_time),
+            "active_tests": active_tests,
+            "finish_rate": round(stats.finish_rate * 100, 1),
+            "avg_time_sec": int(stats.avg_time_sec),
+            **{f"time_sec_{name}": durations[name] for name, _ in QUANTILES},
         }
 
 
-class GetAnalyticsFunnelUseCase:
-    """Caso de uso: funnel simple de IQ."""
+class GetAnalyticsTestsUseCase:
+    """Caso de uso: comparación lado a lado de todos los tests con datos."""
 
-    def __init__(self, analytics_repo: IqAnalyticsRepository) -> None:
+    def __init__(self, analytics_repo: TestAnalyticsRepository) -> None:
         self._analytics_repo = analytics_repo
 
     def execute(self, days: int) -> Dict:
-        stats = self._analytics_repo.get_stats()
+        tests = []
+        for stats in sorted(self._analytics_repo.list_stats(), key=lambda s: s.test):
+            mean_score = stats.mean_score
+            tests.append({
+                "test": stats.test,
+                "starts": stats.starts,
+                "finishes": stats.finishes,
+                "finish_rate": round(stats.finish_rate * 100, 1),
+                "avg_time_sec": int(stats.avg_time_sec),
+                "mean_score": round(mean_score, 1) if mean_score is not None else None,
+                "profiles": stats.profiles,
+                "scores": {
+                    "bucket": SCORE_BUCKET,
+                    "labels": sorted(stats.score_histogram),
+                    "values": [stats.score_histogram[b] for b in sorted(stats.score_histogram)],
+                },
+            })
+        return {"tests": tests}
+
+
+class GetAnalyticsQuantilesUseCase:
+    """Caso de uso: p50/p90/p99 de duraciones y tiempos de respuesta por test e ítem."""
+
+    def __init__(self, sketches: QuantileSketchRepository) -> None:
+        self._sketches = sketches
+
+    def execute(self, days: int) -> Dict:
+        tests: Dict[str, Dict] = {}
+        items: Dict[str, Dict] = {}
+        for (scope, key, metric), sketch in sorted(self._sketches.snapshot().items()):
+            target = tests if scope == "test" else items
+            target.setdefault(key, {})[metric] = _quantiles(sketch)
+        return {"tests": tests, "items": items}
+
+
+class GetAnalyticsFunnelUseCase:
+    """Caso de uso: funnel simple de un test."""
+
+    def __init__(self, analytics_repo: TestAnalyticsRepository) -> None:
+        self._analytics_repo = analytics_repo
+
+    def execute(self, days: int, test: str = IQ_TEST_SLUG, version: Optional[int] = None) -> Dict:
+        stats = self._analytics_repo.get_stats(test, version)
         labels = ["Start", "Finish"]
         values = [stats.starts, stats.finishes]
         return {"labels": labels, "values": values}
 
 
 class GetAnalyticsProfilesUseCase:
-    """Caso de uso: distribución de perfiles IQ."""
+    """Caso de uso: distribución de perfiles de un test (bandas en IQ)."""
 
-    def __init__(self, analytics_repo: IqAnalyticsRepository) -> None:
+    def __init__(self, analytics_repo: TestAnalyticsRepository) -> None:
         self._analytics_repo = analytics_repo
 
-    def execute(self, days: int) -> Dict:
-        stats = self._analytics_repo.get_stats()
-        labels = list(stats.iq_bands.keys())
-        values = [stats.iq_bands[label] for label in labels]
+    def execute(self, days: int, test: str = IQ_TEST_SLUG, version: Optional[int] = None) -> Dict:
+        stats = self._analytics_repo.get_stats(test, version)
+        labels = list(stats.profiles.keys())
+        values = [stats.profiles[label] for label in labels]
         return {"labels": labels, "values": values}
 
 
+class GetAnalyticsItemsUseCase:
+    """Caso de uso: estadísticas psicométricas por ítem IQ, con alertas de ítems problemáticos."""
+
+    EASY_P = 0.95
+    HARD_P = 0.10
+    MIN_DISCRIMINATION = 0.10
+    MIN_EXPOSURES = 30
+    MIN_SCORED = 30
+
+    def __init__(
+        self, item_stats: IqItemStatsRepository, item_provider: IqItemProvider, exposure: SympsonHetterExposure
+    ) -> None:
+        self._item_stats = item_stats
+        self._item_provider = item_provider
+        self._exposure = exposure
+
+    def execute(self, days: int) -> Dict:
+        stats = self._item_stats.get_all()
+        rates = self._exposure.rates()
+        items: List[Dict] = []
+        for item in self._item_provider.get_pool():
+            exposure = rates.get(item.item_id, {"exposure_rate": 0.0, "k": 1.0})
+            row = {
+                "item_id": item.item_id,
+                "domain": item.domain,
+                "difficulty": item.difficulty,
+                "exposures": 0,
+                "exposure_rate": round(exposure["exposure_rate"], 4),
+                "exposure_k": round(exposure["k"], 4),
+            }
+            item_stats = stats.get(item.item_id)
+            if item_stats is None or not item_stats.exposures:
+                items.append({**row, "flags": []})
+                continue
+            variance = item_stats.rt_variance
+            r_pb = item_stats.point_biserial
+            items.append({
+                **row,
+                "exposures": item_stats.exposures,
+                "p_value": round(item_stats.p_value, 3),
+                "rt_mean_sec": round(item_stats.rt_mean, 2),
+                "rt_sd_sec": round(variance ** 0.5, 2) if variance is not None else None,
+                "timeout_rate": round(item_stats.timeout_rate, 3),
+                "scored": item_stats.scored,
+                "point_biserial": round(r_pb, 3) if r_pb is not None else None,
+                "flags": self._flags(item_stats, r_pb),
+            })
+        return {"items": items}
+
+    def _flags(self, item_stats: IqItemStats, r_pb: Optional[float]) -> List[str]:
+        flags = []
+        if item_stats.exposures >= self.MIN_EXPOSURES:
+            if item_stats.p_value >= self.EASY_P:
+                flags.append("too_easy")
+            if item_stats.p_value <= self.HARD_P:
+                flags.append("too_hard")
+        if item_stats.scored >= self.MIN_SCORED and r_pb is not None and r_pb < self.MIN_DISCRIMINATION:
+            flags.append("low_discrimination")
+        return flags
+
+
+class GetAnalyticsVisitorsUseCase:
+    """Caso de uso: visitantes únicos aproximados (HyperLogLog) en la ventana de días pedida."""
+
+    def __init__(self, visitors: VisitorSketchRepository) -> None:
+        self._visitors = visitors
+
+    def execute(self, days: int, test: Optional[str] = None, campaign: Optional[str] = None) -> Dict:
+        since = time.strftime("%Y-%m-%d", time.gmtime(time.time() - (days - 1) * 86400))
+        total: Optional[HyperLogLog] = None
+        by_day: Dict[str, HyperLogLog] = {}
+        by_test: Dict[str, HyperLogLog] = {}
+        by_campaign: Dict[str, HyperLogLog] = {}
+        for (day, test_slug, campaign_name), sketch in self._visitors.snapshot().items():
+            if day < since or (test and test_slug != test) or (campaign is not None and campaign_name != campaign):
+                continue
+            # Merge por máximo: un visitante que vuelve otro día o a otro test no se cuenta dos veces.
+            for groups, key in ((by_day, day), (by_test, test_slug), (by_campaign, campaign_name)):
+                if key in groups:
+                    groups[key].merge(sketch)
+                else:
+                    groups[key] = sketch.copy()
+            if total is None:
+                total = sketch.copy()
+            else:
+                total.merge(sketch)
+        return {
+            "unique_visitors": total.estimate() if total else 0,
+            "by_day": {day: sketch.estimate() for day, sketch in sorted(by_day.items())},
+            "by_test": {slug: sketch.estimate() for slug, sketch in sorted(by_test.items())},
+            "by_campaign": {name: sketch.estimate() for name, sketch in sorted(by_campaign.items())},
+        }
+
+
 class GetAnalyticsDropoffUseCase:
     """Caso de uso: dropoff placeholder."""
 
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from app.application.ports.support_services import SessionEventSource
+
+# dataset -> (eventos incluidos, columnas CSV)
+DATASETS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "sessions": (
+        ("start", "finish", "abandon"),
+        ("ts", "test", "version", "event", "session_id", "source", "campaign", "answers", "duration_sec", "idle_sec"),
+    ),
+    "answers": (
+        ("answer",),
+        (
+            "ts", "test", "version", "session_id", "item_id", "kind", "trial", "trial_type", "rule", "difficulty",
+            "correct", "seconds", "rt_ms", "changes", "timed_out",
+        ),
+    ),
+    "results": (
+        ("finish",),
+        (
+            "ts", "test", "version", "session_id", "source", "campaign", "duration_sec", "answers", "score", "iq",
+            "label", "band", "theta", "profile", "profile_code",
+        ),
+    ),
+}
+FORMATS = ("csv", "ndjson")
+
+_CHUNK_BYTES = 64 * 1024
+
+
+def export_window(
+    date_from: Optional[date], date_to: Optional[date]
+) -> Tuple[Optional[float], Optional[float]]:
+    """Días UTC `from`/`to` (ambos inclusivos) -> (since, until) en epoch; None deja el extremo abierto."""
+    since = _day_start_ts(date_from) if date_from else None
+    until = _day_start_ts(date_to + timedelta(days=1)) if date_to else None
+    return since, until
+
+
+def _day_start_ts(day: date) -> float:
+    return datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp()
+
+
+class ExportSessionDataUseCase:
+    """Caso de uso: exporta sesiones, respuestas o resultados en streaming (CSV o NDJSON)."""
+
+    def __init__(self, source: SessionEventSource) -> None:
+        self._source = source
+
+    def execute(
+        self,
+        dataset: str,
+        fmt: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        test: Optional[str] = None,
+    ) -> Iterator[str]:
+        if dataset not in DATASETS:
+            raise ValueError(f"dataset desconocido: {dataset}")
+        if fmt not in FORMATS:
+            raise ValueError(f"formato desconocido: {fmt}")
+        events, columns = DATASETS[dataset]
+        records = (r for r in self._source.iter_events(since, until, test) if r.get("event") in events)
+        if fmt == "ndjson":
+            return _chunked(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in records)
+        return _csv_chunks(records, columns)
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    """Agrupa líneas en chunks de ~64 KB: menos writes sin acumular el export en memoria."""
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= _CHUNK_BYTES:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _csv_chunks(records: Iterable[Dict], columns: Tuple[str, ...]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow([_csv_value(record.get(column)) for column in columns])
+        if buffer.tell() >= _CHUNK_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return value
@@ -1,13 +1,15 @@
 from typing import Dict, List, Sequence
 
-from app.application.ports.iq_repositories import IqItemProvider, IqSessionRepository
+from app.application.ports.iq_repositories import IqItemProvider, IqItemStatsRepository, IqSessionRepository
+from app.application.ports.support_services import EventJournal, QuantileSketchRepository
+from app.application.services.iq_item_serializer import IqItemSerializer
+from app.application.services.test_config_registry import TestConfigRegistry
 from app.domain.entities.iq_answer import IqAnswer
-from app.domain.entities.iq_item import IqItem
 from app.domain.entities.iq_session import IqSession
 from app.domain.exceptions import SessionNotFoundError
 from app.domain.services.iq_logic import IqSelectorService, IqScoringService
 from app.domain.services.iq_scoring_modes import IqScoringModesService
-from app.domain.value_objects.iq_config import IqConfig
+from app.domain.value_objects.test_catalog import IQ_TEST_SLUG
 
 
 class AnswerIqBlockUseCase:
@@ -20,49 +22,66 @@ class AnswerIqBlockUseCase:
         selector: IqSelectorService,
         scorer: IqScoringService,
         scorer_modes: IqScoringModesService,
-        config: IqConfig,
+        configs: TestConfigRegistry,
+        serializer: IqItemSerializer,
+        journal: EventJournal,
+        sketches: QuantileSketchRepository,
+        item_stats: IqItemStatsRepository,
     ) -> None:
         self._session_repo = session_repo
         self._item_provider = item_provider
         self._selector = selector
         self._scorer = scorer
         self._scorer_modes = scorer_modes
-        self._config = config
+        self._configs = configs
+        self._serializer = serializer
+        self._journal = journal
+        self._sketches = sketches
+        self._item_stats = item_stats
 
     def execute(self, session_id: str, answers: Sequence[IqAnswer]) -> Dict:
         session = self._session_repo.get(session_id)
         if not session:
             raise SessionNotFoundError(session_id)
 
-        pool = self._item_provider.get_pool()
+        # La sesión sigue con la config de la versión con la que arrancó aunque se publique otra.
+        config = self._configs.get(IQ_TEST_SLUG, session.version)
+        bank = self._item_provider.get_bank(session.bank_version)
         for answer in answers:
-            item = next((it for it in pool if it.item_id == answer.item_id), None)
+            item = bank.get(answer.item_id)
             if item:
-                self._scorer_modes.process_answer(session, item, answer)
+                self._scorer_modes.process_answer(session, item, answer, config.scoring)
+                correct = answer.answer == item.correct and not answer.timed_out
+                session.item_outcomes[item.item_id] = correct
+                self._sketches.observe("item", item.item_id, "seconds", answer.seconds)
+                self._item_stats.record_answer(item.item_id, correct, answer.seconds, answer.timed_out)
+                self._journal.record(
+                    IQ_TEST_SLUG,
+                    session.version,
+                    "answer",
+                    session.session_id,
+                    {
+                        "item_id": item.item_id,
+                        "difficulty": item.difficulty,
+                        "correct": correct,
+                        "seconds": answer.seconds,
+                        "changes": answer.changes,
+                        "timed_out": answer.timed_out,
+                    },
+                )
         # Scoring adaptativo previo (mantener dificultad/puntaje legacy)
-        self._scorer.apply_answers(session, answers, pool, self._config)
+        self._scorer.apply_answers(session, answers, bank.by_id, config.iq)
 
         if session.answers_count >= session.n_items:
             self._session_repo.save(session)
             return {"done": True}
 
         remaining = session.n_items - session.answers_count
-        block = self._selector.select_block(pool, session.difficulty, session.used_items, min(session.block_size, remaining))
+        block = self._selector.select_block(bank, session.difficulty, session.used_items, min(session.block_size, remaining))
         if not block:
             self._session_repo.save(session)
             return {"done": True}
 
         session.used_items.extend([item.item_id for item in block])
         self._session_repo.save(session)
-        return {"done": False, "block": [self._serialize_item(item) for item in block]}
-
-    def _serialize_item(self, item: IqItem) -> Dict:
-        return {
-            "item_id": item.item_id,
-            "domain": item.domain,
-            "difficulty": item.difficulty,
-            "prompt": item.prompt,
-            "options": item.options,
-            "time_limit": self._config.time_limits[item.difficulty],
-            "visual": item.visual,
-        }
+        return {"done": False, "block": [self._serializer.serialize(item, config.iq) for item in block]}
@@ -1,12 +1,16 @@
 import time
-from dataclasses import asdict
-from typing import Dict
+from typing import Dict, Optional
 
-from app.application.ports.iq_repositories import IqAnalyticsRepository, IqSessionRepository
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.iq_repositories import IqItemStatsRepository, IqSessionRepository, NormRepository
+from app.application.ports.support_services import EventJournal, QuantileSketchRepository
+from app.application.services.result_sharer import ResultSharer
+from app.application.services.test_config_registry import TestConfigRegistry
 from app.domain.exceptions import SessionNotFoundError
 from app.domain.services.iq_logic import IqBandingService
 from app.domain.services.iq_scoring_modes import IqScoringModesService
-from app.domain.value_objects.iq_config import IqConfig
+from app.domain.value_objects.norm_table import percentile_rank
+from app.domain.value_objects.test_catalog import IQ_TEST_SLUG, TEST_TITLES
 
 
 class FinishIqTestUseCase:
@@ -15,16 +19,28 @@ class FinishIqTestUseCase:
     def __init__(
         self,
         session_repo: IqSessionRepository,
-        analytics_repo: IqAnalyticsRepository,
+        analytics_repo: TestAnalyticsRepository,
         banding_service: IqBandingService,
         scorer_modes: IqScoringModesService,
-        config: IqConfig,
+        configs: TestConfigRegistry,
+        journal: EventJournal,
+        sketches: QuantileSketchRepository,
+        item_stats: IqItemStatsRepository,
+        norm_repo: NormRepository,
+        norm_min_samples: int = 200,
+        sharer: Optional[ResultSharer] = None,
     ) -> None:
         self._session_repo = session_repo
         self._analytics_repo = analytics_repo
         self._banding_service = banding_service
         self._scorer_modes = scorer_modes
-        self._config = config
+        self._configs = configs
+        self._journal = journal
+        self._sketches = sketches
+        self._item_stats = item_stats
+        self._norm_repo = norm_repo
+        self._norm_min_samples = norm_min_samples
+        self._sharer = sharer
 
     def execute(self, session_id: str) -> Dict:
         session = self._session_repo.get(session_id)
@@ -34,21 +50,84 @@ class FinishIqTestUseCase:
         if session.finished and session.result is not None:
             return session.result
 
-        scores = self._scorer_modes.finalize_scores(session)
+        params = self._configs.get(IQ_TEST_SLUG, session.version).scoring
+        scores = self._scorer_modes.finalize_scores(session, params)
         session.score = scores["score"]
         iq_theta = scores["theta"]
         duration = int(time.time() - session.started_at)
-        iq_value = max(70, min(145, int(round(100 + 15 * iq_theta))))
+        iq_value = _iq_value(iq_theta)
         label = self._banding_service.label(iq_value)
         band = self._banding_service.band(iq_value)
-        self._analytics_repo.increment_finish(duration_sec=duration, band=band)
+        self._analytics_repo.record(
+            IQ_TEST_SLUG, session.version, "finish", duration_sec=duration, profile=band, score=iq_value
+        )
+        self._sketches.observe("test", IQ_TEST_SLUG, "duration_sec", duration)
+        for item_id, correct in session.item_outcomes.items():
+            self._item_stats.record_outcome(item_id, correct, iq_theta)
+        # Percentil contra la tabla vigente (búsqueda binaria); la tabla se reconstruye en background.
+        norm_key = _norm_key(session.scoring_mode)
+        percentile, percentile_source = percentile_rank(
+            self._norm_repo.get_table(norm_key), iq_theta, self._norm_min_samples
+        )
+        # Sólo las sesiones completas alimentan la norma: un finish temprano deja theta en el prior o en el piso.
+        completed = session.answers_count >= session.n_items
+        if completed:
+            self._norm_repo.add_sample(norm_key, iq_theta)
 
         session.result = {
             "iq": iq_value,
             "label": label,
             "score": round(session.score, 2),
             "duration_sec": duration,
+            "percentile": round(percentile, 1),
+            "percentile_source": percentile_source,
         }
+        if self._sharer is not None:
+            session.result.update(
+                self._sharer.share(
+                    session.session_id,
+                    IQ_TEST_SLUG,
+                    session.version,
+                    TEST_TITLES[IQ_TEST_SLUG],
+                    profile_code=band,
+                    title=label,
+                    summary=f"IQ estimado: {iq_value}",
+                    score=iq_value,
+                )
+            )
+        shadow = self._scorer_modes.shadow_scores(session, params)
+        session.shadow_scores = {
+            str(mode): {"score": round(alt["score"], 2), "theta": round(alt["theta"], 4), "iq": _iq_value(alt["theta"])}
+            for mode, alt in shadow.items()
+        }
+        if completed:
+            for mode, alt in shadow.items():
+                # Los thetas de cada modo tienen escala propia: cada modo alimenta su propia norma.
+                self._norm_repo.add_sample(_norm_key(mode), alt["theta"])
         session.finished = True
         self._session_repo.save(session)
+        self._journal.record(
+            IQ_TEST_SLUG,
+            session.version,
+            "finish",
+            session.session_id,
+            {
+                "band": band,
+                "theta": round(iq_theta, 4),
+                "answers": session.answers_count,
+                "scoring_mode": session.scoring_mode,
+                "shadow_scores": session.shadow_scores,
+                "source": session.source,
+                "campaign": session.campaign,
+                **session.result,
+            },
+        )
         return session.result
+
+
+def _iq_value(theta: float) -> int:
+    return max(70, min(145, int(round(100 + 15 * theta))))
+
+
+def _norm_key(scoring_mode: int) -> str:
+    return f"{IQ_TEST_SLUG}:mode-{scoring_mode}"
@@ -1,13 +1,19 @@
 import time
 import uuid
-from dataclasses import asdict
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from app.application.ports.iq_repositories import IqAnalyticsRepository, IqItemProvider, IqSessionRepository
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.iq_repositories import IqItemProvider, IqSessionRepository
+from app.application.ports.support_services import EventJournal, VisitorSketchRepository
+from app.application.services.iq_item_serializer import IqItemSerializer
+from app.application.services.test_config_registry import TestConfigRegistry
 from app.domain.entities.iq_item import IqItem
 from app.domain.entities.iq_session import IqSession
 from app.domain.services.iq_logic import IqSelectorService
-from app.domain.value_objects.iq_config import IqConfig
+from app.domain.services.iq_scoring_modes import IqScoringModesService
+from app.domain.value_objects.item_bank import ItemBank
+from app.domain.value_objects.test_catalog import IQ_TEST_SLUG
+from app.domain.value_objects.test_config import TestVersionConfig
 
 
 class StartIqTestUseCase:
@@ -16,54 +22,115 @@ class StartIqTestUseCase:
     def __init__(
         self,
         session_repo: IqSessionRepository,
-        analytics_repo: IqAnalyticsRepository,
+        analytics_repo: TestAnalyticsRepository,
         item_provider: IqItemProvider,
         selector: IqSelectorService,
-        scoring_mode: int,
-        config: IqConfig,
+        scorer_modes: IqScoringModesService,
+        configs: TestConfigRegistry,
+        serializer: IqItemSerializer,
+        journal: EventJournal,
+        visitors: VisitorSketchRepository,
     ) -> None:
         self._session_repo = session_repo
         self._analytics_repo = analytics_repo
         self._item_provider = item_provider
         self._selector = selector
-        self._scoring_mode = scoring_mode
-        self._config = config
+        self._scorer_modes = scorer_modes
+        self._configs = configs
+        self._serializer = serializer
+        self._journal = journal
+        self._visitors = visitors
 
-    def execute(self, block_size: int) -> Dict:
-        pool = self._item_provider.get_pool()
+    def execute(
+        self,
+        block_size: int,
+        source: Optional[str] = None,
+        campaign: Optional[str] = None,
+        visitor: Optional[str] = None,
+    ) -> Dict:
+        # Las sesiones nuevas toman la versión publicada; la config ya viene compilada del registro.
+        config = self._configs.current(IQ_TEST_SLUG)
+        bank = self._item_provider.get_bank()
+        block = self._first_block(bank, config, block_size)
+        session = self._new_session(bank, config, block_size, block, source, campaign)
+        self._record_start(session, visitor)
+        self._session_repo.save(session)
+
+        return {
+            "session_id": session.session_id,
+            "block": [self._serializer.serialize(item, config.iq) for item in block],
+            "config": config.iq_payload,
+        }
+
+    def execute_bulk(
+        self,
+        count: int,
+        block_size: int,
+        source: Optional[str] = None,
+        campaign: Optional[str] = None,
+        visitor: Optional[str] = None,
+    ) -> Dict:
+        """Crea `count` sesiones de una vez (aula / kiosco): selección y serialización del bloque se hacen una vez."""
+        config = self._configs.current(IQ_TEST_SLUG)
+        bank = self._item_provider.get_bank()
+        block = self._first_block(bank, config, block_size, copies=count)
+        sessions = [self._new_session(bank, config, block_size, block, source, campaign) for _ in range(count)]
+        for session in sessions:
+            self._record_start(session, visitor)
+        self._session_repo.save_many(sessions)
+
+        return {
+            "session_ids": [session.session_id for session in sessions],
+            "block": [self._serializer.serialize(item, config.iq) for item in block],
+            "config": config.iq_payload,
+        }
+
+    def _first_block(
+        self, bank: ItemBank, config: TestVersionConfig, block_size: int, copies: int = 1
+    ) -> List[IqItem]:
+        # Toda sesión nueva arranca en dificultad 3 sin ítems usados: en bulk, un bloque sirve para todas.
+        return self._selector.select_block(bank, 3, [], min(block_size, config.iq.n_items), copies=copies)
+
+    def _new_session(
+        self,
+        bank: ItemBank,
+        config: TestVersionConfig,
+        block_size: int,
+        block: List[IqItem],
+        source: Optional[str],
+        campaign: Optional[str],
+    ) -> IqSession:
         session_id = str(uuid.uuid4())
-        session = IqSession(
+        return IqSession(
             session_id=session_id,
             started_at=time.time(),
             difficulty=3,
             score=0.0,
             answers_count=0,
-            used_items=[],
-            n_items=self._config.n_items,
+            used_items=[item.item_id for item in block],
+            n_items=config.iq.n_items,
             block_size=block_size,
-            scoring_mode=self._scoring_mode,
+            scoring_mode=self._scorer_modes.assign_mode(session_id),
+            source=source,
+            campaign=campaign,
+            bank_version=bank.version,
+            version=config.version,
         )
 
-        self._analytics_repo.increment_start()
-
-        remaining = session.n_items - session.answers_count
-        block = self._selector.select_block(pool, session.difficulty, session.used_items, min(block_size, remaining))
-        session.used_items.extend([item.item_id for item in block])
-        self._session_repo.save(session)
-
-        return {
-            "session_id": session_id,
-            "block": [self._serialize_item(item) for item in block],
-            "config": asdict(self._config),
-        }
-
-    def _serialize_item(self, item: IqItem) -> Dict:
-        return {
-            "item_id": item.item_id,
-            "domain": item.domain,
-            "difficulty": item.difficulty,
-            "prompt": item.prompt,
-            "options": item.options,
-            "time_limit": self._config.time_limits[item.difficulty],
-            "visual": item.visual,
-        }
+    def _record_start(self, session: IqSession, visitor: Optional[str]) -> None:
+        self._analytics_repo.record(IQ_TEST_SLUG, session.version, "start")
+        if visitor:
+            self._visitors.add(IQ_TEST_SLUG, session.campaign, visitor)
+        self._journal.record(
+            IQ_TEST_SLUG,
+            session.version,
+            "start",
+            session.session_id,
+            {
+                "block_size": session.block_size,
+                "scoring_mode": session.scoring_mode,
+                "source": session.source,
+                "campaign": session.campaign,
+                "bank_version": session.bank_version,
+            },
+        )
@@ -0,0 +1,22 @@
+from typing import Optional, Tuple
+
+from app.application.ports.iq_repositories import IqItemProvider
+from app.application.services.matrix_image_bundler import MatrixImageBundler
+from app.domain.exceptions import ItemNotFoundError
+
+
+class GetItemSpriteUseCase:
+    """Caso de uso: sprite SVG con la grilla y las opciones de un ítem visual."""
+
+    def __init__(self, item_provider: IqItemProvider, bundler: MatrixImageBundler) -> None:
+        self._item_provider = item_provider
+        self._bundler = bundler
+
+    def execute(self, item_id: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], str]:
+        item = self._item_provider.get_bank().get(item_id)
+        if item is None or (not item.visual and not any(isinstance(o, dict) for o in item.options)):
+            raise ItemNotFoundError(item_id)
+        sprite, etag = self._bundler.sprite(item)
+        if if_none_match and etag in if_none_match:
+            return None, etag
+        return sprite, etag
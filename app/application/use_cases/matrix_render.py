@@ -0,0 +1,17 @@
+from typing import Optional, Tuple
+
+from app.application.ports.support_services import MatrixImageRenderer
+
+
+class RenderMatrixSvgUseCase:
+    """Caso de uso: SVG de una matriz procedural (grilla u opción) identificada por su token."""
+
+    def __init__(self, renderer: MatrixImageRenderer) -> None:
+        self._renderer = renderer
+
+    def execute(self, token: str, part: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], str]:
+        """Devuelve (svg, etag); svg es None si el cliente ya tiene esa versión (304 sin renderizar)."""
+        etag = self._renderer.etag(token, part)
+        if if_none_match and etag in if_none_match:
+            return None, etag
+        return self._renderer.render(token, part)
@@ -1,15 +1,18 @@
 from typing import Dict
 
+from app.application.ports.support_services import EventJournal
 from app.domain.services.mixed_engine import MixedEngine
+from app.domain.value_objects.test_catalog import DEFAULT_TEST_VERSION, MIXED_TEST_SLUG
 from app.infrastructure.repositories.mixed_session_repository import InMemoryMixedSessionRepository
 
 
 class AnswerMixedUseCase:
     """Procesa respuesta y entrega siguiente ítem o fin."""
 
-    def __init__(self, repo: InMemoryMixedSessionRepository, engine: MixedEngine) -> None:
+    def __init__(self, repo: InMemoryMixedSessionRepository, engine: MixedEngine, journal: EventJournal) -> None:
         self._repo = repo
         self._engine = engine
+        self._journal = journal
 
     def execute(self, session_id: str, answer: str) -> Dict:
         session = self._repo.get(session_id)
@@ -19,6 +22,13 @@ class AnswerMixedUseCase:
         if not current:
             return {"error": "no_item"}, 400
         correct = self._engine.register_answer(session, current, answer)
+        self._journal.record(
+            MIXED_TEST_SLUG,
+            DEFAULT_TEST_VERSION,
+            "answer",
+            session_id,
+            {"item_id": current.item_id, "kind": current.kind, "index": session.index, "correct": correct},
+        )
         next_item = self._engine.next_item(session)
         self._repo.save(session)
         resp = {"correct": correct, "finished": session.finished}
@@ -1,21 +1,72 @@
-from typing import Dict
+import time
+from typing import Dict, Optional
 
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.support_services import EventJournal, QuantileSketchRepository
+from app.application.services.result_sharer import ResultSharer
 from app.domain.services.mixed_engine import MixedEngine
+from app.domain.value_objects.test_catalog import DEFAULT_TEST_VERSION, MIXED_TEST_SLUG, TEST_TITLES
 from app.infrastructure.repositories.mixed_session_repository import InMemoryMixedSessionRepository
 
 
 class FinishMixedUseCase:
     """Finaliza test combinado y retorna score."""
 
-    def __init__(self, repo: InMemoryMixedSessionRepository, engine: MixedEngine) -> None:
+    def __init__(
+        self,
+        repo: InMemoryMixedSessionRepository,
+        engine: MixedEngine,
+        journal: EventJournal,
+        sketches: QuantileSketchRepository,
+        analytics_repo: TestAnalyticsRepository,
+        sharer: Optional[ResultSharer] = None,
+    ) -> None:
         self._repo = repo
         self._engine = engine
+        self._journal = journal
+        self._sketches = sketches
+        self._analytics_repo = analytics_repo
+        self._sharer = sharer
 
     def execute(self, session_id: str) -> Dict:
         session = self._repo.get(session_id)
         if not session:
             return {"error": "invalid_session"}, 400
+        if session.result is not None:
+            return session.result, 200
         session.finished = True
         score = self._engine.finalize(session)
+        if self._sharer is not None:
+            score.update(
+                self._sharer.share(
+                    session_id,
+                    MIXED_TEST_SLUG,
+                    DEFAULT_TEST_VERSION,
+                    TEST_TITLES[MIXED_TEST_SLUG],
+                    profile_code=None,
+                    title="Resultado combinado",
+                    summary=f"IQ {score['iq_pct']}% · Colores {score['stroop_pct']}%",
+                    score=score["score"],
+                )
+            )
+        session.result = score
         self._repo.save(session)
+        duration = int(time.time() - session.started_at)
+        self._sketches.observe("test", MIXED_TEST_SLUG, "duration_sec", duration)
+        self._analytics_repo.record(
+            MIXED_TEST_SLUG, DEFAULT_TEST_VERSION, "finish", duration_sec=duration, score=score["score"]
+        )
+        self._journal.record(
+            MIXED_TEST_SLUG,
+            DEFAULT_TEST_VERSION,
+            "finish",
+            session_id,
+            {
+                "answers": session.index,
+                "duration_sec": duration,
+                "source": session.source,
+                "campaign": session.campaign,
+                **score,
+            },
+        )
         return score, 200
@@ -1,22 +1,63 @@
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.iq_repositories import IqItemProvider
+from app.application.ports.support_services import EventJournal, VisitorSketchRepository
 from app.domain.services.mixed_engine import MixedEngine
+from app.domain.value_objects.test_catalog import DEFAULT_TEST_VERSION, MIXED_TEST_SLUG
 from app.infrastructure.repositories.mixed_session_repository import InMemoryMixedSessionRepository
 
 
 class StartMixedUseCase:
     """Inicia test combinado IQ + Stroop."""
 
-    def __init__(self, repo: InMemoryMixedSessionRepository, engine: MixedEngine) -> None:
+    def __init__(
+        self,
+        repo: InMemoryMixedSessionRepository,
+        engine: MixedEngine,
+        item_provider: IqItemProvider,
+        journal: EventJournal,
+        visitors: VisitorSketchRepository,
+        analytics_repo: TestAnalyticsRepository,
+    ) -> None:
         self._repo = repo
         self._engine = engine
+        self._item_provider = item_provider
+        self._journal = journal
+        self._visitors = visitors
+        self._analytics_repo = analytics_repo
 
-    def execute(self, iq_count: int = 10, stroop_count: int = 6) -> Dict:
+    def execute(
+        self,
+        iq_count: int = 10,
+        stroop_count: int = 6,
+        source: Optional[str] = None,
+        campaign: Optional[str] = None,
+        visitor: Optional[str] = None,
+    ) -> Dict:
         session_id = str(uuid.uuid4())
-        session = self._engine.build_session(session_id, iq_count=iq_count, stroop_count=stroop_count)
+        bank = self._item_provider.get_bank()
+        session = self._engine.build_session(session_id, bank, iq_count=iq_count, stroop_count=stroop_count)
+        session.source = source
+        session.campaign = campaign
         item = self._engine.next_item(session)
         self._repo.save(session)
+        self._analytics_repo.record(MIXED_TEST_SLUG, DEFAULT_TEST_VERSION, "start")
+        if visitor:
+            self._visitors.add(MIXED_TEST_SLUG, campaign, visitor)
+        self._journal.record(
+            MIXED_TEST_SLUG,
+            DEFAULT_TEST_VERSION,
+            "start",
+            session_id,
+            {
+                "iq_count": session.iq_total,
+                "stroop_count": session.stroop_total,
+                "source": source,
+                "campaign": campaign,
+            },
+        )
         return {"session_id": session_id, "item": self._serialize(item)}
 
     def _serialize(self, item):
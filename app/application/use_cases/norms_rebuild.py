@@ -0,0 +1,21 @@
+import time
+from typing import Dict
+
+from app.application.ports.iq_repositories import NormRepository
+from app.domain.value_objects.norm_table import NormTable
+
+
+class RebuildNormTablesUseCase:
+    """Caso de uso: reconstruye las tablas de normas a partir de los resultados acumulados."""
+
+    def __init__(self, norm_repo: NormRepository) -> None:
+        self._norm_repo = norm_repo
+
+    def execute(self) -> Dict[str, int]:
+        now = time.time()
+        built: Dict[str, int] = {}
+        for norm_key, samples in self._norm_repo.samples().items():
+            table = NormTable.build(samples, built_at=now)
+            self._norm_repo.set_table(norm_key, table)
+            built[norm_key] = table.size
+        return built
@@ -0,0 +1,182 @@
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.questionnaire_repositories import QuestionnaireSessionRepository
+from app.application.ports.support_services import EventJournal, QuantileSketchRepository, VisitorSketchRepository
+from app.application.services.questionnaire_catalog import QuestionnaireCatalog
+from app.application.services.result_sharer import ResultSharer
+from app.domain.entities.questionnaire_session import QuestionnaireSession
+from app.domain.exceptions import SessionNotFoundError
+
+
+class ListQuestionnairesUseCase:
+    """Caso de uso: cuestionarios publicados y activos."""
+
+    def __init__(self, catalog: QuestionnaireCatalog) -> None:
+        self._catalog = catalog
+
+    def execute(self) -> Dict:
+        return {"tests": self._catalog.list_published()}
+
+
+class StartQuestionnaireUseCase:
+    """Caso de uso: inicia un cuestionario (versión publicada o la pedida) y devuelve la primera pregunta."""
+
+    def __init__(
+        self,
+        repo: QuestionnaireSessionRepository,
+        catalog: QuestionnaireCatalog,
+        journal: EventJournal,
+        visitors: VisitorSketchRepository,
+        analytics_repo: TestAnalyticsRepository,
+    ) -> None:
+        self._repo = repo
+        self._catalog = catalog
+        self._journal = journal
+        self._visitors = visitors
+        self._analytics_repo = analytics_repo
+
+    def execute(
+        self,
+        slug: str,
+        version: Optional[int] = None,
+        source: Optional[str] = None,
+        campaign: Optional[str] = None,
+        visitor: Optional[str] = None,
+    ) -> Dict:
+        questionnaire = self._catalog.get(slug, version)
+        session = QuestionnaireSession(
+            session_id=str(uuid.uuid4()),
+            test_slug=questionnaire.slug,
+            version=questionnaire.version,
+            scores=questionnaire.new_scores(),
+            source=source,
+            campaign=campaign,
+        )
+        self._repo.save(session)
+        self._analytics_repo.record(session.test_slug, session.version, "start")
+        if visitor:
+            self._visitors.add(session.test_slug, campaign, visitor)
+        self._journal.record(
+            session.test_slug, session.version, "start", session.session_id, {"source": source, "campaign": campaign}
+        )
+        return {
+            "session_id": session.session_id,
+            "test": questionnaire.slug,
+            "version": questionnaire.version,
+            "title": questionnaire.title,
+            "question": questionnaire.questions[0].payload,
+        }
+
+
+class AnswerQuestionnaireUseCase:
+    """Caso de uso: registra la respuesta a la pregunta actual y devuelve la siguiente (transición O(1))."""
+
+    def __init__(
+        self, repo: QuestionnaireSessionRepository, catalog: QuestionnaireCatalog, journal: EventJournal
+    ) -> None:
+        self._repo = repo
+        self._catalog = catalog
+        self._journal = journal
+
+    def execute(self, session_id: str, option_id: Optional[int]) -> Dict:
+        session = self._repo.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(session_id)
+        if session.current is None:
+            return {"done": True}
+        questionnaire = self._catalog.get(session.test_slug, session.version)
+        question = questionnaire.questions[session.current]
+        next_index = questionnaire.answer(session, option_id)
+        self._repo.save(session)
+        self._journal.record(
+            session.test_slug,
+            session.version,
+            "answer",
+            session.session_id,
+            {"question_id": question.question_id, "order": question.order, "option_id": option_id},
+        )
+        if next_index is None:
+            return {"done": True}
+        return {"done": False, "question": questionnaire.questions[next_index].payload}
+
+
+class FinishQuestionnaireUseCase:
+    """Caso de uso: calcula el perfil por umbrales de puntaje y cierra la sesión."""
+
+    def __init__(
+        self,
+        repo: QuestionnaireSessionRepository,
+        catalog: QuestionnaireCatalog,
+        journal: EventJournal,
+        sketches: QuantileSketchRepository,
+        analytics_repo: TestAnalyticsRepository,
+        sharer: Optional[ResultSharer] = None,
+    ) -> None:
+        self._repo = repo
+        self._catalog = catalog
+        self._journal = journal
+        self._sketches = sketches
+        self._analytics_repo = analytics_repo
+        self._sharer = sharer
+
+    def execute(self, session_id: str) -> Tuple[Dict, int]:
+        session = self._repo.get(session_id)
+        if session is None:
+            raise SessionNotFoundError(session_id)
+        if session.result is not None:
+            return session.result, 200
+        if session.current is not None:
+            return {"error": "not_finished"}, 409
+        questionnaire = self._catalog.get(session.test_slug, session.version)
+        profile = questionnaire.profile(session.scores)
+        score = session.scores[questionnaire.profile_slot]
+        result = {
+            **(profile.payload if profile else {"profile_code": None, "title": "Sin perfil"}),
+            "score": score,
+            "scores": dict(zip(questionnaire.dimensions, session.scores)),
+        }
+        if self._sharer is not None:
+            result.update(
+                self._sharer.share(
+                    session.session_id,
+                    session.test_slug,
+                    session.version,
+                    questionnaire.title,
+                    profile_code=result["profile_code"],
+                    title=result["title"],
+                    summary=result.get("summary"),
+                    recommendations=result.get("recommendations") or (),
+                    score=score,
+                )
+            )
+        session.finished = True
+        session.result = result
+        self._repo.save(session)
+        duration = int(time.time() - session.started_at)
+        self._sketches.observe("test", session.test_slug, "duration_sec", duration)
+        self._analytics_repo.record(
+            session.test_slug,
+            session.version,
+            "finish",
+            duration_sec=duration,
+            profile=result["profile_code"],
+            score=score,
+        )
+        self._journal.record(
+            session.test_slug,
+            session.version,
+            "finish",
+            session.session_id,
+            {
+                "answers": len(session.answers),
+                "duration_sec": duration,
+                "source": session.source,
+                "campaign": session.campaign,
+                "score": score,
+                "profile": result["profile_code"],
+            },
+        )
+        return result, 200
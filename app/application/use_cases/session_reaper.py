@@ -0,0 +1,52 @@
+from typing import Dict, Sequence, Tuple
+
+from app.application.ports.support_services import EventJournal
+from app.domain.entities.iq_session import IqSession
+from app.domain.entities.mixed_session import MixedSession
+from app.domain.entities.questionnaire_session import QuestionnaireSession
+from app.domain.entities.stroop_session import StroopSession
+from app.domain.value_objects.test_catalog import DEFAULT_TEST_VERSION
+
+
+class AbandonIdleSessionsUseCase:
+    """Caso de uso: desaloja sesiones inactivas y registra como abandono las no finalizadas."""
+
+    def __init__(self, repos: Sequence[Tuple[str, object]], journal: EventJournal, max_idle_sec: float) -> None:
+        self._repos = repos
+        self._journal = journal
+        self._max_idle_sec = max_idle_sec
+
+    def execute(self) -> Dict[str, int]:
+        abandoned: Dict[str, int] = {}
+        for test_slug, repo in self._repos:
+            count = 0
+            for session in repo.evict_idle(self._max_idle_sec):
+                if session.finished:
+                    continue
+                # Los cuestionarios guardan su propio slug/versión; el slug del repo es sólo la etiqueta del conteo.
+                self._journal.record(
+                    getattr(session, "test_slug", test_slug),
+                    getattr(session, "version", DEFAULT_TEST_VERSION),
+                    "abandon",
+                    session.session_id,
+                    {
+                        "answers": self._progress(session),
+                        "idle_sec": int(self._max_idle_sec),
+                        "source": session.source,
+                        "campaign": session.campaign,
+                    },
+                )
+                count += 1
+            abandoned[test_slug] = count
+        return abandoned
+
+    def _progress(self, session) -> int:
+        if isinstance(session, IqSession):
+            return session.answers_count
+        if isinstance(session, StroopSession):
+            return session.total_trials
+        if isinstance(session, MixedSession):
+            return session.index
+        if isinstance(session, QuestionnaireSession):
+            return len(session.answers)
+        return 0
@@ -0,0 +1,25 @@
+from typing import Optional, Tuple
+
+from app.application.ports.share_repositories import ShareCardCache, ShareResultRepository
+from app.domain.exceptions import ShareNotFoundError
+
+
+class GetShareCardUseCase:
+    """Caso de uso: imagen Open Graph de un resultado compartido (renderizada una vez por token)."""
+
+    def __init__(self, repo: ShareResultRepository, cards: ShareCardCache) -> None:
+        self._repo = repo
+        self._cards = cards
+
+    def execute(self, share_token: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], str]:
+        """Devuelve (imagen, etag); imagen es None si el cliente ya tiene esa versión (304)."""
+        cached = self._cards.get(share_token)
+        if cached is None:
+            share = self._repo.get(share_token)
+            if share is None:
+                raise ShareNotFoundError(share_token)
+            cached = self._cards.render(share)
+        card, etag = cached
+        if if_none_match and etag in if_none_match:
+            return None, etag
+        return card, etag
@@ -0,0 +1,28 @@
+from typing import Optional, Tuple
+
+from app.application.ports.share_repositories import SharePageRenderer, SharePageStore, ShareResultRepository
+from app.domain.exceptions import ShareNotFoundError
+
+
+class GetSharePageUseCase:
+    """Caso de uso: página pública de un resultado compartido, servida desde lo ya renderizado."""
+
+    def __init__(self, repo: ShareResultRepository, renderer: SharePageRenderer, store: SharePageStore) -> None:
+        self._repo = repo
+        self._renderer = renderer
+        self._store = store
+
+    def execute(self, share_token: str, if_none_match: Optional[str] = None) -> Tuple[Optional[bytes], str]:
+        """Devuelve (html, etag); html es None si el cliente ya tiene esa versión (304)."""
+        cached = self._store.get(share_token)
+        if cached is None:
+            # Desalojada del cache y sin disco: se vuelve a renderizar desde la fila, nunca desde la sesión.
+            share = self._repo.get(share_token)
+            if share is None:
+                raise ShareNotFoundError(share_token)
+            page = self._renderer.render(share)
+            cached = page, self._store.put(share_token, page)
+        page, etag = cached
+        if if_none_match and etag in if_none_match:
+            return None, etag
+        return page, etag
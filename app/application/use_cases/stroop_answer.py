@@ -1,15 +1,28 @@
 from typing import Dict
 
+from app.application.ports.support_services import EventJournal, QuantileSketchRepository
+from app.application.services.test_config_registry import TestConfigRegistry
 from app.domain.services.stroop_engine import StroopEngine
+from app.domain.value_objects.test_catalog import STROOP_TEST_SLUG
 from app.infrastructure.repositories.stroop_session_repository import InMemoryStroopSessionRepository
 
 
 class AnswerStroopUseCase:
     """Procesa respuesta y entrega siguiente trial o fin."""
 
-    def __init__(self, repo: InMemoryStroopSessionRepository, engine: StroopEngine) -> None:
+    def __init__(
+        self,
+        repo: InMemoryStroopSessionRepository,
+        engine: StroopEngine,
+        journal: EventJournal,
+        sketches: QuantileSketchRepository,
+        configs: TestConfigRegistry,
+    ) -> None:
         self._repo = repo
         self._engine = engine
+        self._journal = journal
+        self._sketches = sketches
+        self._configs = configs
 
     def execute(self, session_id: str, selected: str, rt_ms: int) -> Dict:
         session = self._repo.get(session_id)
@@ -21,7 +34,25 @@ class AnswerStroopUseCase:
             return {"error": "no_trial"}, 400
 
         answer = self._engine.register_answer(session, current_trial, selected, rt_ms)
-        next_trial = self._engine.next_trial(session)
+        # En Stroop el "ítem" es el tipo de trial (congruente / incongruente / neutro).
+        self._sketches.observe("test", STROOP_TEST_SLUG, "rt_ms", answer.rt_ms)
+        self._sketches.observe("item", current_trial.trial_type, "rt_ms", answer.rt_ms)
+        self._journal.record(
+            STROOP_TEST_SLUG,
+            session.version,
+            "answer",
+            session_id,
+            {
+                "trial": session.total_trials,
+                "rule": current_trial.rule_id,
+                "trial_type": current_trial.trial_type,
+                "correct": answer.correct,
+                "rt_ms": answer.rt_ms,
+                "rule_changed_before": answer.rule_changed_before,
+            },
+        )
+        # Umbral de cambio de regla y largo del test según la versión con la que arrancó la sesión.
+        next_trial = self._engine.next_trial(session, self._configs.get(STROOP_TEST_SLUG, session.version).stroop)
         self._repo.set_pending_trial(session_id, next_trial)
         self._repo.save(session)
 
@@ -1,52 +1,117 @@
-from typing import Dict
+import time
+from typing import Dict, Optional, Tuple
 
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.support_services import EventJournal, QuantileSketchRepository
+from app.application.services.result_sharer import ResultSharer
 from app.domain.entities.stroop_session import StroopSession
+from app.domain.value_objects.test_catalog import STROOP_TEST_SLUG, TEST_TITLES
 from app.infrastructure.repositories.stroop_session_repository import InMemoryStroopSessionRepository
 
+# Perfil por prioridad: la primera métrica (en [0, 1]) por debajo de su umbral define el perfil.
+_PROFILE_CUTS = (
+    ("flexibility", 0.6, ("baja-flexibilidad", "Buena inhibicion, baja flexibilidad ante cambios.")),
+    ("impulse_control", 0.7, ("impulsivo", "Tendencia a responder rapido con errores bajo presion.")),
+    ("stroop_control", 0.7, ("interferencia", "Interferencia alta en estimulos incongruentes.")),
+)
+_STABLE_PROFILE = ("estable", "Control atencional y flexibilidad estables.")
+
 
 class FinishStroopUseCase:
     """Finaliza sesión y calcula score híbrido."""
 
-    def __init__(self, repo: InMemoryStroopSessionRepository) -> None:
+    def __init__(
+        self,
+        repo: InMemoryStroopSessionRepository,
+        journal: EventJournal,
+        sketches: QuantileSketchRepository,
+        analytics_repo: TestAnalyticsRepository,
+        sharer: Optional[ResultSharer] = None,
+    ) -> None:
         self._repo = repo
+        self._journal = journal
+        self._sketches = sketches
+        self._analytics_repo = analytics_repo
+        self._sharer = sharer
 
     def execute(self, session_id: str) -> Dict:
         session = self._repo.get(session_id)
         if not session:
             return {"error": "invalid_session"}, 400
+        if session.result is not None:
+            return session.result, 200
         session.finished = True
         result = self._score(session)
+        if self._sharer is not None:
+            result.update(
+                self._sharer.share(
+                    session_id,
+                    STROOP_TEST_SLUG,
+                    session.version,
+                    TEST_TITLES[STROOP_TEST_SLUG],
+                    profile_code=result["profile_code"],
+                    title=result["profile"],
+                    score=result["score"],
+                )
+            )
+        session.result = result
         self._repo.save(session)
+        duration = int(time.time() - session.started_at)
+        self._sketches.observe("test", STROOP_TEST_SLUG, "duration_sec", duration)
+        self._analytics_repo.record(
+            STROOP_TEST_SLUG,
+            session.version,
+            "finish",
+            duration_sec=duration,
+            profile=result["profile_code"],
+            score=result["score"],
+        )
+        self._journal.record(
+            STROOP_TEST_SLUG,
+            session.version,
+            "finish",
+            session_id,
+            {
+                "trials": len(session.answers),
+                "duration_sec": duration,
+                "source": session.source,
+                "campaign": session.campaign,
+                **result,
+            },
+        )
         return result, 200
 
     def _score(self, session: StroopSession) -> Dict:
         if not session.answers:
-            return {"score": 0, "profile": "Sin datos"}
+            return {"score": 0, "profile": "Sin datos", "profile_code": "sin-datos"}
 
-        total = len(session.answers)
-        incong = [a for a in session.answers if a.trial.trial_type == "incongruente"]
-        cong = [a for a in session.answers if a.trial.trial_type == "congruente"]
-        correct = sum(1 for a in session.answers if a.correct)
-        correct_incong = sum(1 for a in incong if a.correct)
+        # Se puntúa sobre las columnas de la sesión, sin materializar una respuesta por trial.
+        log = session.answers
+        total = len(log)
+        incong_code = log.type_code("incongruente")
+        cong_code = log.type_code("congruente")
+        trial_types, corrects, switches, rts = log.trial_types(), log.correct(), log.rule_changed(), log.rt_ms
+        correct = sum(corrects)
+        correct_incong = sum(c for t, c in zip(trial_types, corrects) if t == incong_code)
         accuracy_weighted = (correct + correct_incong * 0.2) / total
 
-        def avg_rt(arr):
-            vals = [a.rt_ms for a in arr if a.rt_ms > 0]
+        def avg_rt(type_code):
+            vals = [rt for t, rt in zip(trial_types, rts) if t == type_code and rt > 0]
             return sum(vals) / len(vals) if vals else 0
 
-        rt_incong = avg_rt(incong)
-        rt_cong = avg_rt(cong)
+        rt_incong = avg_rt(incong_code)
+        rt_cong = avg_rt(cong_code)
         stroop_control = 1.0
         if rt_cong and rt_incong:
             diff = rt_incong - rt_cong
             stroop_control = max(0.0, min(1.0, 1 - diff / 800.0))
 
-        switch_errors = sum(1 for a in session.answers if a.rule_changed_before and not a.correct)
-        switch_trials = max(1, sum(1 for a in session.answers if a.rule_changed_before))
+        switch_errors = sum(1 for s, c in zip(switches, corrects) if s and not c)
+        switch_trials = max(1, sum(switches))
         flexibility = 1 - (switch_errors / switch_trials)
 
-        impulse_errors = sum(1 for a in session.answers if (a.rt_ms < 2500 and not a.correct))
-        impulse_trials = max(1, len(session.answers))
+        impulse_errors = sum(1 for rt, c in zip(rts, corrects) if rt < 2500 and not c)
+        impulse_trials = max(1, total)
         impulse_control = 1 - (impulse_errors / impulse_trials)
 
         score = (
@@ -57,14 +122,13 @@ class FinishStroopUseCase:
         ) * 100
         score = max(0, min(100, round(score, 1)))
 
-        profile = self._profile(flexibility, stroop_control, impulse_control)
-        return {"score": score, "profile": profile}
+        code, profile = self._profile(
+            {"flexibility": flexibility, "stroop_control": stroop_control, "impulse_control": impulse_control}
+        )
+        return {"score": score, "profile": profile, "profile_code": code}
 
-    def _profile(self, flexibility: float, stroop_control: float, impulse: float) -> str:
-        if flexibility < 0.6:
-            return "Buena inhibicion, baja flexibilidad ante cambios."
-        if impulse < 0.7:
-            return "Tendencia a responder rapido con errores bajo presion."
-        if stroop_control < 0.7:
-            return "Interferencia alta en estimulos incongruentes."
-        return "Control atencional y flexibilidad estables."
+    def _profile(self, metrics: Dict[str, float]) -> Tuple[str, str]:
+        for metric, cut, profile in _PROFILE_CUTS:
+            if metrics[metric] < cut:
+                return profile
+        return _STABLE_PROFILE
@@ -1,22 +1,88 @@
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.application.ports.support_services import EventJournal, VisitorSketchRepository
+from app.application.services.test_config_registry import TestConfigRegistry
+from app.domain.entities.stroop_session import StroopSession
 from app.domain.services.stroop_engine import StroopEngine
+from app.domain.value_objects.test_catalog import STROOP_TEST_SLUG
+from app.domain.value_objects.test_config import TestVersionConfig
 from app.infrastructure.repositories.stroop_session_repository import InMemoryStroopSessionRepository
 
+RULE_HINT = "descubre la regla por aciertos"
+
 
 class StartStroopUseCase:
     """Inicia sesión del test Stroop-WCST híbrido."""
 
-    def __init__(self, repo: InMemoryStroopSessionRepository, engine: StroopEngine) -> None:
+    def __init__(
+        self,
+        repo: InMemoryStroopSessionRepository,
+        engine: StroopEngine,
+        journal: EventJournal,
+        visitors: VisitorSketchRepository,
+        analytics_repo: TestAnalyticsRepository,
+        configs: TestConfigRegistry,
+    ) -> None:
         self._repo = repo
         self._engine = engine
+        self._journal = journal
+        self._visitors = visitors
+        self._analytics_repo = analytics_repo
+        self._configs = configs
 
-    def execute(self) -> Dict:
-        session_id = str(uuid.uuid4())
-        session, trial = self._engine.start_session(session_id)
+    def execute(
+        self, source: Optional[str] = None, campaign: Optional[str] = None, visitor: Optional[str] = None
+    ) -> Dict:
+        session, trial = self._new_session(self._configs.current(STROOP_TEST_SLUG), source, campaign)
         self._repo.save(session)
-        return {"session_id": session_id, "trial": self._serialize_trial(trial), "rule_hint": "descubre la regla por aciertos"}
+        self._repo.set_pending_trial(session.session_id, trial)
+        self._record_start(session, visitor)
+        return {"session_id": session.session_id, "trial": self._serialize_trial(trial), "rule_hint": RULE_HINT}
+
+    def execute_bulk(
+        self,
+        count: int,
+        source: Optional[str] = None,
+        campaign: Optional[str] = None,
+        visitor: Optional[str] = None,
+    ) -> Dict:
+        """Crea `count` sesiones de una vez (aula / kiosco) con una sola escritura al repositorio."""
+        config = self._configs.current(STROOP_TEST_SLUG)
+        started = [self._new_session(config, source, campaign) for _ in range(count)]
+        sessions = [session for session, _ in started]
+        trials = [trial for _, trial in started]
+        self._repo.save_many(sessions, trials)
+        for session in sessions:
+            self._record_start(session, visitor)
+        # Los trials salen de una tabla precalculada: se serializa una vez por trial distinto.
+        serialized: Dict[int, Dict] = {}
+        payloads = []
+        for session, trial in started:
+            payload = serialized.get(id(trial))
+            if payload is None:
+                payload = serialized[id(trial)] = self._serialize_trial(trial)
+            payloads.append({"session_id": session.session_id, "trial": payload})
+        return {"sessions": payloads, "rule_hint": RULE_HINT}
+
+    def _new_session(self, config: TestVersionConfig, source: Optional[str], campaign: Optional[str]):
+        session, trial = self._engine.start_session(str(uuid.uuid4()), config.stroop, config.version)
+        session.source = source
+        session.campaign = campaign
+        return session, trial
+
+    def _record_start(self, session: StroopSession, visitor: Optional[str]) -> None:
+        self._analytics_repo.record(STROOP_TEST_SLUG, session.version, "start")
+        if visitor:
+            self._visitors.add(STROOP_TEST_SLUG, session.campaign, visitor)
+        self._journal.record(
+            STROOP_TEST_SLUG,
+            session.version,
+            "start",
+            session.session_id,
+            {"source": session.source, "campaign": session.campaign},
+        )
 
     def _serialize_trial(self, trial):
         return {
@@ -1,5 +1,13 @@
 from typing import Dict, List
 
+from app.domain.value_objects.test_catalog import (
+    DEFAULT_TEST_VERSION,
+    IQ_TEST_SLUG,
+    MIXED_TEST_SLUG,
+    STROOP_TEST_SLUG,
+    TEST_TITLES,
+)
+
 
 class ListTestsUseCase:
     """Caso de uso: listar tests disponibles."""
@@ -9,30 +17,30 @@ class ListTestsUseCase:
         return {
             "tests": [
                 {
-                    "slug": "iq-general",
-                    "title": "Test de IQ General",
+                    "slug": IQ_TEST_SLUG,
+                    "title": TEST_TITLES[IQ_TEST_SLUG],
                     "description": "Evaluacion cognitiva recreativa con seleccion semi-adaptativa.",
                     "lang": "es",
                     "is_active": True,
-                    "published_version": 1,
+                    "published_version": DEFAULT_TEST_VERSION,
                 }
                 ,
                 {
-                    "slug": "stroop-wcst",
-                    "title": "Test de Colores (Stroop/WCST)",
+                    "slug": STROOP_TEST_SLUG,
+                    "title": TEST_TITLES[STROOP_TEST_SLUG],
                     "description": "Flexibilidad e inhibicion con reglas dinamicas y estimulos Stroop.",
                     "lang": "es",
                     "is_active": True,
-                    "published_version": 1,
+                    "published_version": DEFAULT_TEST_VERSION,
                     "url": "/stroop",
                 },
                 {
-                    "slug": "iq-stroop-mixed",
-                    "title": "Test Combinado IQ + Colores",
+                    "slug": MIXED_TEST_SLUG,
+                    "title": TEST_TITLES[MIXED_TEST_SLUG],
                     "description": "Bloques alternados IQ y Stroop con score 50/50.",
                     "lang": "es",
                     "is_active": True,
-                    "published_version": 1,
+                    "published_version": DEFAULT_TEST_VERSION,
                     "url": "/test-mixed",
                 }
             ]
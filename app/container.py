@@ -1,147 +1,889 @@
 """AppFactory + contenedor DI simple para APB (monolito)."""
 
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from app.application.ports.iq_repositories import IqItemProvider
+from app.application.ports.support_services import EventJournal
+from app.application.services.iq_item_serializer import IqItemSerializer
+from app.application.ports.questionnaire_repositories import QuestionnaireSource
+from app.application.services.matrix_image_bundler import MatrixImageBundler
+from app.application.services.questionnaire_catalog import QuestionnaireCatalog
+from app.application.services.result_sharer import ResultSharer
+from app.application.services.test_config_registry import TestConfigRegistry
 from app.application.use_cases.analytics import (
     GetAnalyticsDropoffUseCase,
     GetAnalyticsFunnelUseCase,
+    GetAnalyticsItemsUseCase,
     GetAnalyticsProfilesUseCase,
+    GetAnalyticsQuantilesUseCase,
     GetAnalyticsSummaryUseCase,
+    GetAnalyticsTestsUseCase,
+    GetAnalyticsVisitorsUseCase,
 )
+from app.application.use_cases.data_export import ExportSessionDataUseCase
 from app.application.use_cases.db_check import DbCheckUseCase
 from app.application.use_cases.iq_answer import AnswerIqBlockUseCase
 from app.application.use_cases.iq_finish import FinishIqTestUseCase
 from app.application.use_cases.iq_start import StartIqTestUseCase
+from app.application.use_cases.item_sprite import GetItemSpriteUseCase
+from app.application.use_cases.matrix_render import RenderMatrixSvgUseCase
 from app.application.use_cases.tests_catalog import ListTestsUseCase
 from app.application.use_cases.tip_today import GetTipTodayUseCase
 from app.application.use_cases.mixed_start import StartMixedUseCase
+from app.application.use_cases.norms_rebuild import RebuildNormTablesUseCase
 from app.application.use_cases.mixed_answer import AnswerMixedUseCase
 from app.application.use_cases.mixed_finish import FinishMixedUseCase
+from app.application.use_cases.questionnaire import (
+    AnswerQuestionnaireUseCase,
+    FinishQuestionnaireUseCase,
+    ListQuestionnairesUseCase,
+    StartQuestionnaireUseCase,
+)
+from app.application.use_cases.share_card import GetShareCardUseCase
+from app.application.use_cases.share_page import GetSharePageUseCase
+from app.application.use_cases.session_reaper import AbandonIdleSessionsUseCase
 from app.application.use_cases.stroop_start import StartStroopUseCase
 from app.application.use_cases.stroop_answer import AnswerStroopUseCase
 from app.application.use_cases.stroop_finish import FinishStroopUseCase
-import os
-
 from app.domain.services.iq_logic import IqBandingService, IqResultService, IqScoringService, IqSelectorService
-from app.domain.services.iq_scoring_modes import IqScoringModesService, ScoringParams
+from app.domain.services.item_exposure import SympsonHetterExposure
+from app.domain.services.matrix_generator import MatrixItemGenerator
+from app.domain.services.iq_scoring_modes import IqScoringModesService, parse_cohorts
 from app.domain.services.stroop_engine import StroopEngine
 from app.domain.services.mixed_engine import MixedEngine
-from app.domain.value_objects.iq_config import IqConfig
+from app.domain.value_objects.test_catalog import IQ_TEST_SLUG, MIXED_TEST_SLUG, STROOP_TEST_SLUG
+from app.infrastructure.providers.file_iq_item_provider import FileIqItemProvider
 from app.infrastructure.providers.static_iq_item_provider import StaticIqItemProvider
 from app.infrastructure.providers.static_tip_provider import StaticTipProvider
-from app.infrastructure.repositories.in_memory_analytics_repository import InMemoryIqAnalyticsRepository
+from app.infrastructure.repositories.in_memory_analytics_repository import InMemoryTestAnalyticsRepository
+from app.infrastructure.repositories.in_memory_item_stats_repository import InMemoryIqItemStatsRepository
+from app.infrastructure.repositories.in_memory_norm_repository import InMemoryNormRepository
+from app.infrastructure.repositories.in_memory_quantile_repository import InMemoryQuantileSketchRepository
 from app.infrastructure.repositories.in_memory_session_repository import InMemoryIqSessionRepository
+from app.infrastructure.repositories.in_memory_visitor_repository import InMemoryVisitorSketchRepository
+from app.infrastructure.repositories.json_questionnaire_source import JsonQuestionnaireSource
+from app.infrastructure.repositories.postgres_questionnaire_source import PostgresQuestionnaireSource
+from app.infrastructure.repositories.questionnaire_session_repository import InMemoryQuestionnaireSessionRepository
+from app.infrastructure.repositories.share_result_repository import InMemoryShareResultRepository
 from app.infrastructure.repositories.stroop_session_repository import InMemoryStroopSessionRepository
 from app.infrastructure.repositories.mixed_session_repository import InMemoryMixedSessionRepository
 from app.infrastructure.services.db_health_checker import InMemoryDbHealthChecker
+from app.infrastructure.services.event_journal import build_event_journal_from_env
+from app.infrastructure.services.journal_event_source import JournalEventSource
+from app.infrastructure.services.matrix_svg_renderer import CachedMatrixSvgRenderer
+from app.infrastructure.services.periodic_task import PeriodicTask
+from app.infrastructure.services.share_card_cache import DiskShareCardCache
+from app.infrastructure.services.share_card_renderer import SvgShareCardRenderer
+from app.infrastructure.services.share_page_renderer import TemplateSharePageRenderer
+from app.infrastructure.services.share_page_store import CachedSharePageStore
+from app.infrastructure.services.svg_image_source import SvgImageSource
+from app.infrastructure.observability.metrics import InstrumentedUseCase, MetricsRegistry, register_default_metrics
+from app.infrastructure.observability.profiler import RequestProfiler
+from app.infrastructure.observability.tracing import TracedProxy, Tracer
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_STARTED
+
+T = TypeVar("T")
+
+FRONTEND_DIR = Path(__file__).resolve().parent.parent / "Frontend"
 
 
 class AppContainer:
-    """Container/IoC básico para instanciar casos de uso y dependencias."""
+    """Container/IoC básico: construye dependencias y casos de uso de forma perezosa y los cachea."""
 
     def __init__(self) -> None:
-        self.iq_config = IqConfig(
-            n_items=20,
-            score_max=45.0,
-            difficulty_weights={1: 1.0, 2: 1.5, 3: 2.0, 4: 2.5, 5: 3.0},
-            time_limits={1: 25, 2: 25, 3: 35, 4: 45, 5: 55},
-        )
-        self.session_repo = InMemoryIqSessionRepository()
-        self.analytics_repo = InMemoryIqAnalyticsRepository()
-        self.item_provider = StaticIqItemProvider()
-        self.tip_provider = StaticTipProvider()
-        self.db_checker = InMemoryDbHealthChecker()
-        self.stroop_repo = InMemoryStroopSessionRepository()
-        self.mixed_repo = InMemoryMixedSessionRepository()
-
-        # Servicios de dominio compartidos.
-        self.selector = IqSelectorService()
-        self.scorer = IqScoringService()
-        self.banding = IqBandingService()
-        self.result_service = IqResultService(self.banding)
-        self.stroop_engine = StroopEngine()
-        self.mixed_engine = MixedEngine(self.stroop_engine)
+        self._lock = threading.RLock()
+        self._singletons: Dict[str, Any] = {}
+        self._build_timings: Dict[str, Dict[str, float]] = {}
+        self._build_stack: List[float] = []
+
+        # Observabilidad: liviana, se necesita desde el primer request.
+        self.tracer = Tracer.from_env()
+        self.metrics = MetricsRegistry(stripes=int(os.getenv("METRICS_STRIPES", "8")))
+        register_default_metrics(self.metrics)
+        self.metrics.gauge("sessions_live", "Sesiones vivas por repositorio.", self._collect_live_sessions)
+        self.metrics.gauge("analytics_events", "Contadores de analytics por test.", self._collect_analytics)
+        self.metrics.gauge(
+            "container_build_seconds", "Costo de construcción por componente.", self._collect_build_timings
+        )
+        self.metrics.gauge("event_journal", "Eventos del journal por estado.", self._collect_journal)
+        self.metrics.gauge("matrix_svg_cache", "Cache LRU de SVG de matrices.", self._collect_matrix_cache)
+        self.metrics.gauge("share_page_cache", "Cache de páginas de resultados compartidos.", self._collect_share_cache)
+        self.metrics.gauge("share_card_cache", "Cache en disco de tarjetas OG.", self._collect_card_cache)
+        self.metrics.gauge("item_bank", "Banco de ítems en archivo por versión.", self._collect_item_bank)
+        self.profiler = RequestProfiler.from_env()
         self.scoring_mode = int(os.getenv("SCORING_MODE", "2"))
-        self.scorer_modes = IqScoringModesService(
-            ScoringParams(
-                eta=0.35,
-                t_guess=2.5,
-                time_k=0.12,
-                time_min=0.80,
-                time_max=1.08,
-                theta_scale=1.2,
-                weights_by_difficulty={1: 1.0, 2: 1.3, 3: 1.6, 4: 2.0, 5: 2.0},
-                t_ref_by_difficulty={1: 8.0, 2: 10.0, 3: 12.0, 4: 14.0, 5: 14.0},
-            ),
-            default_mode=2,
-        )
-        self.scorer_modes.set_mode(self.scoring_mode)
-
-    # Factories de casos de uso
+        self.session_idle_ttl_sec = float(os.getenv("SESSION_IDLE_TTL_SEC", "7200"))
+        self.journal_dir = os.getenv("EVENT_JOURNAL_DIR")
+        self.item_bank_path = os.getenv("ITEM_BANK_PATH")
+        self.matrix_image_mode = os.getenv("MATRIX_IMAGE_MODE", "url")
+        self._background_tasks = [
+            # Desalojo sólo con journal real (si no, los abandonos no quedan registrados) y TTL > 0.
+            PeriodicTask(
+                "session_reaper",
+                float(os.getenv("SESSION_REAPER_INTERVAL_SEC", "60"))
+                if self.journal_dir and self.session_idle_ttl_sec > 0
+                else 0,
+                lambda: self.get_abandon_idle_sessions().execute(),
+            ),
+            PeriodicTask(
+                "norms_rebuild",
+                float(os.getenv("NORM_REBUILD_INTERVAL_SEC", "300")),
+                lambda: self.get_rebuild_norms().execute(),
+            ),
+            PeriodicTask(
+                "sketch_publisher",
+                float(os.getenv("ANALYTICS_SKETCH_INTERVAL_SEC", "30")) if os.getenv("ANALYTICS_SKETCH_DIR") else 0,
+                self._publish_sketches,
+            ),
+            PeriodicTask(
+                "exposure_recalibrate",
+                float(os.getenv("EXPOSURE_RECALIBRATE_SEC", "60")) if os.getenv("EXPOSURE_MAX_RATE") else 0,
+                lambda: self.item_exposure.recalibrate(),
+            ),
+            # Bundling de imágenes inline/sprite fuera del arranque del worker (en preload ya lo hizo el master).
+            PeriodicTask(
+                "item_image_warmup",
+                0.5 if self.matrix_image_mode != "url" else 0,
+                self.warm_item_images,
+                once=True,
+            ),
+            PeriodicTask(
+                "item_bank_reload",
+                float(os.getenv("ITEM_BANK_RELOAD_SEC", "10")) if self.item_bank_path else 0,
+                self._reload_item_bank,
+            ),
+        ]
+
+    def _publish_sketches(self) -> None:
+        self.sketches.publish()
+        self.visitors.publish()
+
+    def start_background_tasks(self) -> None:
+        """Arranca (una vez por proceso) las tareas periódicas; seguro de llamar en cada request."""
+        for task in self._background_tasks:
+            task.ensure_started()
+
+    def _singleton(self, name: str, factory: Callable[[], T]) -> T:
+        """Devuelve la instancia cacheada o la construye una sola vez (double-checked locking)."""
+        instance = self._singletons.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._singletons.get(name)
+            if instance is None:
+                self._build_stack.append(0.0)
+                started = time.perf_counter()
+                try:
+                    instance = factory()
+                finally:
+                    elapsed = time.perf_counter() - started
+                    nested = self._build_stack.pop()
+                    if self._build_stack:
+                        self._build_stack[-1] += elapsed
+                self._build_timings[name] = {"total_ms": elapsed * 1000, "self_ms": (elapsed - nested) * 1000}
+                self._singletons[name] = instance
+        return instance
+
+    def startup_report(self) -> Dict:
+        """Costo de import del contenedor y de construcción de cada componente ya instanciado."""
+        with self._lock:
+            components = {name: {k: round(v, 3) for k, v in t.items()} for name, t in self._build_timings.items()}
+        return {
+            "import_ms": round(IMPORT_SECONDS * 1000, 3),
+            "built": len(components),
+            "build_ms": round(sum(t["self_ms"] for t in components.values()), 3),
+            "components": components,
+        }
+
+    def warm_up(self) -> Dict:
+        """Construye todos los casos de uso (y su grafo de dependencias) por adelantado."""
+        for attr in dir(self):
+            if attr.startswith("get_"):
+                getattr(self, attr)()
+        return self.startup_report()
+
+    def preload(self) -> Dict:
+        """Modo preload: wiring completo + payloads inmutables precalculados antes del fork."""
+        self.warm_up()
+        pool = self.item_provider.get_pool()
+        self.item_serializer.warm(pool, self.test_configs.current(IQ_TEST_SLUG).iq)
+        self.mixed_engine.warm(pool)
+        return self.startup_report()
+
+    def warm_item_images(self) -> None:
+        """Con imágenes inline/sprite, minifica y arma los payloads visuales (tarea de fondo o preload)."""
+        if self.matrix_image_mode != "url":
+            self.item_serializer.warm(self.item_provider.get_pool(), self.test_configs.current(IQ_TEST_SLUG).iq)
+
+    def _instrument(self, name: str, use_case):
+        return self._trace("use_case", name, InstrumentedUseCase(name, use_case, self.metrics))
+
+    def _trace(self, layer: str, name: str, target):
+        """Envuelve el componente en spans sólo si el tracing está habilitado (costo cero si no)."""
+        if not self.tracer.enabled:
+            return target
+        return TracedProxy(target, name, layer, self.tracer)
+
+    def _collect_live_sessions(self):
+        # Sólo reporta repositorios ya construidos: el scrape no debe forzar el wiring.
+        for kind, name in (
+            ("iq", "session_repo"),
+            ("stroop", "stroop_repo"),
+            ("mixed", "mixed_repo"),
+            ("questionnaire", "questionnaire_repo"),
+        ):
+            repo = self._singletons.get(name)
+            if repo is not None:
+                yield (("kind", kind),), repo.count()
+
+    def _collect_analytics(self):
+        repo = self._singletons.get("analytics_repo")
+        if repo is None:
+            return
+        for stats in repo.list_stats():
+            yield (("test", stats.test), ("event", "start")), stats.starts
+            yield (("test", stats.test), ("event", "finish")), stats.finishes
+
+    def _collect_journal(self):
+        journal = self._singletons.get("journal")
+        if journal is None:
+            return
+        for state, value in journal.stats().items():
+            yield (("state", state),), value
+
+    def _collect_matrix_cache(self):
+        renderer = self._singletons.get("matrix_renderer")
+        if renderer is None:
+            return
+        for stat, value in renderer.stats().items():
+            yield (("stat", stat),), value
+
+    def _collect_share_cache(self):
+        store = self._singletons.get("share_store")
+        if store is None:
+            return
+        for stat, value in store.stats().items():
+            yield (("stat", stat),), value
+
+    def _collect_card_cache(self):
+        cards = self._singletons.get("share_cards")
+        if cards is None:
+            return
+        for stat, value in cards.stats().items():
+            yield (("stat", stat),), value
+
+    def _collect_item_bank(self):
+        provider = self._singletons.get("item_provider")
+        # Sólo el banco en archivo es versionado; el estático no reporta nada.
+        stats = getattr(provider, "stats", None)
+        if stats is None:
+            return
+        for stat, value in stats().items():
+            yield (("stat", stat),), value
+
+    def _collect_build_timings(self):
+        yield (("component", "import"),), IMPORT_SECONDS
+        for name, timing in list(self._build_timings.items()):
+            yield (("component", name),), timing["self_ms"] / 1000
+
+    # Configuración
+    @property
+    def test_configs(self) -> TestConfigRegistry:
+        # Config por versión (`config_json` de test_versions) sobre los defaults de value_objects/test_config.
+        return self._singleton(
+            "test_configs",
+            lambda: TestConfigRegistry(
+                self.questionnaire_source,
+                published_ttl_sec=float(os.getenv("TEST_CONFIG_PUBLISHED_TTL_SEC", "60")),
+            ),
+        )
+
+    # Repositorios y proveedores
+    @property
+    def session_repo(self) -> InMemoryIqSessionRepository:
+        return self._singleton(
+            "session_repo", lambda: self._trace("repository", "iq_session_repo", InMemoryIqSessionRepository())
+        )
+
+    @property
+    def analytics_repo(self) -> InMemoryTestAnalyticsRepository:
+        return self._singleton(
+            "analytics_repo",
+            lambda: self._trace(
+                "repository",
+                "analytics_repo",
+                InMemoryTestAnalyticsRepository(profile_labels={IQ_TEST_SLUG: IqBandingService.BANDS}),
+            ),
+        )
+
+    @property
+    def item_stats(self) -> InMemoryIqItemStatsRepository:
+        return self._singleton(
+            "item_stats", lambda: self._trace("repository", "iq_item_stats_repo", InMemoryIqItemStatsRepository())
+        )
+
+    @property
+    def norm_repo(self) -> InMemoryNormRepository:
+        return self._singleton(
+            "norm_repo", lambda: InMemoryNormRepository(max_samples=int(os.getenv("NORM_MAX_SAMPLES", "50000")))
+        )
+
+    @property
+    def sketches(self) -> InMemoryQuantileSketchRepository:
+        return self._singleton("sketches", self._build_sketches)
+
+    def _build_sketches(self) -> InMemoryQuantileSketchRepository:
+        return InMemoryQuantileSketchRepository(
+            relative_accuracy=float(os.getenv("ANALYTICS_SKETCH_ACCURACY", "0.01")),
+            export_dir=self._sketch_export_dir(),
+        )
+
+    @property
+    def visitors(self) -> InMemoryVisitorSketchRepository:
+        return self._singleton(
+            "visitors",
+            lambda: InMemoryVisitorSketchRepository(
+                precision=int(os.getenv("VISITOR_HLL_PRECISION", "12")),
+                retention_days=int(os.getenv("VISITOR_RETENTION_DAYS", "35")),
+                export_dir=self._sketch_export_dir(),
+            ),
+        )
+
+    def _sketch_export_dir(self) -> Optional[Path]:
+        export_dir = os.getenv("ANALYTICS_SKETCH_DIR")
+        return Path(export_dir) if export_dir else None
+
+    @property
+    def item_provider(self) -> IqItemProvider:
+        return self._singleton(
+            "item_provider", lambda: self._trace("repository", "iq_item_provider", self._build_item_provider())
+        )
+
+    def _build_item_provider(self) -> IqItemProvider:
+        procedural = self.matrix_generator.items(int(os.getenv("PROCEDURAL_MATRIX_ITEMS", "0")))
+        static = StaticIqItemProvider(extra_items=procedural)
+        if not self.item_bank_path:
+            return static
+        return FileIqItemProvider(
+            Path(self.item_bank_path),
+            fallback=static.get_bank(),
+            keep_versions=int(os.getenv("ITEM_BANK_KEEP_VERSIONS", "4")),
+            extra_items=procedural,
+        )
+
+    @property
+    def matrix_generator(self) -> MatrixItemGenerator:
+        return self._singleton("matrix_generator", MatrixItemGenerator)
+
+    @property
+    def matrix_renderer(self) -> CachedMatrixSvgRenderer:
+        return self._singleton(
+            "matrix_renderer",
+            lambda: CachedMatrixSvgRenderer(
+                self.matrix_generator, max_bytes=int(os.getenv("MATRIX_SVG_CACHE_BYTES", str(8 * 1024 * 1024)))
+            ),
+        )
+
+    def _reload_item_bank(self) -> None:
+        # Si todavía no se construyó, lo cargará al construirse.
+        provider = self._singletons.get("item_provider")
+        if provider is not None:
+            provider.refresh()
+
+    @property
+    def journal(self) -> EventJournal:
+        return self._singleton("journal", build_event_journal_from_env)
+
+    @property
+    def tip_provider(self) -> StaticTipProvider:
+        return self._singleton("tip_provider", StaticTipProvider)
+
+    @property
+    def db_checker(self) -> InMemoryDbHealthChecker:
+        return self._singleton("db_checker", InMemoryDbHealthChecker)
+
+    @property
+    def stroop_repo(self) -> InMemoryStroopSessionRepository:
+        return self._singleton(
+            "stroop_repo", lambda: self._trace("repository", "stroop_session_repo", InMemoryStroopSessionRepository())
+        )
+
+    @property
+    def mixed_repo(self) -> InMemoryMixedSessionRepository:
+        return self._singleton(
+            "mixed_repo", lambda: self._trace("repository", "mixed_session_repo", InMemoryMixedSessionRepository())
+        )
+
+    @property
+    def questionnaire_repo(self) -> InMemoryQuestionnaireSessionRepository:
+        return self._singleton(
+            "questionnaire_repo",
+            lambda: self._trace("repository", "questionnaire_session_repo", InMemoryQuestionnaireSessionRepository()),
+        )
+
+    @property
+    def questionnaire_source(self) -> QuestionnaireSource:
+        return self._singleton(
+            "questionnaire_source", lambda: self._trace("repository", "questionnaire_source", self._build_q_source())
+        )
+
+    def _build_q_source(self) -> QuestionnaireSource:
+        # Postgres (schema tests/test_versions/questions/options/profiles) si hay DSN; si no, archivos JSON.
+        dsn = os.getenv("QUESTIONNAIRE_DATABASE_URL")
+        if dsn:
+            return PostgresQuestionnaireSource(dsn)
+        return JsonQuestionnaireSource(Path(os.getenv("QUESTIONNAIRE_DIR", "questionnaires")))
+
+    @property
+    def questionnaire_catalog(self) -> QuestionnaireCatalog:
+        return self._singleton(
+            "questionnaire_catalog",
+            lambda: QuestionnaireCatalog(
+                self.questionnaire_source,
+                published_ttl_sec=float(os.getenv("QUESTIONNAIRE_PUBLISHED_TTL_SEC", "60")),
+            ),
+        )
+
+    @property
+    def share_repo(self) -> InMemoryShareResultRepository:
+        return self._singleton(
+            "share_repo",
+            lambda: self._trace(
+                "repository",
+                "share_result_repo",
+                InMemoryShareResultRepository(max_entries=int(os.getenv("SHARE_MAX_ENTRIES", "100000"))),
+            ),
+        )
+
+    @property
+    def share_store(self) -> CachedSharePageStore:
+        return self._singleton("share_store", self._build_share_store)
+
+    def _build_share_store(self) -> CachedSharePageStore:
+        directory = os.getenv("SHARE_PAGE_DIR")
+        return CachedSharePageStore(
+            Path(directory) if directory else None,
+            max_bytes=int(os.getenv("SHARE_PAGE_CACHE_BYTES", str(16 * 1024 * 1024))),
+        )
+
+    @property
+    def result_sharer(self) -> ResultSharer:
+        return self._singleton(
+            "result_sharer",
+            lambda: ResultSharer(self.share_repo, self.share_renderer, self.share_store, self.share_cards),
+        )
+
+    @property
+    def share_renderer(self) -> TemplateSharePageRenderer:
+        return self._singleton(
+            "share_renderer",
+            lambda: TemplateSharePageRenderer(
+                FRONTEND_DIR / "compartido.html", base_url=os.getenv("PUBLIC_BASE_URL", "")
+            ),
+        )
+
+    @property
+    def share_cards(self) -> DiskShareCardCache:
+        return self._singleton("share_cards", self._build_share_cards)
+
+    def _build_share_cards(self) -> DiskShareCardCache:
+        directory = os.getenv("SHARE_CARD_DIR") or os.path.join(tempfile.gettempdir(), "apb-share-cards")
+        return DiskShareCardCache(
+            SvgShareCardRenderer(),
+            Path(directory),
+            max_bytes=int(os.getenv("SHARE_CARD_CACHE_BYTES", str(64 * 1024 * 1024))),
+            workers=int(os.getenv("SHARE_CARD_WORKERS", "2")),
+        )
+
+    # Servicios de dominio compartidos
+    @property
+    def selector(self) -> IqSelectorService:
+        return self._singleton(
+            "selector", lambda: self._trace("domain", "iq_selector", IqSelectorService(self.item_exposure))
+        )
+
+    @property
+    def item_exposure(self) -> SympsonHetterExposure:
+        return self._singleton(
+            "item_exposure",
+            lambda: SympsonHetterExposure(
+                max_rate=float(os.getenv("EXPOSURE_MAX_RATE", "1")),
+                min_sessions=int(os.getenv("EXPOSURE_MIN_SESSIONS", "200")),
+            ),
+        )
+
+    @property
+    def scorer(self) -> IqScoringService:
+        return self._singleton("scorer", lambda: self._trace("domain", "iq_scorer", IqScoringService()))
+
+    @property
+    def banding(self) -> IqBandingService:
+        return self._singleton("banding", lambda: self._trace("domain", "iq_banding", IqBandingService()))
+
+    @property
+    def result_service(self) -> IqResultService:
+        return self._singleton("result_service", lambda: IqResultService(self.banding))
+
+    @property
+    def stroop_engine(self) -> StroopEngine:
+        return self._singleton("stroop_engine", lambda: self._trace("domain", "stroop_engine", StroopEngine()))
+
+    @property
+    def mixed_engine(self) -> MixedEngine:
+        return self._singleton(
+            "mixed_engine",
+            lambda: self._trace("domain", "mixed_engine", MixedEngine(self.stroop_engine, self.selector)),
+        )
+
+    @property
+    def item_serializer(self) -> IqItemSerializer:
+        return self._singleton("item_serializer", lambda: IqItemSerializer(self.image_bundler))
+
+    @property
+    def image_bundler(self) -> MatrixImageBundler:
+        return self._singleton(
+            "image_bundler",
+            lambda: MatrixImageBundler(SvgImageSource(FRONTEND_DIR, self.matrix_renderer), mode=self.matrix_image_mode),
+        )
+
+    @property
+    def scorer_modes(self) -> IqScoringModesService:
+        return self._singleton("scorer_modes", self._build_scorer_modes)
+
+    def _build_scorer_modes(self) -> IqScoringModesService:
+        scorer_modes = IqScoringModesService(default_mode=2, shadow=os.getenv("SCORING_SHADOW", "1") == "1")
+        scorer_modes.set_mode(self.scoring_mode)
+        scorer_modes.set_cohorts(parse_cohorts(os.getenv("SCORING_AB_SPLIT", "")))
+        return self._trace("domain", "iq_scoring_modes", scorer_modes)
+
+    # Factories de casos de uso (singletons: los casos de uso no guardan estado propio)
     def get_start_iq(self) -> StartIqTestUseCase:
-        return StartIqTestUseCase(
-            session_repo=self.session_repo,
-            analytics_repo=self.analytics_repo,
-            item_provider=self.item_provider,
-            selector=self.selector,
-            scoring_mode=self.scoring_mode,
-            config=self.iq_config,
+        return self._singleton(
+            "use_case.start_iq",
+            lambda: self._instrument(
+                "start_iq",
+                StartIqTestUseCase(
+                    session_repo=self.session_repo,
+                    analytics_repo=self.analytics_repo,
+                    item_provider=self.item_provider,
+                    selector=self.selector,
+                    scorer_modes=self.scorer_modes,
+                    configs=self.test_configs,
+                    serializer=self.item_serializer,
+                    journal=self.journal,
+                    visitors=self.visitors,
+                ),
+            ),
         )
 
     def get_answer_iq(self) -> AnswerIqBlockUseCase:
-        return AnswerIqBlockUseCase(
-            session_repo=self.session_repo,
-            item_provider=self.item_provider,
-            selector=self.selector,
-            scorer=self.scorer,
-            scorer_modes=self.scorer_modes,
-            config=self.iq_config,
+        return self._singleton(
+            "use_case.answer_iq",
+            lambda: self._instrument(
+                "answer_iq",
+                AnswerIqBlockUseCase(
+                    session_repo=self.session_repo,
+                    item_provider=self.item_provider,
+                    selector=self.selector,
+                    scorer=self.scorer,
+                    scorer_modes=self.scorer_modes,
+                    configs=self.test_configs,
+                    serializer=self.item_serializer,
+                    journal=self.journal,
+                    sketches=self.sketches,
+                    item_stats=self.item_stats,
+                ),
+            ),
         )
 
     def get_finish_iq(self) -> FinishIqTestUseCase:
-        return FinishIqTestUseCase(
-            session_repo=self.session_repo,
-            analytics_repo=self.analytics_repo,
-            banding_service=self.banding,
-            scorer_modes=self.scorer_modes,
-            config=self.iq_config,
+        return self._singleton(
+            "use_case.finish_iq",
+            lambda: self._instrument(
+                "finish_iq",
+                FinishIqTestUseCase(
+                    session_repo=self.session_repo,
+                    analytics_repo=self.analytics_repo,
+                    banding_service=self.banding,
+                    scorer_modes=self.scorer_modes,
+                    configs=self.test_configs,
+                    journal=self.journal,
+                    sketches=self.sketches,
+                    item_stats=self.item_stats,
+                    norm_repo=self.norm_repo,
+                    norm_min_samples=int(os.getenv("NORM_MIN_SAMPLES", "200")),
+                    sharer=self.result_sharer,
+                ),
+            ),
         )
 
     def get_analytics_summary(self) -> GetAnalyticsSummaryUseCase:
-        return GetAnalyticsSummaryUseCase(self.analytics_repo)
+        return self._singleton(
+            "use_case.analytics_summary",
+            lambda: self._instrument(
+                "analytics_summary", GetAnalyticsSummaryUseCase(self.analytics_repo, self.sketches)
+            ),
+        )
+
+    def get_analytics_quantiles(self) -> GetAnalyticsQuantilesUseCase:
+        return self._singleton(
+            "use_case.analytics_quantiles",
+            lambda: self._instrument("analytics_quantiles", GetAnalyticsQuantilesUseCase(self.sketches)),
+        )
+
+    def get_analytics_items(self) -> GetAnalyticsItemsUseCase:
+        return self._singleton(
+            "use_case.analytics_items",
+            lambda: self._instrument(
+                "analytics_items", GetAnalyticsItemsUseCase(self.item_stats, self.item_provider, self.item_exposure)
+            ),
+        )
+
+    def get_analytics_visitors(self) -> GetAnalyticsVisitorsUseCase:
+        return self._singleton(
+            "use_case.analytics_visitors",
+            lambda: self._instrument("analytics_visitors", GetAnalyticsVisitorsUseCase(self.visitors)),
+        )
+
+    def get_analytics_tests(self) -> GetAnalyticsTestsUseCase:
+        return self._singleton(
+            "use_case.analytics_tests",
+            lambda: self._instrument("analytics_tests", GetAnalyticsTestsUseCase(self.analytics_repo)),
+        )
 
     def get_analytics_funnel(self) -> GetAnalyticsFunnelUseCase:
-        return GetAnalyticsFunnelUseCase(self.analytics_repo)
+        return self._singleton(
+            "use_case.analytics_funnel",
+            lambda: self._instrument("analytics_funnel", GetAnalyticsFunnelUseCase(self.analytics_repo)),
+        )
 
     def get_analytics_profiles(self) -> GetAnalyticsProfilesUseCase:
-        return GetAnalyticsProfilesUseCase(self.analytics_repo)
+        return self._singleton(
+            "use_case.analytics_profiles",
+            lambda: self._instrument("analytics_profiles", GetAnalyticsProfilesUseCase(self.analytics_repo)),
+        )
 
     def get_analytics_dropoff(self) -> GetAnalyticsDropoffUseCase:
-        return GetAnalyticsDropoffUseCase()
+        return self._singleton(
+            "use_case.analytics_dropoff",
+            lambda: self._instrument("analytics_dropoff", GetAnalyticsDropoffUseCase()),
+        )
 
     def get_list_tests(self) -> ListTestsUseCase:
-        return ListTestsUseCase()
+        return self._singleton("use_case.list_tests", lambda: self._instrument("list_tests", ListTestsUseCase()))
 
     def get_tip_today(self) -> GetTipTodayUseCase:
-        return GetTipTodayUseCase(self.tip_provider)
+        return self._singleton(
+            "use_case.tip_today", lambda: self._instrument("tip_today", GetTipTodayUseCase(self.tip_provider))
+        )
 
     def get_db_check(self) -> DbCheckUseCase:
-        return DbCheckUseCase(self.db_checker)
+        return self._singleton(
+            "use_case.db_check", lambda: self._instrument("db_check", DbCheckUseCase(self.db_checker))
+        )
 
     # Stroop/WCST híbrido
     def get_stroop_start(self) -> StartStroopUseCase:
-        return StartStroopUseCase(self.stroop_repo, self.stroop_engine)
+        return self._singleton(
+            "use_case.stroop_start",
+            lambda: self._instrument(
+                "stroop_start",
+                StartStroopUseCase(
+                    repo=self.stroop_repo,
+                    engine=self.stroop_engine,
+                    journal=self.journal,
+                    visitors=self.visitors,
+                    analytics_repo=self.analytics_repo,
+                    configs=self.test_configs,
+                ),
+            ),
+        )
 
     def get_stroop_answer(self) -> AnswerStroopUseCase:
-        return AnswerStroopUseCase(self.stroop_repo, self.stroop_engine)
+        return self._singleton(
+            "use_case.stroop_answer",
+            lambda: self._instrument(
+                "stroop_answer",
+                AnswerStroopUseCase(
+                    repo=self.stroop_repo,
+                    engine=self.stroop_engine,
+                    journal=self.journal,
+                    sketches=self.sketches,
+                    configs=self.test_configs,
+                ),
+            ),
+        )
 
     def get_stroop_finish(self) -> FinishStroopUseCase:
-        return FinishStroopUseCase(self.stroop_repo)
+        return self._singleton(
+            "use_case.stroop_finish",
+            lambda: self._instrument(
+                "stroop_finish",
+                FinishStroopUseCase(
+                    repo=self.stroop_repo,
+                    journal=self.journal,
+                    sketches=self.sketches,
+                    analytics_repo=self.analytics_repo,
+                    sharer=self.result_sharer,
+                ),
+            ),
+        )
 
     # Mixto IQ + Stroop
     def get_mixed_start(self) -> StartMixedUseCase:
-        return StartMixedUseCase(self.mixed_repo, self.mixed_engine)
+        return self._singleton(
+            "use_case.mixed_start",
+            lambda: self._instrument(
+                "mixed_start",
+                StartMixedUseCase(
+                    repo=self.mixed_repo,
+                    engine=self.mixed_engine,
+                    item_provider=self.item_provider,
+                    journal=self.journal,
+                    visitors=self.visitors,
+                    analytics_repo=self.analytics_repo,
+                ),
+            ),
+        )
 
     def get_mixed_answer(self) -> AnswerMixedUseCase:
-        return AnswerMixedUseCase(self.mixed_repo, self.mixed_engine)
+        return self._singleton(
+            "use_case.mixed_answer",
+            lambda: self._instrument(
+                "mixed_answer", AnswerMixedUseCase(self.mixed_repo, self.mixed_engine, self.journal)
+            ),
+        )
 
     def get_mixed_finish(self) -> FinishMixedUseCase:
-        return FinishMixedUseCase(self.mixed_repo, self.mixed_engine)
+        return self._singleton(
+            "use_case.mixed_finish",
+            lambda: self._instrument(
+                "mixed_finish",
+                FinishMixedUseCase(
+                    repo=self.mixed_repo,
+                    engine=self.mixed_engine,
+                    journal=self.journal,
+                    sketches=self.sketches,
+                    analytics_repo=self.analytics_repo,
+                    sharer=self.result_sharer,
+                ),
+            ),
+        )
+
+    # Cuestionarios definidos por datos
+    def get_questionnaire_list(self) -> ListQuestionnairesUseCase:
+        return self._singleton(
+            "use_case.questionnaire_list",
+            lambda: self._instrument("questionnaire_list", ListQuestionnairesUseCase(self.questionnaire_catalog)),
+        )
+
+    def get_questionnaire_start(self) -> StartQuestionnaireUseCase:
+        return self._singleton(
+            "use_case.questionnaire_start",
+            lambda: self._instrument(
+                "questionnaire_start",
+                StartQuestionnaireUseCase(
+                    repo=self.questionnaire_repo,
+                    catalog=self.questionnaire_catalog,
+                    journal=self.journal,
+                    visitors=self.visitors,
+                    analytics_repo=self.analytics_repo,
+                ),
+            ),
+        )
+
+    def get_questionnaire_answer(self) -> AnswerQuestionnaireUseCase:
+        return self._singleton(
+            "use_case.questionnaire_answer",
+            lambda: self._instrument(
+                "questionnaire_answer",
+                AnswerQuestionnaireUseCase(self.questionnaire_repo, self.questionnaire_catalog, self.journal),
+            ),
+        )
+
+    def get_questionnaire_finish(self) -> FinishQuestionnaireUseCase:
+        return self._singleton(
+            "use_case.questionnaire_finish",
+            lambda: self._instrument(
+                "questionnaire_finish",
+                FinishQuestionnaireUseCase(
+                    repo=self.questionnaire_repo,
+                    catalog=self.questionnaire_catalog,
+                    journal=self.journal,
+                    sketches=self.sketches,
+                    analytics_repo=self.analytics_repo,
+                    sharer=self.result_sharer,
+                ),
+            ),
+        )
+
+    # Resultados compartidos
+    def get_share_page(self) -> GetSharePageUseCase:
+        return self._singleton(
+            "use_case.share_page",
+            lambda: self._instrument(
+                "share_page", GetSharePageUseCase(self.share_repo, self.share_renderer, self.share_store)
+            ),
+        )
+
+    def get_share_card(self) -> GetShareCardUseCase:
+        return self._singleton(
+            "use_case.share_card",
+            lambda: self._instrument("share_card", GetShareCardUseCase(self.share_repo, self.share_cards)),
+        )
+
+    # Matrices procedurales
+    def get_matrix_svg(self) -> RenderMatrixSvgUseCase:
+        return self._singleton(
+            "use_case.matrix_svg",
+            lambda: self._instrument("matrix_svg", RenderMatrixSvgUseCase(self.matrix_renderer)),
+        )
+
+    def get_item_sprite(self) -> GetItemSpriteUseCase:
+        return self._singleton(
+            "use_case.item_sprite",
+            lambda: self._instrument("item_sprite", GetItemSpriteUseCase(self.item_provider, self.image_bundler)),
+        )
+
+    # Export
+    def get_export_data(self) -> ExportSessionDataUseCase:
+        return self._singleton(
+            "use_case.export_data",
+            lambda: self._instrument(
+                "export_data", ExportSessionDataUseCase(JournalEventSource(Path(self.journal_dir or "journal")))
+            ),
+        )
+
+    # Mantenimiento
+    def get_rebuild_norms(self) -> RebuildNormTablesUseCase:
+        return self._singleton(
+            "use_case.rebuild_norms",
+            lambda: self._instrument("rebuild_norms", RebuildNormTablesUseCase(self.norm_repo)),
+        )
+
+    def get_abandon_idle_sessions(self) -> AbandonIdleSessionsUseCase:
+        return self._singleton(
+            "use_case.abandon_idle_sessions",
+            lambda: self._instrument(
+                "abandon_idle_sessions",
+                AbandonIdleSessionsUseCase(
+                    repos=(
+                        (IQ_TEST_SLUG, self.session_repo),
+                        (STROOP_TEST_SLUG, self.stroop_repo),
+                        (MIXED_TEST_SLUG, self.mixed_repo),
+                        ("questionnaire", self.questionnaire_repo),
+                    ),
+                    journal=self.journal,
+                    max_idle_sec=self.session_idle_ttl_sec,
+                ),
+            ),
+        )
@@ -0,0 +1,58 @@
+import math
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class IqItemStats:
+    """Estadísticas psicométricas de un ítem IQ, acumuladas en O(1) por respuesta (Welford)."""
+
+    item_id: str
+    exposures: int = 0
+    corrects: int = 0
+    timeouts: int = 0
+    rt_mean: float = 0.0
+    rt_m2: float = 0.0
+    # Co-momentos (acierto 0/1, theta final) para la correlación punto-biserial.
+    scored: int = 0
+    correct_mean: float = 0.0
+    theta_mean: float = 0.0
+    correct_m2: float = 0.0
+    theta_m2: float = 0.0
+    co_moment: float = 0.0
+
+    def add_answer(self, correct: bool, seconds: float, timed_out: bool) -> None:
+        self.exposures += 1
+        self.corrects += int(correct)
+        self.timeouts += int(timed_out)
+        delta = seconds - self.rt_mean
+        self.rt_mean += delta / self.exposures
+        self.rt_m2 += delta * (seconds - self.rt_mean)
+
+    def add_outcome(self, correct: bool, theta: float) -> None:
+        x = 1.0 if correct else 0.0
+        self.scored += 1
+        dx = x - self.correct_mean
+        self.correct_mean += dx / self.scored
+        dy = theta - self.theta_mean
+        self.theta_mean += dy / self.scored
+        self.correct_m2 += dx * (x - self.correct_mean)
+        self.theta_m2 += dy * (theta - self.theta_mean)
+        self.co_moment += dx * (theta - self.theta_mean)
+
+    @property
+    def p_value(self) -> Optional[float]:
+        return self.corrects / self.exposures if self.exposures else None
+
+    @property
+    def timeout_rate(self) -> Optional[float]:
+        return self.timeouts / self.exposures if self.exposures else None
+
+    @property
+    def rt_variance(self) -> Optional[float]:
+        return self.rt_m2 / (self.exposures - 1) if self.exposures > 1 else None
+
+    @property
+    def point_biserial(self) -> Optional[float]:
+        denominator = math.sqrt(self.correct_m2 * self.theta_m2)
+        return self.co_moment / denominator if denominator > 0 else None
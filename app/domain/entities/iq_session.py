@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -21,3 +21,13 @@ class IqSession:
     weighted_total: float = 0.0
     finished: bool = False
     result: Optional[dict] = None
+    source: Optional[str] = None
+    campaign: Optional[str] = None
+    # Versión del test (test_versions): fija la config de toda la sesión aunque se publique otra.
+    version: int = 1
+    # Versión del banco de ítems con la que arrancó: una recarga no cambia los ítems de sesiones en curso.
+    bank_version: Optional[str] = None
+    # item_id -> acierto; al finalizar alimenta la punto-biserial con el theta final.
+    item_outcomes: Dict[str, bool] = field(default_factory=dict)
+    # Scores de los otros modos (shadow scoring), por modo: {"0": {score, theta, iq}, ...}
+    shadow_scores: Dict[str, Dict[str, float]] = field(default_factory=dict)
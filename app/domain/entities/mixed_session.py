@@ -1,5 +1,6 @@
+import time
 from dataclasses import dataclass, field
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 
 @dataclass
@@ -23,3 +24,7 @@ class MixedSession:
     stroop_correct: int = 0
     stroop_total: int = 0
     finished: bool = False
+    result: Optional[dict] = None
+    started_at: float = field(default_factory=time.time)
+    source: Optional[str] = None
+    campaign: Optional[str] = None
@@ -0,0 +1,23 @@
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class QuestionnaireSession:
+    """Sesión de un cuestionario definido por datos (tablas questions / options / profiles)."""
+
+    session_id: str
+    test_slug: str
+    version: int
+    # Índice de la pregunta actual en el cuestionario compilado; None al terminar.
+    current: Optional[int] = 0
+    # Puntaje por dimensión, en el orden de slots del cuestionario compilado (slot 0 = total).
+    scores: List[float] = field(default_factory=list)
+    # (question_id, option_id o None si se omitió)
+    answers: List[Tuple[int, Optional[int]]] = field(default_factory=list)
+    finished: bool = False
+    result: Optional[dict] = None
+    started_at: float = field(default_factory=time.time)
+    source: Optional[str] = None
+    campaign: Optional[str] = None
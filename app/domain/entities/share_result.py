@@ -0,0 +1,20 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class ShareResult:
+    """Resultado compartible (fila de `share_results`): todo lo que muestra la página pública, sin la sesión."""
+
+    share_token: str
+    session_id: str
+    test_slug: str
+    version: int
+    test_title: str
+    profile_code: str
+    title: str
+    summary: Optional[str] = None
+    recommendations: Tuple[str, ...] = ()
+    score: Optional[float] = None
+    created_at: float = field(default_factory=time.time)
@@ -1,5 +1,43 @@
+import time
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Optional
+
+from app.domain.value_objects.test_config import STROOP_RULES
+
+STROOP_COLORS = ("rojo", "verde", "azul", "amarillo")
+NEUTRAL_WORD = "XXXX"
+STROOP_TRIAL_TYPES = ("incongruente", "congruente", "neutro")
+# Tope del tiempo de respuesta guardado (columna int32).
+RT_MS_MAX = 2**31 - 1
+
+_WORDS = STROOP_COLORS + (NEUTRAL_WORD,)
+_COLOR_CODES = {color: code for code, color in enumerate(STROOP_COLORS)}
+_OTHER_SELECTED = 7
+_CORRECT_BIT = 1 << 3
+_SWITCH_BIT = 1 << 4
+
+
+def stroop_trial_type(word: str, ink: str) -> str:
+    if word == NEUTRAL_WORD:
+        return "neutro"
+    return "congruente" if word == ink else "incongruente"
+
+
+# Un trial = (regla, palabra, tinta) -> un byte; el tipo se deriva y se decodifica con `bytes.translate`.
+_TRIAL_KEYS = [(rule, word, ink) for rule in STROOP_RULES for word in _WORDS for ink in STROOP_COLORS]
+_TRIAL_CODES = {key: code for code, key in enumerate(_TRIAL_KEYS)}
+
+
+def _decode_table(values) -> bytes:
+    values = list(values)
+    return bytes(values + [0] * (256 - len(values)))
+
+
+_TYPE_OF_TRIAL = _decode_table(STROOP_TRIAL_TYPES.index(stroop_trial_type(w, i)) for _, w, i in _TRIAL_KEYS)
+_RULE_OF_TRIAL = _decode_table(STROOP_RULES.index(rule) for rule, _, _ in _TRIAL_KEYS)
+_CORRECT_OF_FLAGS = bytes(1 if b & _CORRECT_BIT else 0 for b in range(256))
+_SWITCH_OF_FLAGS = bytes(1 if b & _SWITCH_BIT else 0 for b in range(256))
 
 
 @dataclass
@@ -24,6 +62,58 @@ class StroopAnswer:
     rule_changed_before: bool
 
 
+class StroopAnswerLog:
+    """Respuestas de una sesión Stroop empaquetadas en tres columnas `array`, ~6 bytes por trial.
+
+    `trials`: código de (regla, palabra, tinta) -> 1 byte. `flags`: color elegido (bits 0-2, 7 si no es un
+    color), acierto (bit 3) y cambio de regla previo (bit 4) -> 1 byte. `rt_ms`: int32. Reemplaza un
+    `StroopAnswer` con su `__dict__` por respuesta: la sesión tiene un número fijo de objetos, sin
+    referencias que recorrer para el GC. Los métodos de vista decodifican una columna entera de una vez.
+    """
+
+    __slots__ = ("trials", "flags", "rt_ms")
+
+    def __init__(self) -> None:
+        self.trials = array("B")
+        self.flags = array("B")
+        self.rt_ms = array("i")
+
+    def append(self, answer: StroopAnswer) -> None:
+        trial = answer.trial
+        selected = _OTHER_SELECTED
+        if isinstance(answer.selected, str):
+            selected = _COLOR_CODES.get(answer.selected, _OTHER_SELECTED)
+        self.trials.append(_TRIAL_CODES[(trial.rule_id, trial.word, trial.ink)])
+        self.flags.append(
+            selected | (_CORRECT_BIT if answer.correct else 0) | (_SWITCH_BIT if answer.rule_changed_before else 0)
+        )
+        self.rt_ms.append(answer.rt_ms)
+
+    def __len__(self) -> int:
+        return len(self.rt_ms)
+
+    def __bool__(self) -> bool:
+        return len(self.rt_ms) > 0
+
+    def trial_types(self) -> bytes:
+        """Índice en `STROOP_TRIAL_TYPES` por trial."""
+        return self.trials.tobytes().translate(_TYPE_OF_TRIAL)
+
+    def rules(self) -> bytes:
+        """Índice en `STROOP_RULES` por trial."""
+        return self.trials.tobytes().translate(_RULE_OF_TRIAL)
+
+    def correct(self) -> bytes:
+        return self.flags.tobytes().translate(_CORRECT_OF_FLAGS)
+
+    def rule_changed(self) -> bytes:
+        return self.flags.tobytes().translate(_SWITCH_OF_FLAGS)
+
+    @staticmethod
+    def type_code(trial_type: str) -> int:
+        return STROOP_TRIAL_TYPES.index(trial_type)
+
+
 @dataclass
 class StroopSession:
     """Sesión del test Stroop-WCST híbrido."""
@@ -34,4 +124,10 @@ class StroopSession:
     correct_in_rule: int = 0
     block_id: int = 1
     finished: bool = False
-    answers: List[StroopAnswer] = field(default_factory=list)
+    answers: StroopAnswerLog = field(default_factory=StroopAnswerLog)
+    result: Optional[dict] = None
+    started_at: float = field(default_factory=time.time)
+    source: Optional[str] = None
+    campaign: Optional[str] = None
+    # Versión del test (test_versions) con la que arrancó; define su StroopConfig.
+    version: int = 1
@@ -0,0 +1,56 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+SCORE_BUCKET = 5
+
+
+@dataclass
+class TestAnalytics:
+    """Estadísticas agregadas de un test (slug + versión): funnel, duración, perfiles y scores."""
+
+    test: str
+    version: Optional[int] = None  # None = agregado de todas las versiones
+    starts: int = 0
+    finishes: int = 0
+    total_time_sec: int = 0
+    profiles: Dict[str, int] = field(default_factory=dict)
+    score_sum: float = 0.0
+    scored: int = 0
+    score_histogram: Dict[int, int] = field(default_factory=dict)  # límite inferior del bucket -> cantidad
+
+    def record_start(self) -> None:
+        self.starts += 1
+
+    def record_finish(self, duration_sec: int, profile: Optional[str], score: Optional[float]) -> None:
+        self.finishes += 1
+        self.total_time_sec += duration_sec
+        if profile is not None:
+            self.profiles[profile] = self.profiles.get(profile, 0) + 1
+        if score is not None:
+            self.scored += 1
+            self.score_sum += score
+            bucket = int(score // SCORE_BUCKET) * SCORE_BUCKET
+            self.score_histogram[bucket] = self.score_histogram.get(bucket, 0) + 1
+
+    def merge(self, other: "TestAnalytics") -> None:
+        self.starts += other.starts
+        self.finishes += other.finishes
+        self.total_time_sec += other.total_time_sec
+        for profile, count in other.profiles.items():
+            self.profiles[profile] = self.profiles.get(profile, 0) + count
+        self.score_sum += other.score_sum
+        self.scored += other.scored
+        for bucket, count in other.score_histogram.items():
+            self.score_histogram[bucket] = self.score_histogram.get(bucket, 0) + count
+
+    @property
+    def finish_rate(self) -> float:
+        return self.finishes / self.starts if self.starts else 0.0
+
+    @property
+    def avg_time_sec(self) -> float:
+        return self.total_time_sec / self.finishes if self.finishes else 0.0
+
+    @property
+    def mean_score(self) -> Optional[float]:
+        return self.score_sum / self.scored if self.scored else None
@@ -8,3 +8,23 @@ class SessionNotFoundError(DomainError):
 
 class InvalidAnswerError(DomainError):
     """Respuesta inválida para un ítem de IQ."""
+
+
+class ItemNotFoundError(DomainError):
+    """Ítem inexistente en el banco vigente."""
+
+
+class QuestionnaireNotFoundError(DomainError):
+    """Cuestionario o versión inexistente."""
+
+
+class QuestionnaireDefinitionError(DomainError):
+    """Definición de cuestionario inválida (reglas, saltos o perfiles inconsistentes)."""
+
+
+class ShareNotFoundError(DomainError):
+    """Token de resultado compartido inexistente."""
+
+
+class InvalidTestConfigError(DomainError):
+    """`config_json` de una versión de test inválido (claves, tipos o rangos)."""
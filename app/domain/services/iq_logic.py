@@ -1,62 +1,116 @@
-from typing import Dict, List, Sequence
+import random
+from itertools import chain
+from typing import List, Mapping, Optional, Sequence, Set
 
 from app.domain.entities.iq_answer import IqAnswer
 from app.domain.entities.iq_item import IqItem
 from app.domain.entities.iq_session import IqSession
 from app.domain.exceptions import InvalidAnswerError
+from app.domain.services.item_exposure import SympsonHetterExposure
 from app.domain.value_objects.iq_config import IqConfig
+from app.domain.value_objects.interval_table import IntervalTable
 from app.domain.value_objects.iq_result import IqResult
+from app.domain.value_objects.item_bank import ItemBank
+
+
+# (mínimo, máximo, (banda, etiqueta)) en IQ entero; la tabla se valida al importar.
+IQ_BAND_RANGES = (
+    (float("-inf"), 89, ("<90", "Por debajo del promedio")),
+    (90, 109, ("90-109", "Promedio")),
+    (110, 119, ("110-119", "Por encima del promedio")),
+    (120, 129, ("120-129", "Superior")),
+    (130, float("inf"), (">=130", "Muy superior")),
+)
+_IQ_BANDS = IntervalTable.build(IQ_BAND_RANGES, step=1)
 
 
 class IqBandingService:
     """Lógica de bandas y etiquetas de IQ (dominio IQ)."""
 
+    BANDS = tuple(band for band, _ in _IQ_BANDS.values)
+
     @staticmethod
     def band(iq_value: int) -> str:
-        if iq_value < 90:
-            return "<90"
-        if iq_value <= 109:
-            return "90-109"
-        if iq_value <= 119:
-            return "110-119"
-        if iq_value <= 129:
-            return "120-129"
-        return ">=130"
+        return _IQ_BANDS.resolve(iq_value)[0]
 
     @staticmethod
     def label(iq_value: int) -> str:
-        if iq_value < 90:
-            return "Por debajo del promedio"
-        if iq_value <= 109:
-            return "Promedio"
-        if iq_value <= 119:
-            return "Por encima del promedio"
-        if iq_value <= 129:
-            return "Superior"
-        return "Muy superior"
+        return _IQ_BANDS.resolve(iq_value)[1]
 
 
 class IqSelectorService:
-    """Selecciona bloques de ítems según la dificultad y disponibilidad."""
+    """Selecciona bloques de ítems según la dificultad y disponibilidad, con control de exposición."""
+
+    # Sorteos por ítem pedido antes de recorrer el bucket: con bancos grandes casi nunca se agotan.
+    MAX_DRAWS_PER_ITEM = 8
 
-    def select_block(self, pool: Sequence[IqItem], difficulty: int, used_ids: List[str], count: int) -> List[IqItem]:
-        candidates = [item for item in pool if item.difficulty == difficulty and item.item_id not in used_ids]
-        if len(candidates) < count:
-            for diff in (difficulty - 1, difficulty + 1):
-                if diff < 1 or diff > 5:
-                    continue
-                extra = [item for item in pool if item.difficulty == diff and item.item_id not in used_ids]
-                candidates.extend(extra)
-                if len(candidates) >= count:
-                    break
-        return list(candidates[:count])
+    def __init__(self, exposure: Optional[SympsonHetterExposure] = None, rng: Optional[random.Random] = None) -> None:
+        self._exposure = exposure or SympsonHetterExposure()
+        self._rng = rng or random.Random()
+
+    def select_block(
+        self, bank: ItemBank, difficulty: int, used_ids: List[str], count: int, copies: int = 1
+    ) -> List[IqItem]:
+        """Bloque en la dificultad pedida (o vecinas si no alcanza); `copies` sesiones reciben el mismo bloque."""
+        used = set(used_ids)
+        block: List[IqItem] = []
+        for diff in (difficulty, difficulty - 1, difficulty + 1):
+            if len(block) >= count:
+                break
+            if 1 <= diff <= 5:
+                block += self._draw(bank.domain_buckets[diff], used, count - len(block))
+        self._exposure.record([item.item_id for item in block], copies if not used_ids else 0, copies)
+        return block
+
+    def sample(self, bank: ItemBank, count: int) -> List[IqItem]:
+        """Muestra de cualquier dificultad, balanceada por dominio (test mixto)."""
+        block = self._draw(tuple(bank.by_domain.values()), set(), count)
+        self._exposure.record([item.item_id for item in block], 1)
+        return block
+
+    def _draw(self, buckets: Sequence[Sequence[IqItem]], used: Set[str], count: int) -> List[IqItem]:
+        # Costo esperado O(count): sorteo por índice rotando dominios, sin recorrer el banco.
+        buckets = [bucket for bucket in buckets if bucket]
+        picked: List[IqItem] = []
+        if not buckets or count <= 0:
+            return picked
+        rejected: List[IqItem] = []
+        slot = self._rng.randrange(len(buckets))
+        for _ in range(count * self.MAX_DRAWS_PER_ITEM):
+            if len(picked) >= count:
+                return picked
+            bucket = buckets[slot % len(buckets)]
+            slot += 1
+            item = bucket[self._rng.randrange(len(bucket))]
+            if item.item_id in used:
+                continue
+            used.add(item.item_id)
+            if self._exposure.admit(item.item_id, self._rng):
+                picked.append(item)
+            else:
+                rejected.append(item)
+        # Bucket casi agotado: el resto se sortea en orden aleatorio y sigue pasando por el control de exposición;
+        # los rechazados sólo completan el bloque como último recurso.
+        remaining = [item for item in chain.from_iterable(buckets) if item.item_id not in used]
+        self._rng.shuffle(remaining)
+        for item in remaining:
+            if len(picked) >= count:
+                return picked
+            used.add(item.item_id)
+            if self._exposure.admit(item.item_id, self._rng):
+                picked.append(item)
+            else:
+                rejected.append(item)
+        self._rng.shuffle(rejected)
+        return picked + rejected[: count - len(picked)]
 
 
 class IqScoringService:
     """Procesa respuestas y ajusta dificultad/puntaje."""
 
-    def apply_answers(self, session: IqSession, answers: Sequence[IqAnswer], pool: Sequence[IqItem], config: IqConfig) -> None:
-        pool_by_id: Dict[str, IqItem] = {item.item_id: item for item in pool}
+    def apply_answers(
+        self, session: IqSession, answers: Sequence[IqAnswer], pool_by_id: Mapping[str, IqItem], config: IqConfig
+    ) -> None:
         for answer in answers:
             item = pool_by_id.get(answer.item_id)
             if not item:
@@ -1,79 +1,120 @@
 import math
-from dataclasses import dataclass
-from typing import Dict
+import zlib
+from typing import Dict, Optional
 
 from app.domain.entities.iq_answer import IqAnswer
 from app.domain.entities.iq_item import IqItem
 from app.domain.entities.iq_session import IqSession
+from app.domain.value_objects.iq_config import ScoringParams
 
 
-@dataclass(frozen=True)
-class ScoringParams:
-    eta: float
-    t_guess: float
-    time_k: float
-    time_min: float
-    time_max: float
-    theta_scale: float
-    weights_by_difficulty: Dict[int, float]
-    t_ref_by_difficulty: Dict[int, float]
+SCORING_MODES = (0, 1, 2)
+
+
+def parse_cohorts(spec: str) -> Dict[int, int]:
+    """`"2:90,1:10"` -> {2: 90, 1: 10} (modo: peso); entradas inválidas se ignoran."""
+    cohorts: Dict[int, int] = {}
+    for part in spec.split(","):
+        mode, _, weight = part.partition(":")
+        try:
+            mode_value, weight_value = int(mode), int(weight or 1)
+        except ValueError:
+            continue
+        if mode_value in SCORING_MODES and weight_value > 0:
+            cohorts[mode_value] = weight_value
+    return cohorts
 
 
 class IqScoringModesService:
     """Servicio de scoring multi-modo (0 simple, 1 ponderado, 2 IRT-lite)."""
 
-    def __init__(self, params: ScoringParams, default_mode: int = 2) -> None:
-        self._p = params
+    def __init__(self, default_mode: int = 2, shadow: bool = False) -> None:
+        # Sin parámetros propios: cada llamada recibe los de la versión de la sesión (TestConfigRegistry).
         self._mode = default_mode
+        # Shadow: mantiene el estado de los tres modos en la misma pasada (contadores + un paso de theta).
+        self._shadow = shadow
+        self._cohorts: Dict[int, int] = {}
+        self._cohort_total = 0
 
     def set_mode(self, mode: int) -> None:
-        if mode in (0, 1, 2):
+        if mode in SCORING_MODES:
             self._mode = mode
 
-    def process_answer(self, session: IqSession, item: IqItem, answer: IqAnswer) -> None:
+    def set_cohorts(self, cohorts: Dict[int, int]) -> None:
+        """Reparto A/B de modos por sesión (modo: peso); vacío = todas las sesiones usan el modo default."""
+        self._cohorts = {mode: weight for mode, weight in cohorts.items() if mode in SCORING_MODES and weight > 0}
+        self._cohort_total = sum(self._cohorts.values())
+
+    def assign_mode(self, session_id: str) -> int:
+        """Modo de la sesión: determinístico por session_id para que la cohorte sea estable."""
+        if not self._cohort_total:
+            return self._mode
+        bucket = zlib.crc32(session_id.encode("utf-8")) % self._cohort_total
+        for mode, weight in self._cohorts.items():
+            if bucket < weight:
+                return mode
+            bucket -= weight
+        return self._mode
+
+    def process_answer(self, session: IqSession, item: IqItem, answer: IqAnswer, params: ScoringParams) -> None:
+        """Actualiza los contadores y theta con los parámetros de la versión de la sesión."""
         correct = answer.answer == item.correct and not answer.timed_out
         session.answers_count += 1
+        mode = session.scoring_mode
 
-        if self._mode in (0, 1):
+        if self._shadow or mode in (0, 1):
             if correct:
                 session.simple_corrects += 1
-            weight = self._p.weights_by_difficulty.get(item.difficulty, 1.0)
+            weight = params.weights_by_difficulty.get(item.difficulty, 1.0)
             session.weighted_total += weight
             if correct:
                 session.weighted_sum += weight
 
-        if self._mode == 2:
+        if self._shadow or mode == 2:
             b = item.difficulty_b if item.difficulty_b is not None else 0.0
             theta = session.theta
             x = 1 if correct else 0
             P = 1 / (1 + math.exp(-(theta - b)))
-            delta = self._p.eta * (x - P)
+            delta = params.eta * (x - P)
 
-            t_ref = item.t_ref or self._p.t_ref_by_difficulty.get(item.difficulty, 10.0)
+            t_ref = item.t_ref or params.t_ref_by_difficulty.get(item.difficulty, 10.0)
             seconds = answer.seconds if answer.seconds and answer.seconds > 0 else t_ref
             r = max(0.3, min(2.0, seconds / t_ref))
-            time_factor = 1 - self._p.time_k * math.log(r)
-            time_factor = max(self._p.time_min, min(self._p.time_max, time_factor))
+            time_factor = 1 - params.time_k * math.log(r)
+            time_factor = max(params.time_min, min(params.time_max, time_factor))
             delta *= time_factor
 
-            guessed = (seconds < self._p.t_guess) and (answer.changes == 0)
+            guessed = (seconds < params.t_guess) and (answer.changes == 0)
             if guessed:
                 delta *= 0.65 if x == 1 else 1.10
 
             session.theta = theta + delta
 
-    def finalize_scores(self, session: IqSession) -> Dict[str, float]:
-        """Retorna score principal (0-100) y theta estimada."""
-        if self._mode == 0:
+    def finalize_scores(
+        self, session: IqSession, params: ScoringParams, mode: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Retorna score principal (0-100) y theta estimada (modo de la sesión salvo que se indique otro)."""
+        mode = session.scoring_mode if mode is None else mode
+        if mode == 0:
             total = max(1, session.answers_count)
             score = (session.simple_corrects / total) * 100
             theta_est = (score - 50) / 15.0  # aproximación para IQ recreativo
-        elif self._mode == 1:
+        elif mode == 1:
             total_w = max(1e-6, session.weighted_total)
             score = (session.weighted_sum / total_w) * 100
             theta_est = (score - 50) / 18.0
         else:
             theta_est = session.theta
-            score = round(100 * (1 / (1 + math.exp(-(theta_est / self._p.theta_scale)))))
+            score = round(100 * (1 / (1 + math.exp(-(theta_est / params.theta_scale)))))
         score = max(0.0, min(100.0, score))
         return {"score": score, "theta": theta_est}
+
+    def shadow_scores(self, session: IqSession, params: ScoringParams) -> Dict[int, Dict[str, float]]:
+        """Scores de los modos alternativos (vacío si el shadow scoring está apagado)."""
+        if not self._shadow:
+            return {}
+        return {
+            mode: self.finalize_scores(session, params, mode)
+            for mode in SCORING_MODES
+            if mode != session.scoring_mode
+        }
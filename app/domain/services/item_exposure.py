@@ -0,0 +1,70 @@
+import random
+import threading
+from typing import Dict, Iterable
+
+
+class SympsonHetterExposure:
+    """Control de exposición Sympson-Hetter: un ítem seleccionado se administra con probabilidad K_i.
+
+    Los K se recalibran con la tasa de selección observada en la última ventana:
+    K_i = min(1, max_rate / P(seleccionado_i)), así ningún ítem supera `max_rate` de las sesiones.
+    """
+
+    def __init__(self, max_rate: float = 1.0, min_sessions: int = 200) -> None:
+        self.max_rate = max_rate
+        self.min_sessions = min_sessions
+        self._lock = threading.Lock()
+        self._k: Dict[str, float] = {}
+        self._administered: Dict[str, int] = {}
+        self.sessions = 0
+        # Ventana de calibración: se reinicia en cada recalibrate().
+        self._window_selected: Dict[str, int] = {}
+        self._window_sessions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rate < 1.0
+
+    def admit(self, item_id: str, rng: random.Random) -> bool:
+        """Sorteo SH para un ítem que eligió el selector (cuenta como selección aunque se rechace)."""
+        with self._lock:
+            self._window_selected[item_id] = self._window_selected.get(item_id, 0) + 1
+        k = self._k.get(item_id, 1.0)
+        return k >= 1.0 or rng.random() < k
+
+    def record(self, item_ids: Iterable[str], new_sessions: int = 0, copies: int = 1) -> None:
+        """Registra ítems administrados (`copies` sesiones reciben el mismo bloque) y sesiones nuevas."""
+        with self._lock:
+            for item_id in item_ids:
+                self._administered[item_id] = self._administered.get(item_id, 0) + copies
+            self.sessions += new_sessions
+            self._window_sessions += new_sessions
+
+    def recalibrate(self) -> int:
+        """Recalcula los K con la ventana actual; devuelve cuántos ítems quedaron restringidos (K < 1)."""
+        with self._lock:
+            if not self.enabled or self._window_sessions < self.min_sessions:
+                return 0
+            selected, sessions = self._window_selected, self._window_sessions
+            self._window_selected, self._window_sessions = {}, 0
+        k = {}
+        for item_id, count in selected.items():
+            rate = count / sessions
+            if rate > self.max_rate:
+                k[item_id] = self.max_rate / rate
+        # Un ítem restringido que dejó de seleccionarse conserva su K hasta que vuelva a medirse.
+        for item_id, previous in self._k.items():
+            if item_id not in selected:
+                k[item_id] = previous
+        self._k = k
+        return len(k)
+
+    def rates(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            administered = dict(self._administered)
+            sessions = self.sessions
+        k = self._k
+        return {
+            item_id: {"exposure_rate": count / sessions if sessions else 0.0, "k": k.get(item_id, 1.0)}
+            for item_id, count in administered.items()
+        }
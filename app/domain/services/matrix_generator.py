@@ -0,0 +1,126 @@
+import random
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, List, Tuple
+
+from app.domain.entities.iq_item import IqItem
+
+GENERATOR_VERSION = "m1"
+MATRIX_DOMAIN = "matrix-procedural"
+OPTION_KEYS = ("a", "b", "c", "d")
+SHAPES = ("circle", "square", "triangle", "diamond", "cross")
+ATTRIBUTES = ("count", "rotation", "size", "shape")
+# Atributos que varían en la grilla según la dificultad; el resto queda constante.
+RULES_BY_DIFFICULTY: Dict[int, Tuple[str, ...]] = {
+    1: ("count",),
+    2: ("size",),
+    3: ("count", "rotation"),
+    4: ("count", "rotation", "size"),
+    5: ("count", "rotation", "size", "shape"),
+}
+_TOKEN_RE = re.compile(rf"^{GENERATOR_VERSION}-d([1-5])-s(\d{{1,9}})$")
+_LEVELS = 3
+
+
+@dataclass(frozen=True)
+class MatrixCell:
+    shape: str
+    count: int
+    rotation: int
+    size: float
+
+
+@dataclass(frozen=True)
+class MatrixPuzzle:
+    """Matriz 3x3 generada: la celda 9 (abajo a la derecha) es la respuesta y se oculta en la grilla."""
+
+    token: str
+    difficulty: int
+    rules: Tuple[str, ...]
+    grid: Tuple[MatrixCell, ...]
+    options: Tuple[MatrixCell, ...]
+    correct: str
+
+    @property
+    def answer(self) -> MatrixCell:
+        return self.grid[-1]
+
+
+class MatrixItemGenerator:
+    """Genera ítems de matrices a partir de (dificultad, semilla): mismo token, mismo ítem, sin archivos."""
+
+    def token(self, difficulty: int, seed: int) -> str:
+        return f"{GENERATOR_VERSION}-d{difficulty}-s{seed}"
+
+    def puzzle(self, token: str) -> MatrixPuzzle:
+        match = _TOKEN_RE.match(token)
+        if not match:
+            raise ValueError(f"token de matriz inválido: {token}")
+        difficulty, seed = int(match.group(1)), int(match.group(2))
+        rng = random.Random(f"{GENERATOR_VERSION}:{difficulty}:{seed}")
+        rules = RULES_BY_DIFFICULTY[difficulty]
+        levels = self._levels(rng, rules)
+        # Cada atributo variable sigue un cuadrado latino: nivel = (a*col + b*fila + c) mod 3.
+        coefficients = {attr: (rng.choice((1, 2)), rng.randrange(_LEVELS), rng.randrange(_LEVELS)) for attr in rules}
+        fixed = {attr: rng.randrange(_LEVELS) for attr in ATTRIBUTES if attr not in rules}
+        grid = []
+        for row in range(3):
+            for col in range(3):
+                indexes = dict(fixed)
+                for attr, (a, b, c) in coefficients.items():
+                    indexes[attr] = (a * col + b * row + c) % _LEVELS
+                grid.append(MatrixCell(**{attr: levels[attr][indexes[attr]] for attr in ATTRIBUTES}))
+        answer = grid[-1]
+        options = [answer] + self._distractors(rng, answer, rules, levels)
+        rng.shuffle(options)
+        return MatrixPuzzle(
+            token=token,
+            difficulty=difficulty,
+            rules=rules,
+            grid=tuple(grid),
+            options=tuple(options),
+            correct=OPTION_KEYS[options.index(answer)],
+        )
+
+    def item(self, difficulty: int, seed: int) -> IqItem:
+        token = self.token(difficulty, seed)
+        puzzle = self.puzzle(token)
+        return IqItem(
+            item_id=f"PM-{token}",
+            domain=MATRIX_DOMAIN,
+            difficulty=difficulty,
+            prompt="Completa la grilla: elegí la figura que sigue el patrón de filas y columnas.",
+            options=[{"value": f"{token}-{key}", "image": f"/api/matrix/{token}/{key}.svg"} for key in OPTION_KEYS],
+            correct=f"{token}-{puzzle.correct}",
+            visual={"base": {"src": f"/api/matrix/{token}/base.svg", "alt": "Matriz de figuras"}},
+        )
+
+    def items(self, count: int) -> List[IqItem]:
+        """`count` ítems repartidos en las 5 dificultades (semillas 1, 2, ... por dificultad)."""
+        return [self.item(1 + i % 5, 1 + i // 5) for i in range(count)]
+
+    def _levels(self, rng: random.Random, rules: Tuple[str, ...]) -> Dict[str, Tuple]:
+        # Con rotación en juego el círculo no sirve (es simétrico).
+        shapes = [shape for shape in SHAPES if shape != "circle" or "rotation" not in rules]
+        return {
+            "count": (1, 2, 3),
+            "rotation": (0, 30, 60),
+            "size": (0.55, 0.75, 1.0),
+            "shape": tuple(rng.sample(shapes, _LEVELS)),
+        }
+
+    def _distractors(
+        self, rng: random.Random, answer: MatrixCell, rules: Tuple[str, ...], levels: Dict[str, Tuple]
+    ) -> List[MatrixCell]:
+        # Distractores: la respuesta con un atributo cambiado, priorizando los que siguen alguna regla.
+        varying, constant = [], []
+        for attr in ATTRIBUTES:
+            current = getattr(answer, attr)
+            if attr == "rotation" and answer.shape == "circle":
+                continue
+            for value in levels[attr]:
+                if value != current:
+                    (varying if attr in rules else constant).append(replace(answer, **{attr: value}))
+        rng.shuffle(varying)
+        rng.shuffle(constant)
+        return (varying + constant)[: len(OPTION_KEYS) - 1]
@@ -1,20 +1,56 @@
-import random
-from typing import List
+from typing import Dict, Iterable, List, Tuple
 
+from app.domain.entities.iq_item import IqItem
 from app.domain.entities.mixed_session import MixedItem, MixedSession
-from app.iq_items import get_item_pool
+from app.domain.entities.stroop_session import StroopTrial
+from app.domain.services.iq_logic import IqSelectorService
 from app.domain.services.stroop_engine import StroopEngine
+from app.domain.value_objects.item_bank import ItemBank
 
 
 class MixedEngine:
     """Genera secuencia combinada IQ + Stroop para un test híbrido."""
 
-    def __init__(self, stroop_engine: StroopEngine) -> None:
+    def __init__(self, stroop_engine: StroopEngine, selector: IqSelectorService) -> None:
         self.stroop_engine = stroop_engine
+        self._selector = selector
+        # Payloads inmutables compartidos entre sesiones; los de IQ guardan el ítem (el banco se recarga).
+        self._iq_payloads: Dict[str, Tuple[IqItem, Dict]] = {}
+        self._stroop_payloads: Dict[Tuple[str, str, str], Dict] = {}
 
-    def build_session(self, session_id: str, iq_count: int = 10, stroop_count: int = 6) -> MixedSession:
-        pool = get_item_pool()
-        iq_items = random.sample(pool, min(iq_count, len(pool)))
+    def warm(self, pool: Iterable[IqItem]) -> None:
+        """Precalcula los payloads de todos los ítems IQ y trials posibles."""
+        for item in pool:
+            self._iq_payload(item)
+        for trial in self.stroop_engine.all_trials():
+            self._stroop_payload(trial)
+
+    def _iq_payload(self, item: IqItem) -> Dict:
+        cached = self._iq_payloads.get(item.item_id)
+        if cached is not None and cached[0] is item:
+            return cached[1]
+        payload = {
+            "prompt": item.prompt,
+            "options": item.options,
+            "correct": item.correct,
+            "time_limit": 40,
+        }
+        self._iq_payloads[item.item_id] = (item, payload)
+        return payload
+
+    def _stroop_payload(self, trial: StroopTrial) -> Dict:
+        key = (trial.word, trial.ink, trial.expected)
+        payload = self._stroop_payloads.get(key)
+        if payload is None:
+            payload = {"word": trial.word, "ink": trial.ink, "expected": trial.expected}
+            self._stroop_payloads[key] = payload
+        return payload
+
+    def build_session(
+        self, session_id: str, bank: ItemBank, iq_count: int = 10, stroop_count: int = 6
+    ) -> MixedSession:
+        """El banco lo provee el caso de uso: el dominio no depende de los puertos de aplicación."""
+        iq_items = self._selector.sample(bank, iq_count)
         stroop_trials = [self.stroop_engine._pick_trial("ink") for _ in range(stroop_count // 2)]
         stroop_trials += [self.stroop_engine._pick_trial("word") for _ in range(stroop_count - len(stroop_trials))]
 
@@ -26,30 +62,13 @@ class MixedEngine:
             if toggle and idx_iq < len(iq_items):
                 item = iq_items[idx_iq]
                 mixed_items.append(
-                    MixedItem(
-                        item_id=item.item_id,
-                        kind="iq",
-                        payload={
-                            "prompt": item.prompt,
-                            "options": item.options,
-                            "correct": item.correct,
-                            "time_limit": 40,
-                        },
-                    )
+                    MixedItem(item_id=item.item_id, kind="iq", payload=self._iq_payload(item))
                 )
                 idx_iq += 1
             elif idx_st < len(stroop_trials):
                 trial = stroop_trials[idx_st]
                 mixed_items.append(
-                    MixedItem(
-                        item_id=f"ST-{idx_st+1}",
-                        kind="stroop",
-                        payload={
-                            "word": trial.word,
-                            "ink": trial.ink,
-                            "expected": trial.expected,
-                        },
-                    )
+                    MixedItem(item_id=f"ST-{idx_st+1}", kind="stroop", payload=self._stroop_payload(trial))
                 )
                 idx_st += 1
             toggle = not toggle
@@ -0,0 +1,275 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.domain.entities.questionnaire_session import QuestionnaireSession
+from app.domain.exceptions import InvalidAnswerError, QuestionnaireDefinitionError
+from app.domain.value_objects.interval_table import IntervalTable
+
+END = -1
+TOTAL = "total"
+QUESTION_TYPES = ("single", "scale")
+
+ScorePredicate = Callable[[Sequence[float]], bool]
+Deltas = Tuple[Tuple[int, float], ...]  # (slot de dimensión, puntos)
+
+
+@dataclass(frozen=True)
+class Transition:
+    """Efecto precompilado de elegir una opción: puntos a sumar y pregunta siguiente."""
+
+    deltas: Deltas
+    target: int
+    # Reglas que dependen del puntaje acumulado: (predicado, destino o None, puntos); se evalúan en orden.
+    dynamic: Tuple[Tuple[ScorePredicate, Optional[int], Deltas], ...] = ()
+
+
+@dataclass(frozen=True)
+class CompiledQuestion:
+    question_id: int
+    order: int
+    is_required: bool
+    payload: Dict
+    # option_id -> transición; la clave None es "omitir" (sólo en preguntas no obligatorias).
+    transitions: Dict[Optional[int], Transition]
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    code: str
+    min_score: float
+    max_score: float
+    payload: Dict = field(repr=False)
+
+
+@dataclass(frozen=True)
+class CompiledQuestionnaire:
+    """Versión de un cuestionario compilada a tablas de transición: responder es O(1), sin leer JSON."""
+
+    slug: str
+    version: int
+    title: str
+    dimensions: Tuple[str, ...]
+    questions: Tuple[CompiledQuestion, ...]
+    profiles: IntervalTable[CompiledProfile]
+    profile_slot: int
+
+    def new_scores(self) -> List[float]:
+        return [0.0] * len(self.dimensions)
+
+    def answer(self, session: QuestionnaireSession, option_id: Optional[int]) -> Optional[int]:
+        """Aplica la respuesta a la pregunta actual y avanza; devuelve el índice siguiente o None al terminar."""
+        question = self.questions[session.current]
+        transition = question.transitions.get(option_id)
+        if transition is None:
+            raise InvalidAnswerError(f"opción inválida para la pregunta {question.question_id}: {option_id}")
+        scores = session.scores
+        for slot, points in transition.deltas:
+            scores[slot] += points
+        target = transition.target
+        for predicate, goto, deltas in transition.dynamic:
+            if predicate(scores):
+                for slot, points in deltas:
+                    scores[slot] += points
+                if goto is not None:
+                    target = goto
+                    break
+        session.answers.append((question.question_id, option_id))
+        session.current = None if target == END else target
+        return session.current
+
+    def profile(self, scores: Sequence[float]) -> Optional[CompiledProfile]:
+        return self.profiles.resolve(scores[self.profile_slot])
+
+
+def compile_questionnaire(definition: Dict) -> CompiledQuestionnaire:
+    """Compila una versión (fila de test_versions + sus questions/options/profiles) y la valida completa."""
+    questions = sorted(definition.get("questions") or [], key=lambda q: q["order"])
+    if not questions:
+        raise QuestionnaireDefinitionError("el cuestionario no tiene preguntas")
+    index_by_id: Dict[int, int] = {}
+    for index, question in enumerate(questions):
+        if question["id"] in index_by_id:
+            raise QuestionnaireDefinitionError(f"pregunta duplicada: {question['id']}")
+        if question.get("type", "single") not in QUESTION_TYPES:
+            raise QuestionnaireDefinitionError(f"tipo de pregunta no soportado: {question.get('type')}")
+        index_by_id[question["id"]] = index
+    if len({q["order"] for q in questions}) != len(questions):
+        raise QuestionnaireDefinitionError("orden de preguntas duplicado")
+
+    config = definition.get("config_json") or {}
+    profile_dimension = config.get("profile_dimension", TOTAL)
+    dimensions = _collect_dimensions(questions, profile_dimension)
+    slots = {dimension: slot for slot, dimension in enumerate(dimensions)}
+
+    compiled = tuple(
+        _compile_question(index, question, questions, index_by_id, slots) for index, question in enumerate(questions)
+    )
+    return CompiledQuestionnaire(
+        slug=definition["slug"],
+        version=int(definition["version"]),
+        title=definition.get("title", definition["slug"]),
+        dimensions=dimensions,
+        questions=compiled,
+        profiles=_compile_profiles(definition.get("profiles") or []),
+        profile_slot=slots[profile_dimension],
+    )
+
+
+def _collect_dimensions(questions: List[Dict], profile_dimension: str) -> Tuple[str, ...]:
+    names = {profile_dimension}
+    for question in questions:
+        for option in question.get("options") or []:
+            names.update((option.get("score_json") or {}).keys())
+        for rule in (question.get("rules_json") or {}).get("next", []):
+            names.update((rule.get("add") or {}).keys())
+            score = (rule.get("when") or {}).get("score")
+            if score:
+                names.add(score.get("dimension", TOTAL))
+    names.discard(TOTAL)
+    return (TOTAL,) + tuple(sorted(names))
+
+
+def _compile_question(
+    index: int,
+    question: Dict,
+    questions: List[Dict],
+    index_by_id: Dict[int, int],
+    slots: Dict[str, int],
+) -> CompiledQuestion:
+    question_id = question["id"]
+    rules_spec = question.get("rules_json") or {}
+    rules = [_compile_rule(rule, question, index, index_by_id, slots) for rule in rules_spec.get("next", [])]
+    if "default" in rules_spec:
+        default_target = _target(rules_spec["default"], question, index, index_by_id)
+    else:
+        default_target = index + 1 if index + 1 < len(questions) else END
+    transitions: Dict[Optional[int], Transition] = {}
+    options_payload = []
+    for option in question.get("options") or []:
+        option_id = option["id"]
+        if option_id in transitions:
+            raise QuestionnaireDefinitionError(f"opción duplicada en la pregunta {question_id}: {option_id}")
+        explicit = option.get("next_question_id")
+        target = _target(explicit, question, index, index_by_id) if explicit is not None else None
+        transitions[option_id] = _transition(
+            _score_deltas(option.get("score_json") or {}, slots), rules, option_id, target, default_target
+        )
+        options_payload.append({"option_id": option_id, "text": option["text"], "value": option.get("value")})
+    if not transitions:
+        raise QuestionnaireDefinitionError(f"la pregunta {question_id} no tiene opciones")
+    is_required = bool(question.get("is_required", True))
+    if not is_required:
+        transitions[None] = _transition((), rules, None, None, default_target)
+    payload = {
+        "question_id": question_id,
+        "order": question["order"],
+        "type": question.get("type", "single"),
+        "text": question["text"],
+        "is_required": is_required,
+        "options": options_payload,
+        "position": index + 1,
+        "total": len(questions),
+    }
+    return CompiledQuestion(question_id, question["order"], is_required, payload, transitions)
+
+
+def _compile_rule(rule: Dict, question: Dict, index: int, index_by_id: Dict[int, int], slots: Dict[str, int]):
+    """Regla `{"when": {option | option_in | score}, "goto": id|"end", "add": {dim: puntos}}`."""
+    when = rule.get("when") or {}
+    unknown = set(when) - {"option", "option_in", "score"}
+    if unknown or ("goto" not in rule and "add" not in rule):
+        raise QuestionnaireDefinitionError(f"regla inválida en la pregunta {question['id']}: {rule}")
+    options = None
+    if "option" in when:
+        options = frozenset([when["option"]])
+    elif "option_in" in when:
+        options = frozenset(when["option_in"])
+    predicate = _score_predicate(when["score"], slots) if "score" in when else None
+    goto = _target(rule["goto"], question, index, index_by_id) if "goto" in rule else None
+    return options, predicate, goto, _score_deltas(rule.get("add") or {}, slots)
+
+
+def _transition(
+    option_deltas: Deltas, rules, option_id: Optional[int], explicit_target: Optional[int], default_target: int
+) -> Transition:
+    # Las reglas que sólo miran la opción se resuelven acá; desde la primera que mira el puntaje, quedan en runtime.
+    deltas = list(option_deltas)
+    target: Optional[int] = None
+    dynamic = []
+    for options, predicate, goto, add in rules:
+        if options is not None and option_id not in options:
+            continue
+        if explicit_target is not None:
+            goto = None  # next_question_id de la opción manda sobre los saltos por regla
+        if predicate is None and not dynamic:
+            deltas.extend(add)
+            if goto is not None:
+                target = goto
+                break
+        else:
+            dynamic.append((predicate or _always, goto, add))
+            if predicate is None and goto is not None:
+                break
+    if target is None:
+        target = explicit_target if explicit_target is not None else default_target
+    return Transition(deltas=_merge(deltas), target=target, dynamic=tuple(dynamic))
+
+
+def _target(value, question: Dict, index: int, index_by_id: Dict[int, int]) -> int:
+    if value == "end":
+        return END
+    target = index_by_id.get(value)
+    if target is None:
+        raise QuestionnaireDefinitionError(f"la pregunta {question['id']} salta a una pregunta inexistente: {value}")
+    if target <= index:
+        # Sólo saltos hacia adelante: todo recorrido termina.
+        raise QuestionnaireDefinitionError(f"la pregunta {question['id']} salta hacia atrás: {value}")
+    return target
+
+
+def _score_deltas(score: Dict[str, float], slots: Dict[str, int]) -> Deltas:
+    # Cada punto suma a su dimensión y al total; "total" explícito suma sólo al total.
+    deltas = []
+    for dimension, points in score.items():
+        deltas.append((slots[TOTAL], float(points)))
+        if dimension != TOTAL:
+            deltas.append((slots[dimension], float(points)))
+    return _merge(deltas)
+
+
+def _merge(deltas) -> Deltas:
+    merged: Dict[int, float] = {}
+    for slot, points in deltas:
+        merged[slot] = merged.get(slot, 0.0) + points
+    return tuple((slot, points) for slot, points in sorted(merged.items()) if points)
+
+
+def _score_predicate(spec: Dict, slots: Dict[str, int]) -> ScorePredicate:
+    slot = slots[spec.get("dimension", TOTAL)]
+    low = float(spec.get("gte", float("-inf")))
+    high = float(spec.get("lte", float("inf")))
+    return lambda scores: low <= scores[slot] <= high
+
+
+def _always(scores: Sequence[float]) -> bool:
+    return True
+
+
+def _compile_profiles(profiles: List[Dict]) -> IntervalTable[CompiledProfile]:
+    if not profiles:
+        raise QuestionnaireDefinitionError("el cuestionario no tiene perfiles")
+    ranges = []
+    for profile in profiles:
+        payload = {
+            "profile_code": profile["code"],
+            "title": profile["title"],
+            "summary": profile.get("summary"),
+            "recommendations": profile.get("recommendations_json") or [],
+        }
+        compiled = CompiledProfile(profile["code"], profile["min_score"], profile["max_score"], payload)
+        ranges.append((compiled.min_score, compiled.max_score, compiled))
+    try:
+        # min_score/max_score son enteros inclusivos (schema): rangos contiguos de paso 1.
+        return IntervalTable.build(ranges, step=1)
+    except ValueError as exc:
+        raise QuestionnaireDefinitionError(f"perfiles inválidos: {exc}") from exc
@@ -1,34 +1,57 @@
 import random
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from app.domain.entities.stroop_session import StroopAnswer, StroopSession, StroopTrial
+from app.domain.entities.stroop_session import (
+    NEUTRAL_WORD,
+    RT_MS_MAX,
+    STROOP_COLORS,
+    STROOP_TRIAL_TYPES,
+    StroopAnswer,
+    StroopSession,
+    StroopTrial,
+    stroop_trial_type,
+)
+from app.domain.value_objects.test_config import DEFAULT_STROOP_CONFIG, STROOP_RULES, StroopConfig
 
 
 class StroopEngine:
     """Genera trials y gestiona cambios de regla para el test Stroop-WCST híbrido."""
 
-    COLORS = ["rojo", "verde", "azul", "amarillo"]
+    COLORS = list(STROOP_COLORS)
     OPPOSITE = {"rojo": "verde", "verde": "rojo", "azul": "amarillo", "amarillo": "azul"}
+    TRIAL_TYPES = list(STROOP_TRIAL_TYPES)
+    TRIAL_WEIGHTS = [0.4, 0.4, 0.2]
 
-    def __init__(self) -> None:
-        self.rule_cycle = ["ink", "word", "opposite"]
-        self.change_threshold = 6  # aciertos antes de cambiar regla
-        self.max_trials = 24
+    def __init__(self, config: StroopConfig = DEFAULT_STROOP_CONFIG) -> None:
+        # Config por defecto; las sesiones usan la de su versión (ver `config` en cada método).
+        self.config = config
+        self._trial_table = self._build_trial_table()
 
-    def _pick_trial(self, rule: str) -> StroopTrial:
-        trial_type = random.choices(["incongruente", "congruente", "neutro"], weights=[0.4, 0.4, 0.2])[0]
-        word = random.choice(self.COLORS)
-        ink = random.choice(self.COLORS)
-        if trial_type == "congruente":
-            ink = word
-        elif trial_type == "incongruente":
-            while ink == word:
-                ink = random.choice(self.COLORS)
-        else:  # neutro
-            word = "XXXX"
+    def _build_trial_table(self) -> Dict[str, Dict[str, List[StroopTrial]]]:
+        """Tabla de todos los trials posibles por regla y tipo (se comparten entre sesiones)."""
+        table: Dict[str, Dict[str, List[StroopTrial]]] = {}
+        for rule in STROOP_RULES:
+            by_type: Dict[str, List[StroopTrial]] = {t: [] for t in self.TRIAL_TYPES}
+            for word in self.COLORS:
+                for ink in self.COLORS:
+                    trial_type = stroop_trial_type(word, ink)
+                    by_type[trial_type].append(self._make_trial(rule, word, ink, trial_type))
+            for ink in self.COLORS:
+                by_type["neutro"].append(self._make_trial(rule, NEUTRAL_WORD, ink, "neutro"))
+            table[rule] = by_type
+        return table
+
+    def _make_trial(self, rule: str, word: str, ink: str, trial_type: str) -> StroopTrial:
         expected = self._expected_color(rule, word, ink)
         return StroopTrial(word=word, ink=ink, trial_type=trial_type, rule_id=rule, expected=expected)
 
+    def all_trials(self) -> List[StroopTrial]:
+        return [trial for by_type in self._trial_table.values() for trials in by_type.values() for trial in trials]
+
+    def _pick_trial(self, rule: str) -> StroopTrial:
+        trial_type = random.choices(self.TRIAL_TYPES, weights=self.TRIAL_WEIGHTS)[0]
+        return random.choice(self._trial_table[rule][trial_type])
+
     def _expected_color(self, rule: str, word: str, ink: str) -> str:
         if rule == "ink":
             return ink
@@ -39,29 +62,35 @@ class StroopEngine:
             return self.OPPOSITE.get(base, base)
         return ink
 
-    def start_session(self, session_id: str) -> Tuple[StroopSession, StroopTrial]:
-        rule = "ink"
-        session = StroopSession(session_id=session_id, current_rule=rule)
+    def start_session(
+        self, session_id: str, config: Optional[StroopConfig] = None, version: int = 1
+    ) -> Tuple[StroopSession, StroopTrial]:
+        rule = (config or self.config).rule_cycle[0]
+        session = StroopSession(session_id=session_id, current_rule=rule, version=version)
         trial = self._pick_trial(rule)
         return session, trial
 
-    def next_trial(self, session: StroopSession) -> StroopTrial:
-        if session.finished or session.total_trials >= self.max_trials:
+    def next_trial(self, session: StroopSession, config: Optional[StroopConfig] = None) -> StroopTrial:
+        config = config or self.config
+        if session.finished or session.total_trials >= config.max_trials:
             session.finished = True
             return None
-        self._maybe_change_rule(session)
+        self._maybe_change_rule(session, config)
         return self._pick_trial(session.current_rule)
 
-    def _maybe_change_rule(self, session: StroopSession) -> None:
-        if session.correct_in_rule >= self.change_threshold:
-            idx = self.rule_cycle.index(session.current_rule)
-            next_idx = (idx + 1) % len(self.rule_cycle)
-            session.current_rule = self.rule_cycle[next_idx]
+    def _maybe_change_rule(self, session: StroopSession, config: StroopConfig) -> None:
+        if session.correct_in_rule >= config.change_threshold:
+            rule_cycle = config.rule_cycle
+            idx = rule_cycle.index(session.current_rule)
+            next_idx = (idx + 1) % len(rule_cycle)
+            session.current_rule = rule_cycle[next_idx]
             session.correct_in_rule = 0
             session.block_id += 1
 
     def register_answer(self, session: StroopSession, trial: StroopTrial, selected: str, rt_ms: int) -> StroopAnswer:
         correct = selected == trial.expected
+        # La columna de rt es int32; un rt <= 0 puntúa igual que 0 (no entra al promedio).
+        rt_ms = max(0, min(rt_ms, RT_MS_MAX))
         rule_changed_before = session.correct_in_rule == 0 and session.total_trials > 0
         answer = StroopAnswer(trial=trial, selected=selected, correct=correct, rt_ms=rt_ms, rule_changed_before=rule_changed_before)
         session.answers.append(answer)
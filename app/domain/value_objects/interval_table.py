@@ -0,0 +1,49 @@
+import math
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Generic, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+_EPSILON = 1e-9
+
+
+@dataclass(frozen=True)
+class IntervalTable(Generic[T]):
+    """Rangos de puntaje contiguos -> perfil/banda, resueltos con búsqueda binaria sobre los mínimos.
+
+    Cada rango cubre [min, min del siguiente); el último, [min, max]. `step` es la resolución de los
+    rangos: 1 para rangos enteros inclusivos (90-109, 110-119), 0 para cortes continuos (< 0.6).
+    """
+
+    lows: Tuple[float, ...]
+    high: float
+    values: Tuple[T, ...]
+
+    @classmethod
+    def build(cls, ranges: Iterable[Tuple[float, float, T]], step: float = 1) -> "IntervalTable[T]":
+        """Ordena y valida (sin huecos ni superposiciones) una sola vez, al cargar la versión."""
+        ordered = sorted(ranges, key=lambda r: r[0])
+        if not ordered:
+            raise ValueError("la tabla de rangos está vacía")
+        for low, high, value in ordered:
+            if low > high:
+                raise ValueError(f"rango inválido para {value!r}: {low} > {high}")
+        for (_, prev_high, prev), (low, _, value) in zip(ordered, ordered[1:]):
+            expected = prev_high + step
+            if math.isinf(expected) or low < expected - _EPSILON:
+                raise ValueError(f"el rango de {value!r} se superpone con {prev!r}")
+            if low > expected + _EPSILON:
+                raise ValueError(f"hueco entre {prev!r} y {value!r}: falta ({prev_high}, {low})")
+        return cls(
+            lows=tuple(low for low, _, _ in ordered),
+            high=ordered[-1][1],
+            values=tuple(value for _, _, value in ordered),
+        )
+
+    def resolve(self, score: float) -> Optional[T]:
+        """Valor del rango que contiene `score`, o None si queda fuera de la tabla."""
+        index = bisect_right(self.lows, score) - 1
+        if index < 0 or score > self.high:
+            return None
+        return self.values[index]
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Dict
+from typing import Mapping
 
 
 @dataclass(frozen=True)
@@ -8,5 +8,19 @@ class IqConfig:
 
     n_items: int
     score_max: float
-    difficulty_weights: Dict[int, float]
-    time_limits: Dict[int, int]
+    difficulty_weights: Mapping[int, float]
+    time_limits: Mapping[int, int]
+
+
+@dataclass(frozen=True)
+class ScoringParams:
+    """Parámetros del scoring multi-modo (pesos, IRT-lite y factor de tiempo)."""
+
+    eta: float
+    t_guess: float
+    time_k: float
+    time_min: float
+    time_max: float
+    theta_scale: float
+    weights_by_difficulty: Mapping[int, float]
+    t_ref_by_difficulty: Mapping[int, float]
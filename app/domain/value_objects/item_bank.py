@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.domain.entities.iq_item import IqItem
+
+DIFFICULTIES = (1, 2, 3, 4, 5)
+
+
+@dataclass(frozen=True)
+class ItemBank:
+    """Banco de ítems IQ versionado e inmutable, con índices precompilados (por id, dificultad y dominio)."""
+
+    version: str
+    items: Tuple[IqItem, ...]
+    by_id: Dict[str, IqItem] = field(default_factory=dict)
+    by_difficulty: Dict[int, Tuple[IqItem, ...]] = field(default_factory=dict)
+    by_domain: Dict[str, Tuple[IqItem, ...]] = field(default_factory=dict)
+    # dificultad -> un bucket por dominio; la selección sortea dentro de los buckets sin recorrer el banco.
+    domain_buckets: Dict[int, Tuple[Tuple[IqItem, ...], ...]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, version: str, items: Iterable[IqItem]) -> "ItemBank":
+        """Valida y compila el banco en una pasada; cualquier inconsistencia aborta (nunca se publica roto)."""
+        items = tuple(items)
+        if not items:
+            raise ValueError("el banco de ítems está vacío")
+        by_id: Dict[str, IqItem] = {}
+        buckets: Dict[int, Dict[str, List[IqItem]]] = {d: {} for d in DIFFICULTIES}
+        for item in items:
+            if item.item_id in by_id:
+                raise ValueError(f"ítem duplicado: {item.item_id}")
+            if item.difficulty not in DIFFICULTIES:
+                raise ValueError(f"dificultad inválida en {item.item_id}: {item.difficulty}")
+            if item.correct not in [_option_value(option) for option in item.options]:
+                raise ValueError(f"la respuesta correcta de {item.item_id} no está entre las opciones")
+            by_id[item.item_id] = item
+            buckets[item.difficulty].setdefault(item.domain, []).append(item)
+        by_domain: Dict[str, List[IqItem]] = {}
+        for per_domain in buckets.values():
+            for domain, bucket in per_domain.items():
+                by_domain.setdefault(domain, []).extend(bucket)
+        return cls(
+            version=version,
+            items=items,
+            by_id=by_id,
+            by_difficulty={d: tuple(i for bucket in buckets[d].values() for i in bucket) for d in DIFFICULTIES},
+            by_domain={domain: tuple(bucket) for domain, bucket in sorted(by_domain.items())},
+            domain_buckets={
+                d: tuple(tuple(buckets[d][domain]) for domain in sorted(buckets[d])) for d in DIFFICULTIES
+            },
+        )
+
+    def get(self, item_id: str) -> Optional[IqItem]:
+        return self.by_id.get(item_id)
+
+
+def _option_value(option) -> str:
+    # Ítems visuales: opciones {"value", "image"}; el resto, strings.
+    return option.get("value") if isinstance(option, dict) else option
@@ -0,0 +1,38 @@
+import math
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class NormTable:
+    """Tabla de normas: CDF empírica (thetas ordenados) consultada con búsqueda binaria."""
+
+    thetas: Tuple[float, ...]
+    built_at: float
+
+    @classmethod
+    def build(cls, samples: Iterable[float], built_at: float) -> "NormTable":
+        return cls(tuple(sorted(samples)), built_at)
+
+    @property
+    def size(self) -> int:
+        return len(self.thetas)
+
+    def percentile(self, theta: float) -> float:
+        # Rango medio: los empates cuentan la mitad, así el mediano da 50 y no 0 o 100.
+        below = bisect_left(self.thetas, theta)
+        at_or_below = bisect_right(self.thetas, theta)
+        return 100.0 * (below + at_or_below) / (2 * len(self.thetas))
+
+
+def normal_percentile(theta: float) -> float:
+    """Percentil bajo la normal estándar (la misma que asume IQ = 100 + 15·theta)."""
+    return 50.0 * (1 + math.erf(theta / math.sqrt(2)))
+
+
+def percentile_rank(table: Optional[NormTable], theta: float, min_size: int) -> Tuple[float, str]:
+    """Percentil empírico si la tabla tiene muestra suficiente; si no, el de la normal teórica."""
+    if table is not None and table.size >= min_size:
+        return table.percentile(theta), "empirical"
+    return normal_percentile(theta), "normal"
@@ -0,0 +1,15 @@
+"""Identificadores de los tests publicados (slug + versión)."""
+
+IQ_TEST_SLUG = "iq-general"
+STROOP_TEST_SLUG = "stroop-wcst"
+MIXED_TEST_SLUG = "iq-stroop-mixed"
+
+DEFAULT_TEST_VERSION = 1
+
+TEST_SLUGS = (IQ_TEST_SLUG, STROOP_TEST_SLUG, MIXED_TEST_SLUG)
+
+TEST_TITLES = {
+    IQ_TEST_SLUG: "Test de IQ General",
+    STROOP_TEST_SLUG: "Test de Colores (Stroop/WCST)",
+    MIXED_TEST_SLUG: "Test Combinado IQ + Colores",
+}
@@ -0,0 +1,147 @@
+from dataclasses import dataclass, fields, replace
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from app.domain.value_objects.iq_config import IqConfig, ScoringParams
+
+DIFFICULTIES = (1, 2, 3, 4, 5)
+STROOP_RULES = ("ink", "word", "opposite")
+CONFIG_SECTIONS = ("iq", "scoring", "stroop")
+
+
+@dataclass(frozen=True)
+class StroopConfig:
+    """Parámetros del test Stroop-WCST híbrido."""
+
+    rule_cycle: Tuple[str, ...]
+    change_threshold: int  # aciertos antes de cambiar regla
+    max_trials: int
+
+
+DEFAULT_IQ_CONFIG = IqConfig(
+    n_items=20,
+    score_max=45.0,
+    difficulty_weights=MappingProxyType({1: 1.0, 2: 1.5, 3: 2.0, 4: 2.5, 5: 3.0}),
+    time_limits=MappingProxyType({1: 25, 2: 25, 3: 35, 4: 45, 5: 55}),
+)
+
+DEFAULT_SCORING_PARAMS = ScoringParams(
+    eta=0.35,
+    t_guess=2.5,
+    time_k=0.12,
+    time_min=0.80,
+    time_max=1.08,
+    theta_scale=1.2,
+    weights_by_difficulty=MappingProxyType({1: 1.0, 2: 1.3, 3: 1.6, 4: 2.0, 5: 2.0}),
+    t_ref_by_difficulty=MappingProxyType({1: 8.0, 2: 10.0, 3: 12.0, 4: 14.0, 5: 14.0}),
+)
+
+DEFAULT_STROOP_CONFIG = StroopConfig(rule_cycle=STROOP_RULES, change_threshold=6, max_trials=24)
+
+
+@dataclass(frozen=True)
+class TestVersionConfig:
+    """Configuración compilada de una versión de test: `test_versions.config_json` sobre los defaults."""
+
+    test_slug: str
+    version: int
+    iq: IqConfig
+    scoring: ScoringParams
+    stroop: StroopConfig
+    # Payload de `iq` para la API, armado una vez por versión (sólo lectura: se devuelve tal cual).
+    iq_payload: Dict[str, Any]
+
+    @classmethod
+    def build(cls, test_slug: str, version: int, config_json: Optional[Dict]) -> "TestVersionConfig":
+        """Valida y congela la config en una pasada; cualquier inconsistencia aborta la carga de la versión."""
+        spec = config_json or {}
+        unknown = set(spec) - set(CONFIG_SECTIONS) - {"profile_dimension"}
+        if unknown:
+            raise ValueError(f"secciones de config desconocidas: {', '.join(sorted(unknown))}")
+        iq = _override(DEFAULT_IQ_CONFIG, spec.get("iq"), "iq")
+        scoring = _override(DEFAULT_SCORING_PARAMS, spec.get("scoring"), "scoring")
+        stroop = _override(DEFAULT_STROOP_CONFIG, spec.get("stroop"), "stroop")
+        _validate_iq(iq)
+        _validate_scoring(scoring)
+        _validate_stroop(stroop)
+        return cls(
+            test_slug=test_slug,
+            version=int(version),
+            iq=iq,
+            scoring=scoring,
+            stroop=stroop,
+            iq_payload={
+                "n_items": iq.n_items,
+                "score_max": iq.score_max,
+                "difficulty_weights": dict(iq.difficulty_weights),
+                "time_limits": dict(iq.time_limits),
+            },
+        )
+
+
+def _override(base, spec: Optional[Dict], section: str):
+    if not spec:
+        return base
+    names = {f.name for f in fields(base)}
+    unknown = set(spec) - names
+    if unknown:
+        raise ValueError(f"claves desconocidas en {section}: {', '.join(sorted(unknown))}")
+    values = {}
+    for name, raw in spec.items():
+        current = getattr(base, name)
+        label = f"{section}.{name}"
+        if isinstance(current, Mapping):
+            if not isinstance(raw, Mapping):
+                raise ValueError(f"{label}: se espera un objeto por dificultad")
+            # JSON sólo tiene claves string: {"1": 25} -> {1: 25}; las dificultades no indicadas heredan el default.
+            value_type = type(next(iter(current.values())))
+            parsed = {int(k): _coerce(value_type, v, label) for k, v in raw.items()}
+            values[name] = MappingProxyType({**current, **parsed})
+        elif isinstance(current, tuple):
+            if not isinstance(raw, list) or not all(isinstance(v, str) for v in raw):
+                raise ValueError(f"{label}: se espera una lista de strings")
+            values[name] = tuple(raw)
+        else:
+            values[name] = _coerce(type(current), raw, label)
+    return replace(base, **values)
+
+
+def _coerce(value_type: type, raw: Any, label: str):
+    # bool es subclase de int: se rechaza explícitamente; un float no se trunca a int en silencio.
+    if isinstance(raw, bool) or not isinstance(raw, (int, float)) or (value_type is int and not isinstance(raw, int)):
+        raise ValueError(f"{label}: se espera un número {'entero' if value_type is int else ''}".rstrip())
+    return value_type(raw)
+
+
+def _validate_iq(iq: IqConfig) -> None:
+    if iq.n_items < 1 or iq.score_max <= 0:
+        raise ValueError("iq: n_items y score_max deben ser positivos")
+    _require_difficulties("iq.difficulty_weights", iq.difficulty_weights)
+    _require_difficulties("iq.time_limits", iq.time_limits)
+    if min(iq.time_limits.values()) <= 0:
+        raise ValueError("iq.time_limits: los tiempos deben ser positivos")
+
+
+def _validate_scoring(scoring: ScoringParams) -> None:
+    if scoring.eta <= 0 or scoring.theta_scale <= 0 or scoring.t_guess < 0:
+        raise ValueError("scoring: eta y theta_scale deben ser positivos")
+    if not 0 < scoring.time_min <= scoring.time_max:
+        raise ValueError("scoring: se requiere 0 < time_min <= time_max")
+    _require_difficulties("scoring.weights_by_difficulty", scoring.weights_by_difficulty)
+    _require_difficulties("scoring.t_ref_by_difficulty", scoring.t_ref_by_difficulty)
+    if min(scoring.t_ref_by_difficulty.values()) <= 0:
+        raise ValueError("scoring.t_ref_by_difficulty: los tiempos deben ser positivos")
+
+
+def _validate_stroop(stroop: StroopConfig) -> None:
+    if not stroop.rule_cycle or len(set(stroop.rule_cycle)) != len(stroop.rule_cycle):
+        raise ValueError("stroop.rule_cycle: debe tener reglas sin repetir")
+    if set(stroop.rule_cycle) - set(STROOP_RULES):
+        raise ValueError(f"stroop.rule_cycle: reglas válidas {', '.join(STROOP_RULES)}")
+    if stroop.change_threshold < 1 or stroop.max_trials < 1:
+        raise ValueError("stroop: change_threshold y max_trials deben ser positivos")
+
+
+def _require_difficulties(name: str, values: Mapping[int, Any]) -> None:
+    if set(values) != set(DIFFICULTIES):
+        raise ValueError(f"{name}: se requieren las dificultades {DIFFICULTIES}")
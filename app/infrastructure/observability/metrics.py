@@ -0,0 +1,175 @@
+import itertools
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+Labels = Tuple[Tuple[str, str], ...]
+GaugeCollector = Callable[[], Iterable[Tuple[Labels, float]]]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class _Stripe:
+    """Segmento de la registry con su propio lock (evita contención entre hilos)."""
+
+    __slots__ = ("lock", "counters", "histograms")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}
+
+
+class MetricsRegistry:
+    """Registry de métricas en memoria con lock-striping y salida en formato Prometheus."""
+
+    def __init__(self, stripes: int = 8, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self._stripes = [_Stripe() for _ in range(max(1, stripes))]
+        self._buckets = tuple(buckets)
+        self._local = threading.local()
+        self._round_robin = itertools.count()
+        self._meta: Dict[str, Tuple[str, str]] = {}
+        self._gauges: Dict[str, GaugeCollector] = {}
+
+    # Declaración de métricas (HELP/TYPE)
+    def counter(self, name: str, help_text: str) -> None:
+        self._meta[name] = ("counter", help_text)
+
+    def histogram(self, name: str, help_text: str) -> None:
+        self._meta[name] = ("histogram", help_text)
+
+    def gauge(self, name: str, help_text: str, collector: GaugeCollector) -> None:
+        """Gauge evaluado al momento del scrape (no cuesta nada en el hot path)."""
+        self._meta[name] = ("gauge", help_text)
+        self._gauges[name] = collector
+
+    # Hot path
+    def _stripe(self) -> _Stripe:
+        stripe = getattr(self._local, "stripe", None)
+        if stripe is None:
+            # Cada hilo queda asignado a un stripe fijo en round-robin.
+            stripe = self._stripes[next(self._round_robin) % len(self._stripes)]
+            self._local.stripe = stripe
+        return stripe
+
+    def inc(self, name: str, labels: Labels = (), amount: float = 1.0) -> None:
+        stripe = self._stripe()
+        key = (name, labels)
+        with stripe.lock:
+            stripe.counters[key] = stripe.counters.get(key, 0.0) + amount
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        stripe = self._stripe()
+        key = (name, labels)
+        idx = bisect_left(self._buckets, value)
+        with stripe.lock:
+            hist = stripe.histograms.get(key)
+            if hist is None:
+                # [bucket_0..bucket_n, +Inf, sum]
+                hist = [0.0] * (len(self._buckets) + 2)
+                stripe.histograms[key] = hist
+            hist[idx] += 1
+            hist[-1] += value
+
+    # Exposición
+    def snapshot(self) -> Tuple[Dict[Tuple[str, Labels], float], Dict[Tuple[str, Labels], List[float]]]:
+        counters: Dict[Tuple[str, Labels], float] = {}
+        histograms: Dict[Tuple[str, Labels], List[float]] = {}
+        for stripe in self._stripes:
+            with stripe.lock:
+                local_counters = list(stripe.counters.items())
+                local_histograms = [(key, list(values)) for key, values in stripe.histograms.items()]
+            for key, value in local_counters:
+                counters[key] = counters.get(key, 0.0) + value
+            for key, values in local_histograms:
+                merged = histograms.get(key)
+                if merged is None:
+                    histograms[key] = values
+                else:
+                    for i, value in enumerate(values):
+                        merged[i] += value
+        return counters, histograms
+
+    def render(self) -> str:
+        counters, histograms = self.snapshot()
+        by_name: Dict[str, List[str]] = {}
+
+        for (name, labels), value in sorted(counters.items()):
+            by_name.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for (name, labels), values in sorted(histograms.items()):
+            lines = by_name.setdefault(name, [])
+            cumulative = 0.0
+            for bound, count in zip(self._buckets, values):
+                cumulative += count
+                lines.append(f"{name}_bucket{_format_labels(labels + (('le', _format_value(bound)),))} {_format_value(cumulative)}")
+            cumulative += values[len(self._buckets)]
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {_format_value(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(values[-1])}")
+            lines.append(f"{name}_count{_format_labels(labels)} {_format_value(cumulative)}")
+
+        for name, collector in self._gauges.items():
+            lines = by_name.setdefault(name, [])
+            for labels, value in collector():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        out: List[str] = []
+        for name in sorted(by_name):
+            kind, help_text = self._meta.get(name, ("untyped", ""))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(by_name[name])
+        return "\n".join(out) + "\n"
+
+
+class InstrumentedUseCase:
+    """Proxy que mide llamadas, errores y latencia de `execute` de un caso de uso."""
+
+    def __init__(self, name: str, use_case, metrics: MetricsRegistry) -> None:
+        self._name = name
+        self._use_case = use_case
+        self._metrics = metrics
+        self._labels: Labels = (("use_case", name),)
+
+    def execute(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return self._use_case.execute(*args, **kwargs)
+        except Exception:
+            self._metrics.inc("usecase_errors_total", self._labels)
+            raise
+        finally:
+            self._metrics.inc("usecase_calls_total", self._labels)
+            self._metrics.observe("usecase_duration_seconds", self._labels, time.perf_counter() - started)
+
+    def __getattr__(self, attr: str):
+        return getattr(self._use_case, attr)
+
+
+def register_default_metrics(metrics: MetricsRegistry) -> None:
+    """Declara las métricas HTTP y de casos de uso que registra la app."""
+    metrics.counter("http_requests_total", "Requests HTTP por ruta, método y status.")
+    metrics.counter("http_request_errors_total", "Requests HTTP con status >= 500.")
+    metrics.histogram("http_request_duration_seconds", "Latencia HTTP por ruta.")
+    metrics.counter("usecase_calls_total", "Invocaciones de casos de uso.")
+    metrics.counter("usecase_errors_total", "Casos de uso que terminaron con excepción.")
+    metrics.histogram("usecase_duration_seconds", "Latencia de casos de uso.")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: Optional[float]) -> str:
+    if value is None:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,179 @@
+import cProfile
+import itertools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger("app.profiler")
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+# Sólo se rotan los archivos que escribe el profiler: PROFILE_DIR puede ser un directorio compartido.
+_PROFILE_EXTS = ("pstats", "collapsed")
+
+
+def session_kind(path: str) -> str:
+    """Tipo de sesión según la ruta (/api/iq/..., /api/stroop/..., /api/mixed/...)."""
+    parts = path.strip("/").split("/")
+    if len(parts) >= 2 and parts[0] == "api":
+        return parts[1]
+    return "web"
+
+
+class _StackSampler:
+    """Sampler de stacks en hilo aparte; sólo muestrea los hilos registrados."""
+
+    def __init__(self, interval_s: float, max_depth: int = 64) -> None:
+        self._interval = interval_s
+        self._max_depth = max_depth
+        self._lock = threading.Lock()
+        self._active: Dict[int, Counter] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+    def track(self, thread_id: int) -> None:
+        self._ensure_thread()
+        with self._lock:
+            self._active[thread_id] = Counter()
+
+    def untrack(self, thread_id: int) -> Counter:
+        with self._lock:
+            return self._active.pop(thread_id, Counter())
+
+    def _ensure_thread(self) -> None:
+        # Arranque perezoso: tras un fork el hilo del master no existe en el worker.
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self._interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, counts in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        counts[self._collapse(frame)] += 1
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self._max_depth:
+            code = frame.f_code
+            names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+class _ProfileHandle:
+    __slots__ = ("route", "kind", "started", "profile", "thread_id")
+
+    def __init__(self, route: str, kind: str, profile: Optional[cProfile.Profile], thread_id: Optional[int]) -> None:
+        self.route = route
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.profile = profile
+        self.thread_id = thread_id
+
+
+class RequestProfiler:
+    """Profiling opt-in por request: 1 de cada N (cProfile), por header o requests lentos (sampler)."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        sample_every: int = 0,
+        slow_ms: int = 0,
+        max_files: int = 200,
+        token: str = "",
+        sample_interval_ms: float = 5.0,
+    ) -> None:
+        self._output_dir = output_dir
+        self._sample_every = sample_every
+        self._slow_ms = slow_ms
+        self._max_files = max_files
+        self._token = token
+        self._counter = itertools.count(1)
+        self._sampler = _StackSampler(sample_interval_ms / 1000.0) if slow_ms > 0 else None
+
+    @classmethod
+    def from_env(cls) -> "RequestProfiler":
+        return cls(
+            output_dir=Path(os.getenv("PROFILE_DIR", "profiles")),
+            sample_every=int(os.getenv("PROFILE_SAMPLE_EVERY", "0")),
+            slow_ms=int(os.getenv("PROFILE_SLOW_MS", "0")),
+            max_files=int(os.getenv("PROFILE_MAX_FILES", "200")),
+            token=os.getenv("PROFILE_TOKEN", ""),
+            sample_interval_ms=float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._sample_every or self._slow_ms or self._token)
+
+    def begin(self, route: str, path: str, header_token: Optional[str] = None) -> Optional[_ProfileHandle]:
+        forced = bool(self._token) and header_token == self._token
+        sampled = self._sample_every > 0 and next(self._counter) % self._sample_every == 0
+        if forced or sampled:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Ya hay otro profiler activo en este hilo.
+                return None
+            return _ProfileHandle(route, session_kind(path), profile, None)
+        if self._sampler is not None:
+            thread_id = threading.get_ident()
+            self._sampler.track(thread_id)
+            return _ProfileHandle(route, session_kind(path), None, thread_id)
+        return None
+
+    def end(self, handle: Optional[_ProfileHandle]) -> None:
+        if handle is None:
+            return
+        elapsed_ms = (time.perf_counter() - handle.started) * 1000
+        try:
+            if handle.profile is not None:
+                handle.profile.disable()
+                handle.profile.dump_stats(str(self._target(handle, elapsed_ms, "pstats")))
+            elif handle.thread_id is not None and self._sampler is not None:
+                counts = self._sampler.untrack(handle.thread_id)
+                if elapsed_ms < self._slow_ms or not counts:
+                    return
+                lines = [f"{stack} {count}" for stack, count in counts.most_common()]
+                self._target(handle, elapsed_ms, "collapsed").write_text("\n".join(lines) + "\n", encoding="utf-8")
+            else:
+                return
+            self._rotate()
+        except Exception as exc:  # el profiling nunca debe romper el request
+            logger.info("profile_write_error: %s", exc)
+
+    def _target(self, handle: _ProfileHandle, elapsed_ms: float, ext: str) -> Path:
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        route_slug = _SLUG_RE.sub("_", handle.route).strip("_") or "root"
+        name = f"{int(time.time() * 1000)}-{os.getpid()}-{handle.kind}-{route_slug}-{int(elapsed_ms)}ms.{ext}"
+        return self._output_dir / name
+
+    def _rotate(self) -> None:
+        files = []
+        for ext in _PROFILE_EXTS:
+            for path in self._output_dir.glob(f"*.{ext}"):
+                try:
+                    files.append((path.stat().st_mtime, path))
+                except FileNotFoundError:  # rotado por otro worker
+                    continue
+        files.sort()
+        for _, old in files[: max(0, len(files) - self._max_files)]:
+            old.unlink(missing_ok=True)
@@ -0,0 +1,167 @@
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from contextvars import ContextVar, Token
+from functools import wraps
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger("app.tracing")
+
+_SLUG_RE = re.compile(r"[^A-Za-z0-9]+")
+
+
+class Span:
+    """Tramo de ejecución dentro de una traza (HTTP, caso de uso, dominio, repositorio)."""
+
+    __slots__ = ("name", "layer", "trace", "parent", "start_ns", "end_ns", "thread_id")
+
+    def __init__(self, name: str, layer: str, trace: "Trace", parent: Optional["Span"]) -> None:
+        self.name = name
+        self.layer = layer
+        self.trace = trace
+        self.parent = parent
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = 0
+
+
+class Trace:
+    """Conjunto de spans de una misma unidad de trabajo (un request)."""
+
+    __slots__ = ("trace_id", "spans", "wall_start")
+
+    def __init__(self) -> None:
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.spans: List[Span] = []
+        self.wall_start = time.time()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+# Marca de raíz no muestreada: evita que los spans hijos abran trazas sueltas.
+_UNSAMPLED = object()
+
+
+class FileTraceExporter:
+    """Escribe cada traza como JSON de Trace Events (chrome://tracing, Perfetto, speedscope)."""
+
+    def __init__(self, output_dir: Path, max_files: int = 500) -> None:
+        self._output_dir = output_dir
+        self._max_files = max_files
+
+    def export(self, trace: Trace) -> None:
+        if not trace.spans:
+            return
+        root = trace.spans[0]
+        pid = os.getpid()
+        events = []
+        for span in trace.spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.layer,
+                    "ph": "X",
+                    "ts": (span.start_ns - root.start_ns) / 1000.0,
+                    "dur": (span.end_ns - span.start_ns) / 1000.0,
+                    "pid": pid,
+                    "tid": span.thread_id,
+                }
+            )
+        self._output_dir.mkdir(parents=True, exist_ok=True)
+        slug = _SLUG_RE.sub("_", root.name).strip("_") or "trace"
+        path = self._output_dir / f"{int(trace.wall_start * 1000)}-{trace.trace_id}-{slug}.json"
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        self._rotate()
+
+    def _rotate(self) -> None:
+        files = sorted(self._output_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for old in files[: max(0, len(files) - self._max_files)]:
+            old.unlink(missing_ok=True)
+
+
+class Tracer:
+    """Tracer liviano basado en contextvars; exporta la traza al cerrar el span raíz."""
+
+    def __init__(self, exporter: Optional[FileTraceExporter], sample_every: int = 1) -> None:
+        self._exporter = exporter
+        self._sample_every = max(1, sample_every)
+        self._counter = itertools.count()
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        if os.getenv("TRACING_ENABLED", "0") != "1":
+            return cls(None)
+        exporter = FileTraceExporter(
+            Path(os.getenv("TRACE_DIR", "traces")), max_files=int(os.getenv("TRACE_MAX_FILES", "500"))
+        )
+        return cls(exporter, sample_every=int(os.getenv("TRACE_SAMPLE_EVERY", "1")))
+
+    @property
+    def enabled(self) -> bool:
+        return self._exporter is not None
+
+    def begin(self, name: str, layer: str) -> Optional[Tuple[Optional[Span], Token]]:
+        if self._exporter is None:
+            return None
+        parent = _current_span.get()
+        if parent is _UNSAMPLED:
+            return None
+        if parent is None:
+            if next(self._counter) % self._sample_every:
+                return None, _current_span.set(_UNSAMPLED)
+            trace = Trace()
+        else:
+            trace = parent.trace
+        span = Span(name, layer, trace, parent)
+        trace.spans.append(span)
+        return span, _current_span.set(span)
+
+    def end(self, handle: Optional[Tuple[Optional[Span], Token]]) -> None:
+        if handle is None:
+            return
+        span, token = handle
+        if span is None:
+            _current_span.reset(token)
+            return
+        span.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+        if span.parent is None:
+            try:
+                self._exporter.export(span.trace)
+            except Exception as exc:  # el tracing nunca debe romper el request
+                logger.info("trace_export_error: %s", exc)
+
+
+class TracedProxy:
+    """Proxy que envuelve en un span cada método público del objeto."""
+
+    def __init__(self, target: Any, name: str, layer: str, tracer: Tracer) -> None:
+        self._target = target
+        self._name = name
+        self._layer = layer
+        self._tracer = tracer
+
+    def __getattr__(self, attr: str):
+        value = getattr(self._target, attr)
+        if attr.startswith("_") or not callable(value):
+            return value
+        span_name = f"{self._name}.{attr}"
+        tracer = self._tracer
+        layer = self._layer
+
+        @wraps(value)
+        def traced(*args, **kwargs):
+            handle = tracer.begin(span_name, layer)
+            try:
+                return value(*args, **kwargs)
+            finally:
+                tracer.end(handle)
+
+        # Cachea el wrapper: las siguientes búsquedas no pasan por __getattr__.
+        self.__dict__[attr] = traced
+        return traced
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.application.ports.iq_repositories import IqItemProvider
+from app.domain.entities.iq_item import IqItem
+from app.domain.value_objects.item_bank import ItemBank
+from app.iq_items import item_from_spec, item_to_spec
+
+logger = logging.getLogger("app.item_bank")
+
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    domain TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    prompt TEXT NOT NULL,
+    options TEXT NOT NULL,
+    correct TEXT NOT NULL,
+    visual TEXT,
+    difficulty_b REAL,
+    t_ref REAL
+);
+"""
+
+
+class FileIqItemProvider(IqItemProvider):
+    """Banco de ítems desde un archivo JSON o SQLite versionado, recargable en caliente.
+
+    `refresh()` (tarea periódica) compila el banco nuevo fuera del camino de los requests y lo publica
+    con una sola asignación; las versiones anteriores quedan disponibles para las sesiones en curso.
+    """
+
+    def __init__(
+        self, path: Path, fallback: ItemBank, keep_versions: int = 4, extra_items: Sequence[IqItem] = ()
+    ) -> None:
+        self._path = path
+        self._extra_items = tuple(extra_items)
+        self._keep_versions = max(1, keep_versions)
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._banks: "OrderedDict[str, ItemBank]" = OrderedDict()
+        self._current = fallback
+        self._banks[fallback.version] = fallback
+        self._stale_fallbacks = 0
+        self._ignored_changes = 0
+        self._current_digest = _bank_digest(fallback)
+        try:
+            self.refresh()
+        except Exception as exc:  # archivo roto al arrancar: se sirve el banco estático hasta que se corrija
+            logger.info("item_bank_load_error path=%s: %s", path, exc)
+
+    def get_pool(self) -> Sequence[IqItem]:
+        return self._current.items
+
+    def get_bank(self, version: Optional[str] = None) -> ItemBank:
+        current = self._current
+        if version is None or version == current.version:
+            return current
+        bank = self._banks.get(version)
+        if bank is None:
+            # Versión ya descartada (sesión muy vieja): se sigue con la vigente, pero los ítems que ya no
+            # estén en ella no puntúan. Se cuenta y se loguea; ITEM_BANK_KEEP_VERSIONS debería cubrir el TTL.
+            self._stale_fallbacks += 1
+            logger.info("item_bank_version_evicted requested=%s current=%s", version, current.version)
+            return current
+        return bank
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "versions": len(self._banks),
+            "items": len(self._current.items),
+            "stale_fallbacks": self._stale_fallbacks,
+            "ignored_changes": self._ignored_changes,
+        }
+
+    def refresh(self) -> bool:
+        """Recarga si el archivo cambió (mtime/tamaño); devuelve True si publicó una versión nueva."""
+        stat = self._path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return False
+        # Se marca antes de cargar: un archivo inválido se reporta una vez, no en cada chequeo.
+        self._stamp = stamp
+        bank = load_item_bank(self._path, self._extra_items)
+        digest = _bank_digest(bank)
+        with self._lock:
+            if bank.version == self._current.version:
+                if digest != self._current_digest:
+                    # Las sesiones fijan la versión: contenido nuevo con la misma versión no se publica.
+                    self._ignored_changes += 1
+                    logger.warning(
+                        "item_bank_version_unchanged version=%s: el contenido cambió sin cambiar la versión; "
+                        "se ignora hasta que se publique con otra versión",
+                        bank.version,
+                    )
+                return False
+            self._banks[bank.version] = bank
+            self._banks.move_to_end(bank.version)
+            while len(self._banks) > self._keep_versions:
+                self._banks.popitem(last=False)
+            self._current = bank
+            self._current_digest = digest
+        logger.info("item_bank_loaded version=%s items=%s", bank.version, len(bank.items))
+        return True
+
+
+def load_item_bank(path: Path, extra_items: Sequence[IqItem] = ()) -> ItemBank:
+    """Lee y compila un banco desde JSON (`{"version", "items": [...]}`) o SQLite (tablas meta + items).
+
+    `extra_items` (p. ej. matrices procedurales) se agregan a los del archivo.
+    """
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        version, specs = _read_sqlite(path)
+    else:
+        raw = path.read_bytes()
+        data = json.loads(raw)
+        # Sin versión declarada, el hash del contenido: mismo archivo, misma versión.
+        version, specs = data.get("version") or hashlib.sha1(raw).hexdigest()[:12], data["items"]
+    return ItemBank.build(str(version), [*(item_from_spec(spec) for spec in specs), *extra_items])
+
+
+def _bank_digest(bank: ItemBank) -> str:
+    specs = [item_to_spec(item) for item in bank.items]
+    return hashlib.sha1(json.dumps(specs, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def write_item_bank(path: Path, version: str, items: Sequence[IqItem]) -> None:
+    """Escribe el banco en el formato que indique la extensión (usado por el CLI de export)."""
+    specs = [item_to_spec(item) for item in items]
+    tmp = path.with_name(path.name + ".tmp")
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        tmp.unlink(missing_ok=True)
+        with sqlite3.connect(tmp) as conn:
+            conn.executescript(_SQLITE_SCHEMA)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('version', ?)", (version,))
+            conn.executemany(
+                "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        spec["id"], spec["domain"], spec["difficulty"], spec["prompt"],
+                        json.dumps(spec["options"], ensure_ascii=False), spec["correct"],
+                        json.dumps(spec["visual"], ensure_ascii=False) if "visual" in spec else None,
+                        spec["difficulty_b"], spec["t_ref"],
+                    )
+                    for spec in specs
+                ],
+            )
+        conn.close()
+    else:
+        tmp.write_text(json.dumps({"version": version, "items": specs}, ensure_ascii=False, indent=2), "utf-8")
+    # Rename atómico: el proveedor nunca lee un archivo a medio escribir.
+    tmp.replace(path)
+
+
+def _read_sqlite(path: Path):
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        specs = []
+        for item in conn.execute("SELECT * FROM items ORDER BY rowid"):
+            spec = dict(item)
+            spec["options"] = json.loads(spec["options"])
+            spec["visual"] = json.loads(spec["visual"]) if spec["visual"] else None
+            specs.append(spec)
+    finally:
+        conn.close()
+    return (row["value"] if row else str(path.stat().st_mtime_ns)), specs
@@ -1,12 +1,22 @@
-from typing import Sequence
+from typing import Optional, Sequence
 
 from app.application.ports.iq_repositories import IqItemProvider
 from app.domain.entities.iq_item import IqItem
+from app.domain.value_objects.item_bank import ItemBank
 from app.iq_items import get_item_pool
 
+STATIC_BANK_VERSION = "static"
+
 
 class StaticIqItemProvider(IqItemProvider):
     """Proveedor estático de ítems IQ (Infrastructure)."""
 
+    def __init__(self, extra_items: Sequence[IqItem] = ()) -> None:
+        # El pool es inmutable: se construye una vez y se comparte entre requests.
+        self._bank = ItemBank.build(STATIC_BANK_VERSION, [*get_item_pool(), *extra_items])
+
     def get_pool(self) -> Sequence[IqItem]:
-        return get_item_pool()
+        return self._bank.items
+
+    def get_bank(self, version: Optional[str] = None) -> ItemBank:
+        return self._bank
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.domain.value_objects.test_catalog import TEST_SLUGS
+from app.infrastructure.services.daily_rollup import DailyRollup, DailyRollupSink, RollupKey
+
+logger = logging.getLogger("app.rollup")
+
+_UPSERT_DAILY = """
+INSERT INTO analytics_daily (day, test_version_id, starts, finishes, avg_time_sec, source, campaign)
+VALUES (%s, %s, %s, %s, %s, %s, %s)
+ON CONFLICT (day, test_version_id, source, campaign) DO UPDATE SET
+  starts = analytics_daily.starts + EXCLUDED.starts,
+  finishes = analytics_daily.finishes + EXCLUDED.finishes,
+  avg_time_sec = CASE
+    WHEN analytics_daily.finishes + EXCLUDED.finishes = 0 THEN 0
+    ELSE (analytics_daily.avg_time_sec::bigint * analytics_daily.finishes
+          + EXCLUDED.avg_time_sec::bigint * EXCLUDED.finishes)
+         / (analytics_daily.finishes + EXCLUDED.finishes)
+  END
+RETURNING id
+"""
+
+_UPSERT_PROFILE = """
+INSERT INTO analytics_daily_profile (analytics_daily_id, profile_code, count)
+VALUES (%s, %s, %s)
+ON CONFLICT (analytics_daily_id, profile_code) DO UPDATE SET
+  count = analytics_daily_profile.count + EXCLUDED.count
+"""
+
+_UPSERT_QUESTION = """
+INSERT INTO analytics_daily_question (analytics_daily_id, question_id, drop_count)
+VALUES (%s, %s, %s)
+ON CONFLICT (analytics_daily_id, question_id) DO UPDATE SET
+  drop_count = analytics_daily_question.drop_count + EXCLUDED.drop_count
+"""
+
+_SELECT_VERSION = """
+SELECT tv.id FROM test_versions tv JOIN tests t ON t.id = tv.test_id
+WHERE t.slug = %s AND tv.version = %s
+"""
+
+_SELECT_QUESTION = 'SELECT id FROM questions WHERE test_version_id = %s AND "order" = %s'
+
+
+def _avg(total_time: int, finishes: int) -> int:
+    return int(total_time / finishes) if finishes else 0
+
+
+class PostgresDailyRollupSink(DailyRollupSink):
+    """Upsert incremental en analytics_daily, analytics_daily_profile y analytics_daily_question."""
+
+    def __init__(self, dsn: str) -> None:
+        try:
+            import psycopg  # dependencia opcional: sólo la necesita el job de rollup
+        except ImportError as exc:
+            raise RuntimeError("PostgresDailyRollupSink requiere el paquete 'psycopg'") from exc
+        self._psycopg = psycopg
+        self._dsn = dsn
+
+    def upsert(self, rollup: DailyRollup) -> None:
+        with self._psycopg.connect(self._dsn) as conn, conn.cursor() as cur:
+            versions: Dict[Tuple[str, int], Optional[int]] = {}
+            daily_ids: Dict[RollupKey, int] = {}
+            for key, (starts, finishes, total_time) in rollup.daily.items():
+                day, test, version, source, campaign = key
+                if (test, version) not in versions:
+                    cur.execute(_SELECT_VERSION, (test, version))
+                    row = cur.fetchone()
+                    versions[(test, version)] = row[0] if row else None
+                version_id = versions[(test, version)]
+                if version_id is None:
+                    logger.info("rollup_unknown_version: %s v%s", test, version)
+                    continue
+                # source/campaign vacíos en lugar de NULL: NULL rompe el UNIQUE del ON CONFLICT.
+                cur.execute(
+                    _UPSERT_DAILY,
+                    (day, version_id, starts, finishes, _avg(total_time, finishes), source, campaign),
+                )
+                daily_ids[key] = cur.fetchone()[0]
+
+            for (key, profile_code), count in rollup.profiles.items():
+                if key in daily_ids:
+                    cur.execute(_UPSERT_PROFILE, (daily_ids[key], profile_code, count))
+
+            # analytics_daily_question necesita una fila de `questions`: IQ (adaptativo), Stroop y el mixto
+            # no la tienen, así que su abandono por posición sólo queda en el sink JSON y en el journal.
+            skipped: Dict[Tuple[str, str], int] = {}
+            for (key, position), count in rollup.drops.items():
+                if key not in daily_ids:
+                    continue
+                test = key[1]
+                if test in TEST_SLUGS:
+                    skipped[(test, "no_questions")] = skipped.get((test, "no_questions"), 0) + count
+                    continue
+                cur.execute(_SELECT_QUESTION, (versions[(test, key[2])], position))
+                row = cur.fetchone()
+                if row:
+                    cur.execute(_UPSERT_QUESTION, (daily_ids[key], row[0], count))
+                else:
+                    skipped[(test, "unknown_position")] = skipped.get((test, "unknown_position"), 0) + count
+            for (test, reason), count in skipped.items():
+                logger.info("rollup_drops_skipped: %s reason=%s drops=%s", test, reason, count)
+
+
+class JsonFileDailyRollupSink(DailyRollupSink):
+    """Sink local (sin BD): mantiene los mismos agregados en un archivo JSON."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def upsert(self, rollup: DailyRollup) -> None:
+        data = json.loads(self._path.read_text(encoding="utf-8")) if self._path.exists() else {}
+        for key, (starts, finishes, total_time) in rollup.daily.items():
+            row = data.setdefault("|".join(map(str, key)), {
+                "day": key[0],
+                "test": key[1],
+                "version": key[2],
+                "source": key[3],
+                "campaign": key[4],
+                "starts": 0,
+                "finishes": 0,
+                "total_time_sec": 0,
+                "profiles": {},
+                "drops": {},
+            })
+            row["starts"] += starts
+            row["finishes"] += finishes
+            row["total_time_sec"] += total_time
+            row["avg_time_sec"] = _avg(row["total_time_sec"], row["finishes"])
+        for (key, profile_code), count in rollup.profiles.items():
+            profiles = data["|".join(map(str, key))]["profiles"]
+            profiles[profile_code] = profiles.get(profile_code, 0) + count
+        for (key, position), count in rollup.drops.items():
+            drops = data["|".join(map(str, key))]["drops"]
+            drops[str(position)] = drops.get(str(position), 0) + count
+        tmp = self._path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+        os.replace(tmp, self._path)
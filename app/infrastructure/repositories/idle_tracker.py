@@ -0,0 +1,36 @@
+import time
+from typing import Dict, Generic, Iterable, List, TypeVar
+
+S = TypeVar("S")
+
+
+class IdleTracker(Generic[S]):
+    """Última actividad por sesión para los repositorios en memoria y desalojo de las inactivas."""
+
+    def __init__(self) -> None:
+        self._touched: Dict[str, float] = {}
+
+    def touch(self, session_id: str) -> None:
+        self._touched[session_id] = time.time()
+
+    def touch_many(self, session_ids: Iterable[str]) -> None:
+        now = time.time()
+        self._touched.update((session_id, now) for session_id in session_ids)
+
+    def evict(self, sessions: Dict[str, S], max_idle_sec: float) -> List[S]:
+        """Quita de `sessions` y devuelve las sesiones sin actividad en los últimos `max_idle_sec` segundos.
+
+        Las finalizadas con `result` no se desalojan: el resultado cacheado es la única copia y un `/finish`
+        repetido o la consulta del resultado lo siguen leyendo. Dejan de seguirse hasta el próximo `save`.
+        """
+        cutoff = time.time() - max_idle_sec
+        evicted: List[S] = []
+        for session_id, touched in list(self._touched.items()):
+            if touched >= cutoff:
+                continue
+            self._touched.pop(session_id, None)
+            session = sessions.get(session_id)
+            if session is None or (getattr(session, "finished", False) and getattr(session, "result", None)):
+                continue
+            evicted.append(sessions.pop(session_id))
+        return evicted
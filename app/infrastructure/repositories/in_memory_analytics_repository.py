@@ -1,22 +1,55 @@
-from app.application.ports.iq_repositories import IqAnalyticsRepository
-from app.domain.entities.iq_analytics import IqAnalytics
+import copy
+import threading
+from typing import Dict, List, Optional, Sequence
 
+from app.application.ports.analytics_repositories import TestAnalyticsRepository
+from app.domain.entities.test_analytics import TestAnalytics
 
-class InMemoryIqAnalyticsRepository(IqAnalyticsRepository):
-    """Repositorio en memoria de métricas IQ (Infrastructure)."""
 
-    def __init__(self) -> None:
-        self._stats = IqAnalytics()
+class InMemoryTestAnalyticsRepository(TestAnalyticsRepository):
+    """Repositorio en memoria de analytics por test y versión (Infrastructure)."""
 
-    def increment_start(self) -> None:
-        self._stats.starts += 1
+    def __init__(self, profile_labels: Optional[Dict[str, Sequence[str]]] = None) -> None:
+        # Perfiles conocidos de antemano (p. ej. bandas IQ): aparecen con 0 aunque no haya datos.
+        self._profile_labels = profile_labels or {}
+        self._stats: Dict[str, Dict[int, TestAnalytics]] = {}
+        self._lock = threading.Lock()
 
-    def increment_finish(self, duration_sec: int, band: str) -> None:
-        self._stats.finishes += 1
-        self._stats.total_time_sec += duration_sec
-        if band not in self._stats.iq_bands:
-            self._stats.iq_bands[band] = 0
-        self._stats.iq_bands[band] += 1
+    def record(
+        self,
+        test: str,
+        version: int,
+        event: str,
+        duration_sec: int = 0,
+        profile: Optional[str] = None,
+        score: Optional[float] = None,
+    ) -> None:
+        with self._lock:
+            versions = self._stats.get(test)
+            if versions is None:
+                versions = self._stats[test] = {}
+            stats = versions.get(version)
+            if stats is None:
+                stats = versions[version] = self._empty(test, version)
+            if event == "start":
+                stats.record_start()
+            elif event == "finish":
+                stats.record_finish(duration_sec, profile, score)
 
-    def get_stats(self) -> IqAnalytics:
-        return self._stats
+    def get_stats(self, test: str, version: Optional[int] = None) -> TestAnalytics:
+        with self._lock:
+            versions = self._stats.get(test, {})
+            if version is not None:
+                return copy.deepcopy(versions.get(version) or self._empty(test, version))
+            merged = self._empty(test, None)
+            for stats in versions.values():
+                merged.merge(stats)
+            return merged
+
+    def list_stats(self) -> List[TestAnalytics]:
+        with self._lock:
+            tests = list(self._stats)
+        return [self.get_stats(test) for test in tests]
+
+    def _empty(self, test: str, version: Optional[int]) -> TestAnalytics:
+        return TestAnalytics(test, version, profiles={label: 0 for label in self._profile_labels.get(test, ())})
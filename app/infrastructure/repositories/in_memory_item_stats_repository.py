@@ -0,0 +1,33 @@
+import copy
+import threading
+from typing import Dict
+
+from app.application.ports.iq_repositories import IqItemStatsRepository
+from app.domain.entities.iq_item_stats import IqItemStats
+
+
+class InMemoryIqItemStatsRepository(IqItemStatsRepository):
+    """Repositorio en memoria de estadísticas por ítem IQ (Infrastructure)."""
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, IqItemStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, item_id: str) -> IqItemStats:
+        stats = self._stats.get(item_id)
+        if stats is None:
+            stats = IqItemStats(item_id)
+            self._stats[item_id] = stats
+        return stats
+
+    def record_answer(self, item_id: str, correct: bool, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self._get(item_id).add_answer(correct, seconds, timed_out)
+
+    def record_outcome(self, item_id: str, correct: bool, theta: float) -> None:
+        with self._lock:
+            self._get(item_id).add_outcome(correct, theta)
+
+    def get_all(self) -> Dict[str, IqItemStats]:
+        with self._lock:
+            return copy.deepcopy(self._stats)
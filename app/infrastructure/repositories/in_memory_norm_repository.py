@@ -0,0 +1,42 @@
+import random
+import threading
+from typing import Dict, List, Optional
+
+from app.application.ports.iq_repositories import NormRepository
+from app.domain.value_objects.norm_table import NormTable
+
+
+class InMemoryNormRepository(NormRepository):
+    """Muestras acotadas por reservoir sampling + tablas de normas publicadas por swap de referencia."""
+
+    def __init__(self, max_samples: int = 50_000) -> None:
+        self._max_samples = max_samples
+        self._samples: Dict[str, List[float]] = {}
+        self._seen: Dict[str, int] = {}
+        self._tables: Dict[str, NormTable] = {}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def add_sample(self, norm_key: str, theta: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(norm_key, [])
+            seen = self._seen.get(norm_key, 0) + 1
+            self._seen[norm_key] = seen
+            if len(samples) < self._max_samples:
+                samples.append(theta)
+                return
+            # Reservoir: cada resultado histórico conserva la misma probabilidad de estar en la muestra.
+            slot = self._random.randrange(seen)
+            if slot < self._max_samples:
+                samples[slot] = theta
+
+    def samples(self) -> Dict[str, List[float]]:
+        with self._lock:
+            return {key: list(values) for key, values in self._samples.items()}
+
+    def get_table(self, norm_key: str) -> Optional[NormTable]:
+        # Lectura sin lock: el finish sólo ve la tabla vieja o la nueva, nunca una a medio armar.
+        return self._tables.get(norm_key)
+
+    def set_table(self, norm_key: str, table: NormTable) -> None:
+        self._tables[norm_key] = table
@@ -0,0 +1,57 @@
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.application.ports.support_services import QuantileSketchRepository
+from app.domain.services.quantile_sketch import DDSketch
+from app.infrastructure.repositories.peer_snapshots import publish_snapshot, read_peer_snapshots
+
+SketchKey = Tuple[str, str, str]  # (scope, key, metric), p. ej. ("item", "q07", "seconds")
+
+_SNAPSHOT_PREFIX = "sketches"
+
+
+class InMemoryQuantileSketchRepository(QuantileSketchRepository):
+    """Sketches por proceso; con `export_dir` cada worker publica los suyos y lee los del resto."""
+
+    def __init__(self, relative_accuracy: float = 0.01, export_dir: Optional[Path] = None) -> None:
+        self._relative_accuracy = relative_accuracy
+        self._export_dir = export_dir
+        self._sketches: Dict[SketchKey, DDSketch] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, scope: str, key: str, metric: str, value: float) -> None:
+        sketch_key = (scope, key, metric)
+        with self._lock:
+            sketch = self._sketches.get(sketch_key)
+            if sketch is None:
+                sketch = DDSketch(self._relative_accuracy)
+                self._sketches[sketch_key] = sketch
+            sketch.add(value)
+
+    def snapshot(self) -> Dict[SketchKey, DDSketch]:
+        """Copia mergeada: sketches locales + los publicados por otros procesos."""
+        with self._lock:
+            merged = {key: DDSketch.from_dict(sketch.to_dict()) for key, sketch in self._sketches.items()}
+        if self._export_dir is None:
+            return merged
+        for exported in read_peer_snapshots(self._export_dir, _SNAPSHOT_PREFIX):
+            for item in exported:
+                key = (item["scope"], item["key"], item["metric"])
+                sketch = DDSketch.from_dict(item["sketch"])
+                if key in merged:
+                    merged[key].merge(sketch)
+                else:
+                    merged[key] = sketch
+        return merged
+
+    def publish(self) -> None:
+        """Escribe los sketches de este proceso para que otros los mergeen."""
+        if self._export_dir is None:
+            return
+        with self._lock:
+            exported = [
+                {"scope": scope, "key": key, "metric": metric, "sketch": sketch.to_dict()}
+                for (scope, key, metric), sketch in self._sketches.items()
+            ]
+        publish_snapshot(self._export_dir, _SNAPSHOT_PREFIX, exported)
@@ -1,7 +1,8 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
 from app.application.ports.iq_repositories import IqSessionRepository
 from app.domain.entities.iq_session import IqSession
+from app.infrastructure.repositories.idle_tracker import IdleTracker
 
 
 class InMemoryIqSessionRepository(IqSessionRepository):
@@ -9,9 +10,21 @@ class InMemoryIqSessionRepository(IqSessionRepository):
 
     def __init__(self) -> None:
         self._sessions: Dict[str, IqSession] = {}
+        self._idle: IdleTracker[IqSession] = IdleTracker()
 
     def save(self, session: IqSession) -> None:
         self._sessions[session.session_id] = session
+        self._idle.touch(session.session_id)
+
+    def save_many(self, sessions: Sequence[IqSession]) -> None:
+        self._sessions.update((session.session_id, session) for session in sessions)
+        self._idle.touch_many(session.session_id for session in sessions)
 
     def get(self, session_id: str) -> Optional[IqSession]:
         return self._sessions.get(session_id)
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def evict_idle(self, max_idle_sec: float) -> List[IqSession]:
+        return self._idle.evict(self._sessions, max_idle_sec)
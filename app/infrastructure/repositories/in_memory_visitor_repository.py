@@ -0,0 +1,69 @@
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.application.ports.support_services import VisitorSketchRepository
+from app.domain.services.hyperloglog import HyperLogLog
+from app.infrastructure.repositories.peer_snapshots import publish_snapshot, read_peer_snapshots
+
+VisitorKey = Tuple[str, str, str]  # (día ISO, test slug, campaign)
+
+_SNAPSHOT_PREFIX = "visitors"
+
+
+class InMemoryVisitorSketchRepository(VisitorSketchRepository):
+    """Un HyperLogLog por día / test / campaign; los días fuera de la retención se descartan."""
+
+    def __init__(self, precision: int = 12, retention_days: int = 35, export_dir: Optional[Path] = None) -> None:
+        self._precision = precision
+        self._retention_sec = retention_days * 86400
+        self._export_dir = export_dir
+        self._sketches: Dict[VisitorKey, HyperLogLog] = {}
+        self._current_day = ""
+        self._lock = threading.Lock()
+
+    def add(self, test: str, campaign: Optional[str], visitor: str) -> None:
+        now = time.time()
+        day = time.strftime("%Y-%m-%d", time.gmtime(now))
+        key = (day, test, campaign or "")
+        with self._lock:
+            if day != self._current_day:
+                self._current_day = day
+                self._prune(now)
+            sketch = self._sketches.get(key)
+            if sketch is None:
+                sketch = HyperLogLog(self._precision)
+                self._sketches[key] = sketch
+            sketch.add(visitor)
+
+    def snapshot(self) -> Dict[VisitorKey, HyperLogLog]:
+        """Copia mergeada: sketches locales + los publicados por otros procesos."""
+        with self._lock:
+            merged = {key: sketch.copy() for key, sketch in self._sketches.items()}
+        if self._export_dir is None:
+            return merged
+        for exported in read_peer_snapshots(self._export_dir, _SNAPSHOT_PREFIX):
+            for item in exported:
+                key = (item["day"], item["test"], item["campaign"])
+                sketch = HyperLogLog.from_dict(item["sketch"])
+                if key in merged:
+                    merged[key].merge(sketch)
+                else:
+                    merged[key] = sketch
+        return merged
+
+    def publish(self) -> None:
+        if self._export_dir is None:
+            return
+        with self._lock:
+            exported = [
+                {"day": day, "test": test, "campaign": campaign, "sketch": sketch.to_dict()}
+                for (day, test, campaign), sketch in self._sketches.items()
+            ]
+        publish_snapshot(self._export_dir, _SNAPSHOT_PREFIX, exported)
+
+    def _prune(self, now: float) -> None:
+        cutoff = time.strftime("%Y-%m-%d", time.gmtime(now - self._retention_sec))
+        for key in [key for key in self._sketches if key[0] < cutoff]:
+            del self._sketches[key]
@@ -0,0 +1,55 @@
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.application.ports.questionnaire_repositories import QuestionnaireSource
+
+_SLUG_RE = re.compile(r"^[a-z0-9][a-z0-9-]*$")
+
+
+class JsonQuestionnaireSource(QuestionnaireSource):
+    """Cuestionarios en archivos `<dir>/<slug>/<version>.json`, con las mismas columnas que el schema SQL.
+
+    Cada archivo es una fila de test_versions (+ los datos del test) con sus `questions` (cada una con
+    `options`) y `profiles`. La versión publicada es la mayor con `"status": "published"`.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+
+    def list_published(self) -> List[Dict]:
+        tests = []
+        for slug_dir in sorted(self._directory.glob("*/")):
+            version = self.published_version(slug_dir.name)
+            if version is None:
+                continue
+            definition = self.load(slug_dir.name, version) or {}
+            tests.append({
+                "slug": slug_dir.name,
+                "title": definition.get("title", slug_dir.name),
+                "description": definition.get("description"),
+                "lang": definition.get("lang", "es"),
+                "is_active": definition.get("is_active", True),
+                "published_version": version,
+            })
+        return [test for test in tests if test["is_active"]]
+
+    def published_version(self, slug: str) -> Optional[int]:
+        if not _SLUG_RE.match(slug):
+            return None
+        published = None
+        for path in (self._directory / slug).glob("*.json"):
+            if not path.stem.isdigit():
+                continue
+            if json.loads(path.read_text("utf-8")).get("status") == "published":
+                published = max(published or 0, int(path.stem))
+        return published
+
+    def load(self, slug: str, version: int) -> Optional[Dict]:
+        if not _SLUG_RE.match(slug):
+            return None
+        path = self._directory / slug / f"{int(version)}.json"
+        if not path.is_file():
+            return None
+        return {**json.loads(path.read_text("utf-8")), "slug": slug, "version": int(version)}
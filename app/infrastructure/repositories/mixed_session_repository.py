@@ -1,6 +1,7 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from app.domain.entities.mixed_session import MixedSession
+from app.infrastructure.repositories.idle_tracker import IdleTracker
 
 
 class InMemoryMixedSessionRepository:
@@ -8,9 +9,17 @@ class InMemoryMixedSessionRepository:
 
     def __init__(self) -> None:
         self._sessions: Dict[str, MixedSession] = {}
+        self._idle: IdleTracker[MixedSession] = IdleTracker()
 
     def save(self, session: MixedSession) -> None:
         self._sessions[session.session_id] = session
+        self._idle.touch(session.session_id)
 
     def get(self, session_id: str) -> Optional[MixedSession]:
         return self._sessions.get(session_id)
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def evict_idle(self, max_idle_sec: float) -> List[MixedSession]:
+        return self._idle.evict(self._sessions, max_idle_sec)
@@ -0,0 +1,30 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Iterator, List
+
+logger = logging.getLogger("app.analytics")
+
+
+def publish_snapshot(directory: Path, prefix: str, payload: List) -> None:
+    """Publica el estado de este proceso en `<prefix>-<pid>.json` (reemplazo atómico)."""
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{prefix}-{os.getpid()}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_peer_snapshots(directory: Path, prefix: str) -> Iterator[List]:
+    """Estados publicados por los demás procesos (se ignora el propio y los ilegibles)."""
+    if not directory.exists():
+        return
+    own = directory / f"{prefix}-{os.getpid()}.json"
+    for path in directory.glob(f"{prefix}-*.json"):
+        if path == own:
+            continue
+        try:
+            yield json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.info("peer_snapshot_read_error: %s %s", path.name, exc)
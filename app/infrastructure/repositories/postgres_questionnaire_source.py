@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional
+
+from app.application.ports.questionnaire_repositories import QuestionnaireSource
+
+_SELECT_PUBLISHED = """
+SELECT slug, title, description, lang, published_version FROM tests
+WHERE is_active AND published_version IS NOT NULL ORDER BY slug
+"""
+
+_SELECT_PUBLISHED_VERSION = "SELECT published_version FROM tests WHERE slug = %s AND is_active"
+
+_SELECT_VERSION = """
+SELECT tv.id, t.title, t.description, t.lang, tv.status, tv.config_json
+FROM test_versions tv JOIN tests t ON t.id = tv.test_id
+WHERE t.slug = %s AND tv.version = %s
+"""
+
+_SELECT_QUESTIONS = """
+SELECT id, "order", type, text, is_required, rules_json FROM questions
+WHERE test_version_id = %s ORDER BY "order"
+"""
+
+_SELECT_OPTIONS = """
+SELECT o.id, o.question_id, o.text, o.value, o.score_json, o.next_question_id
+FROM options o JOIN questions q ON q.id = o.question_id
+WHERE q.test_version_id = %s ORDER BY o.id
+"""
+
+_SELECT_PROFILES = """
+SELECT code, title, summary, recommendations_json, min_score, max_score FROM profiles
+WHERE test_version_id = %s ORDER BY min_score
+"""
+
+
+class PostgresQuestionnaireSource(QuestionnaireSource):
+    """Lee cuestionarios de las tablas del schema; sólo se consulta al compilar una versión (luego se cachea)."""
+
+    def __init__(self, dsn: str) -> None:
+        try:
+            import psycopg  # dependencia opcional: sólo con cuestionarios en Postgres
+        except ImportError as exc:
+            raise RuntimeError("PostgresQuestionnaireSource requiere el paquete 'psycopg'") from exc
+        self._psycopg = psycopg
+        self._dsn = dsn
+
+    def list_published(self) -> List[Dict]:
+        with self._psycopg.connect(self._dsn) as conn, conn.cursor() as cur:
+            cur.execute(_SELECT_PUBLISHED)
+            return [
+                {
+                    "slug": slug,
+                    "title": title,
+                    "description": description,
+                    "lang": lang,
+                    "is_active": True,
+                    "published_version": version,
+                }
+                for slug, title, description, lang, version in cur.fetchall()
+            ]
+
+    def published_version(self, slug: str) -> Optional[int]:
+        with self._psycopg.connect(self._dsn) as conn, conn.cursor() as cur:
+            cur.execute(_SELECT_PUBLISHED_VERSION, (slug,))
+            row = cur.fetchone()
+        return row[0] if row else None
+
+    def load(self, slug: str, version: int) -> Optional[Dict]:
+        with self._psycopg.connect(self._dsn) as conn, conn.cursor() as cur:
+            cur.execute(_SELECT_VERSION, (slug, version))
+            row = cur.fetchone()
+            if row is None:
+                return None
+            version_id, title, description, lang, status, config = row
+            cur.execute(_SELECT_QUESTIONS, (version_id,))
+            questions = {
+                qid: {
+                    "id": qid, "order": order, "type": qtype, "text": text, "is_required": required,
+                    "rules_json": rules, "options": [],
+                }
+                for qid, order, qtype, text, required, rules in cur.fetchall()
+            }
+            cur.execute(_SELECT_OPTIONS, (version_id,))
+            for oid, question_id, text, value, score, next_id in cur.fetchall():
+                questions[question_id]["options"].append({
+                    "id": oid, "text": text, "value": value, "score_json": score, "next_question_id": next_id,
+                })
+            cur.execute(_SELECT_PROFILES, (version_id,))
+            profiles = [
+                {
+                    "code": code, "title": ptitle, "summary": summary, "recommendations_json": recommendations,
+                    "min_score": min_score, "max_score": max_score,
+                }
+                for code, ptitle, summary, recommendations, min_score, max_score in cur.fetchall()
+            ]
+        return {
+            "slug": slug,
+            "version": version,
+            "title": title,
+            "description": description,
+            "lang": lang,
+            "status": status,
+            "config_json": config,
+            "questions": list(questions.values()),
+            "profiles": profiles,
+        }
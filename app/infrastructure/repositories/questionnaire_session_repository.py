@@ -0,0 +1,26 @@
+from typing import Dict, List, Optional
+
+from app.application.ports.questionnaire_repositories import QuestionnaireSessionRepository
+from app.domain.entities.questionnaire_session import QuestionnaireSession
+from app.infrastructure.repositories.idle_tracker import IdleTracker
+
+
+class InMemoryQuestionnaireSessionRepository(QuestionnaireSessionRepository):
+    """Repositorio en memoria para sesiones de cuestionarios."""
+
+    def __init__(self) -> None:
+        self._sessions: Dict[str, QuestionnaireSession] = {}
+        self._idle: IdleTracker[QuestionnaireSession] = IdleTracker()
+
+    def save(self, session: QuestionnaireSession) -> None:
+        self._sessions[session.session_id] = session
+        self._idle.touch(session.session_id)
+
+    def get(self, session_id: str) -> Optional[QuestionnaireSession]:
+        return self._sessions.get(session_id)
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def evict_idle(self, max_idle_sec: float) -> List[QuestionnaireSession]:
+        return self._idle.evict(self._sessions, max_idle_sec)
@@ -0,0 +1,27 @@
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.application.ports.share_repositories import ShareResultRepository
+from app.domain.entities.share_result import ShareResult
+
+
+class InMemoryShareResultRepository(ShareResultRepository):
+    """Repositorio en memoria de resultados compartidos, acotado a los `max_entries` más recientes."""
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._shares: "OrderedDict[str, ShareResult]" = OrderedDict()
+
+    def save(self, share: ShareResult) -> None:
+        with self._lock:
+            self._shares[share.share_token] = share
+            while len(self._shares) > self._max_entries:
+                self._shares.popitem(last=False)
+
+    def get(self, share_token: str) -> Optional[ShareResult]:
+        return self._shares.get(share_token)
+
+    def count(self) -> int:
+        return len(self._shares)
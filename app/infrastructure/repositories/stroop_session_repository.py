@@ -1,6 +1,7 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence
 
 from app.domain.entities.stroop_session import StroopSession, StroopTrial
+from app.infrastructure.repositories.idle_tracker import IdleTracker
 
 
 class InMemoryStroopSessionRepository:
@@ -8,14 +9,31 @@ class InMemoryStroopSessionRepository:
 
     def __init__(self) -> None:
         self._sessions: Dict[str, StroopSession] = {}
+        self._idle: IdleTracker[StroopSession] = IdleTracker()
         self._pending_trial: Dict[str, StroopTrial] = {}
 
     def save(self, session: StroopSession) -> None:
         self._sessions[session.session_id] = session
+        self._idle.touch(session.session_id)
+
+    def save_many(self, sessions: Sequence[StroopSession], pending_trials: Sequence[StroopTrial]) -> None:
+        """Alta en bloque: sesiones nuevas junto con su primer trial pendiente."""
+        self._sessions.update((session.session_id, session) for session in sessions)
+        self._idle.touch_many(session.session_id for session in sessions)
+        self._pending_trial.update((s.session_id, trial) for s, trial in zip(sessions, pending_trials))
 
     def get(self, session_id: str) -> Optional[StroopSession]:
         return self._sessions.get(session_id)
 
+    def count(self) -> int:
+        return len(self._sessions)
+
+    def evict_idle(self, max_idle_sec: float) -> List[StroopSession]:
+        evicted = self._idle.evict(self._sessions, max_idle_sec)
+        for session in evicted:
+            self._pending_trial.pop(session.session_id, None)
+        return evicted
+
     def set_pending_trial(self, session_id: str, trial: Optional[StroopTrial]) -> None:
         if trial is None:
             self._pending_trial.pop(session_id, None)
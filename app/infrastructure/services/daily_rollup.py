@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Protocol, Set, Tuple
+
+import numpy as np
+
+from app.infrastructure.services.event_journal import iter_segment_records, list_closed_segments
+
+logger = logging.getLogger("app.rollup")
+
+# (día ISO, test slug, versión, source, campaign)
+RollupKey = Tuple[str, str, int, str, str]
+
+_EVENT_CODES = {"start": 0, "finish": 1, "abandon": 2}
+_START, _FINISH, _ABANDON = 0, 1, 2
+_EPOCH = date(1970, 1, 1)
+
+
+@dataclass
+class DailyRollup:
+    """Agregados por día / test / versión / source / campaign (forma de las tablas analytics_daily*)."""
+
+    daily: Dict[RollupKey, List[int]] = field(default_factory=dict)  # [starts, finishes, total_time_sec]
+    profiles: Dict[Tuple[RollupKey, str], int] = field(default_factory=dict)
+    drops: Dict[Tuple[RollupKey, int], int] = field(default_factory=dict)  # drop por posición de pregunta (1-based)
+    events: int = 0
+
+    def is_empty(self) -> bool:
+        return not self.daily
+
+
+class DailyRollupSink(Protocol):
+    """Destino del rollup: suma incrementalmente los agregados a lo ya persistido."""
+
+    def upsert(self, rollup: DailyRollup) -> None:
+        ...
+
+
+class _ColumnarAccumulator:
+    """Convierte chunks de eventos en columnas NumPy y agrega con group-bys vectorizados."""
+
+    def __init__(self) -> None:
+        self._keys: Dict[Tuple[str, int, str, str], int] = {}
+        self._key_list: List[Tuple[str, int, str, str]] = []
+        self._profiles: Dict[str, int] = {}
+        self._profile_list: List[str] = []
+        self.result = DailyRollup()
+
+    def _key_code(self, record: Dict) -> int:
+        key = (
+            str(record.get("test", "")),
+            int(record.get("version") or 0),
+            str(record.get("source") or ""),
+            str(record.get("campaign") or ""),
+        )
+        code = self._keys.get(key)
+        if code is None:
+            code = len(self._key_list)
+            self._keys[key] = code
+            self._key_list.append(key)
+        return code
+
+    def _profile_code(self, record: Dict) -> int:
+        profile = record.get("profile_code") or record.get("band") or record.get("profile")
+        if not profile:
+            return -1
+        profile = str(profile)[:20]
+        code = self._profiles.get(profile)
+        if code is None:
+            code = len(self._profile_list)
+            self._profiles[profile] = code
+            self._profile_list.append(profile)
+        return code
+
+    def add_chunk(self, records: List[Dict]) -> None:
+        lifecycle = [r for r in records if r.get("event") in _EVENT_CODES]
+        self.result.events += len(records)
+        n = len(lifecycle)
+        if not n:
+            return
+        days = np.empty(n, dtype=np.int64)
+        keys = np.empty(n, dtype=np.int64)
+        events = np.empty(n, dtype=np.int8)
+        durations = np.zeros(n, dtype=np.int64)
+        profiles = np.full(n, -1, dtype=np.int64)
+        positions = np.zeros(n, dtype=np.int64)
+        for i, record in enumerate(lifecycle):
+            days[i] = int(record.get("ts", 0)) // 86400
+            keys[i] = self._key_code(record)
+            event = _EVENT_CODES[record["event"]]
+            events[i] = event
+            if event == _FINISH:
+                durations[i] = int(record.get("duration_sec") or 0)
+                profiles[i] = self._profile_code(record)
+            elif event == _ABANDON:
+                positions[i] = int(record.get("answers") or 0) + 1
+
+        n_keys = len(self._key_list)
+        groups = days * n_keys + keys
+
+        for group, count in zip(*np.unique(groups[events == _START], return_counts=True)):
+            self._daily(int(group), n_keys)[0] += int(count)
+
+        finish_mask = events == _FINISH
+        if finish_mask.any():
+            uniq, inverse, counts = np.unique(groups[finish_mask], return_inverse=True, return_counts=True)
+            time_sums = np.bincount(inverse, weights=durations[finish_mask])
+            for group, count, total in zip(uniq.tolist(), counts.tolist(), time_sums.tolist()):
+                row = self._daily(group, n_keys)
+                row[1] += count
+                row[2] += int(total)
+
+            profile_mask = finish_mask & (profiles >= 0)
+            n_profiles = max(1, len(self._profile_list))
+            composite = groups[profile_mask] * n_profiles + profiles[profile_mask]
+            for value, count in zip(*np.unique(composite, return_counts=True)):
+                group, profile = divmod(int(value), n_profiles)
+                key = (self._rollup_key(group, n_keys), self._profile_list[profile])
+                self.result.profiles[key] = self.result.profiles.get(key, 0) + int(count)
+
+        abandon_mask = events == _ABANDON
+        if abandon_mask.any():
+            span = int(positions[abandon_mask].max()) + 1
+            composite = groups[abandon_mask] * span + positions[abandon_mask]
+            for value, count in zip(*np.unique(composite, return_counts=True)):
+                group, position = divmod(int(value), span)
+                rollup_key = self._rollup_key(group, n_keys)
+                self._daily(group, n_keys)
+                key = (rollup_key, position)
+                self.result.drops[key] = self.result.drops.get(key, 0) + int(count)
+
+    def _rollup_key(self, group: int, n_keys: int) -> RollupKey:
+        day, key_code = divmod(group, n_keys)
+        test, version, source, campaign = self._key_list[key_code]
+        return ((_EPOCH + timedelta(days=day)).isoformat(), test, version, source, campaign)
+
+    def _daily(self, group: int, n_keys: int) -> List[int]:
+        key = self._rollup_key(group, n_keys)
+        row = self.result.daily.get(key)
+        if row is None:
+            row = [0, 0, 0]
+            self.result.daily[key] = row
+        return row
+
+
+class DailyRollupJob:
+    """Rollup incremental: sólo procesa segmentos cerrados del journal que aún no se agregaron."""
+
+    def __init__(
+        self, journal_dir: Path, sink: DailyRollupSink, checkpoint_path: Path, chunk_size: int = 50_000
+    ) -> None:
+        self._journal_dir = journal_dir
+        self._sink = sink
+        self._checkpoint_path = checkpoint_path
+        self._chunk_size = chunk_size
+
+    def run(self) -> Dict[str, int]:
+        processed = self._load_checkpoint()
+        pending = [path for path in list_closed_segments(self._journal_dir) if path.name not in processed]
+        accumulator = _ColumnarAccumulator()
+        for path in pending:
+            for chunk in _chunks(iter_segment_records(path), self._chunk_size):
+                accumulator.add_chunk(chunk)
+        rollup = accumulator.result
+        if not rollup.is_empty():
+            self._sink.upsert(rollup)
+        # El checkpoint se escribe después del upsert: un fallo reintenta los mismos segmentos.
+        processed.update(path.name for path in pending)
+        self._save_checkpoint(processed)
+        logger.info("rollup_done segments=%s events=%s rows=%s", len(pending), rollup.events, len(rollup.daily))
+        return {"segments": len(pending), "events": rollup.events, "rows": len(rollup.daily)}
+
+    def _load_checkpoint(self) -> Set[str]:
+        if not self._checkpoint_path.exists():
+            return set()
+        data = json.loads(self._checkpoint_path.read_text(encoding="utf-8"))
+        return set(data.get("segments", []))
+
+    def _save_checkpoint(self, processed: Set[str]) -> None:
+        tmp = self._checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"segments": sorted(processed)}), encoding="utf-8")
+        os.replace(tmp, self._checkpoint_path)
+
+
+def _chunks(records: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,206 @@
+import atexit
+import gzip
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.application.ports.support_services import EventJournal
+
+logger = logging.getLogger("app.journal")
+
+SEGMENT_SUFFIX = ".ndjson.gz"
+OPEN_SEGMENT_SUFFIX = ".ndjson.gz.part"
+
+_Record = Tuple[float, str, int, str, str, Optional[Dict]]
+
+
+class NullEventJournal(EventJournal):
+    """Journal deshabilitado: descarta eventos sin costo."""
+
+    def record(self, test: str, version: int, event: str, session_id: str, data: Optional[Dict] = None) -> None:
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        return {"queued": 0, "written": 0, "dropped": 0, "segments": 0}
+
+
+class AsyncFileEventJournal(EventJournal):
+    """Journal append-only: cola sin locks + hilo escritor por lotes a segmentos gzip rotativos."""
+
+    def __init__(
+        self,
+        directory: Path,
+        capacity: int = 100_000,
+        batch_size: int = 1_000,
+        flush_interval_sec: float = 0.5,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+        segment_max_age_sec: float = 3600.0,
+    ) -> None:
+        self._directory = directory
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval_sec
+        self._segment_max_bytes = segment_max_bytes
+        self._segment_max_age = segment_max_age_sec
+        # deque.append/popleft son atómicos: el request nunca toma un lock.
+        self._queue: Deque[_Record] = deque()
+        self._drop_counter = itertools.count(1)
+        self._dropped = 0
+        self._reported_dropped = 0
+        self._written = 0
+        self._segments = 0
+        self._segment_seq = itertools.count(1)
+        self._segment = None
+        self._segment_path: Optional[Path] = None
+        self._segment_bytes = 0
+        self._segment_opened = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        # Con preload el master no arranca el hilo; cada worker lo arranca en su primer evento.
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def record(self, test: str, version: int, event: str, session_id: str, data: Optional[Dict] = None) -> None:
+        if len(self._queue) >= self._capacity:
+            self._dropped = next(self._drop_counter)
+            return
+        self._queue.append((time.time(), test, version, event, session_id, data))
+        if self._thread is None:
+            self._ensure_thread()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": len(self._queue),
+            "written": self._written,
+            "dropped": self._dropped,
+            "segments": self._segments,
+        }
+
+    def flush(self) -> None:
+        """Escribe lo pendiente y cierra el segmento activo (shutdown / tests / CLI)."""
+        with self._write_lock:
+            while self._queue:
+                self._write_batch()
+            self._close_segment()
+
+    def _ensure_thread(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="event-journal", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _reset_after_fork(self) -> None:
+        self._thread = None
+        self._segment = None
+        self._segment_path = None
+        self._start_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                with self._write_lock:
+                    wrote = self._write_batch() if self._queue else False
+                    if self._segment is not None and time.time() - self._segment_opened >= self._segment_max_age:
+                        self._close_segment()
+                self._report_drops()
+                if not wrote:
+                    time.sleep(self._flush_interval)
+            except Exception as exc:  # el hilo escritor no debe morir por un error de disco
+                logger.info("event_journal_write_error: %s", exc)
+                time.sleep(self._flush_interval)
+
+    def _write_batch(self) -> bool:
+        lines = []
+        for _ in range(self._batch_size):
+            try:
+                ts, test, version, event, session_id, data = self._queue.popleft()
+            except IndexError:
+                break
+            record = {"ts": round(ts, 3), "test": test, "version": version, "event": event, "session_id": session_id}
+            if data:
+                record.update(data)
+            lines.append(json.dumps(record, separators=(",", ":"), ensure_ascii=False))
+        if not lines:
+            return False
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+        segment = self._open_segment()
+        segment.write(payload)
+        # Z_SYNC_FLUSH: el segmento abierto es legible aunque el proceso muera.
+        segment.flush()
+        self._segment_bytes += len(payload)
+        self._written += len(lines)
+        if self._segment_bytes >= self._segment_max_bytes:
+            self._close_segment()
+        return True
+
+    def _open_segment(self):
+        if self._segment is None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime())
+            name = f"events-{stamp}-{os.getpid()}-{next(self._segment_seq):04d}{OPEN_SEGMENT_SUFFIX}"
+            self._segment_path = self._directory / name
+            self._segment = gzip.open(self._segment_path, "ab")
+            self._segment_bytes = 0
+            self._segment_opened = time.time()
+        return self._segment
+
+    def _close_segment(self) -> None:
+        if self._segment is None:
+            return
+        self._segment.close()
+        # Segmento cerrado = inmutable; los procesos batch sólo leen *.ndjson.gz.
+        final = self._segment_path.with_name(self._segment_path.name[: -len(OPEN_SEGMENT_SUFFIX)] + SEGMENT_SUFFIX)
+        self._segment_path.rename(final)
+        self._segment = None
+        self._segment_path = None
+        self._segments += 1
+
+    def _report_drops(self) -> None:
+        dropped = self._dropped
+        if dropped > self._reported_dropped:
+            logger.warning(
+                "event_journal_dropped: %s eventos descartados (total %s)", dropped - self._reported_dropped, dropped
+            )
+            self._reported_dropped = dropped
+
+
+def list_closed_segments(directory: Path) -> List[Path]:
+    """Segmentos cerrados (inmutables) en orden cronológico."""
+    return sorted(directory.glob(f"events-*{SEGMENT_SUFFIX}"))
+
+
+def iter_segment_records(path: Path) -> Iterator[Dict]:
+    """Itera los eventos de un segmento sin cargarlo completo; tolera una cola truncada."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+    except EOFError:
+        return
+
+
+def build_event_journal_from_env() -> EventJournal:
+    directory = os.getenv("EVENT_JOURNAL_DIR")
+    if not directory:
+        return NullEventJournal()
+    return AsyncFileEventJournal(
+        Path(directory),
+        capacity=int(os.getenv("EVENT_JOURNAL_CAPACITY", "100000")),
+        segment_max_bytes=int(float(os.getenv("EVENT_JOURNAL_SEGMENT_MB", "64")) * 1024 * 1024),
+        segment_max_age_sec=float(os.getenv("EVENT_JOURNAL_SEGMENT_SEC", "3600")),
+    )
@@ -0,0 +1,47 @@
+import calendar
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from app.application.ports.support_services import SessionEventSource
+from app.infrastructure.services.event_journal import OPEN_SEGMENT_SUFFIX, SEGMENT_SUFFIX, iter_segment_records
+
+
+class JournalEventSource(SessionEventSource):
+    """Lee eventos de los segmentos del journal (cerrados y activos) línea a línea, sin materializarlos."""
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+
+    def iter_events(self, since: Optional[float], until: Optional[float], test: Optional[str]) -> Iterator[Dict]:
+        for path in self._segments():
+            # Poda por segmento: el nombre da la apertura y el mtime la última escritura.
+            if until is not None and _opened_at(path) > until:
+                break
+            if since is not None and path.stat().st_mtime < since:
+                continue
+            for record in iter_segment_records(path):
+                ts = record.get("ts", 0)
+                if since is not None and ts < since:
+                    continue
+                if until is not None and ts >= until:
+                    continue
+                if test and record.get("test") != test:
+                    continue
+                yield record
+
+    def _segments(self):
+        if not self._directory.exists():
+            return []
+        paths = list(self._directory.glob(f"events-*{SEGMENT_SUFFIX}"))
+        paths += self._directory.glob(f"events-*{OPEN_SEGMENT_SUFFIX}")
+        return sorted(paths)
+
+
+def _opened_at(path: Path) -> float:
+    """Apertura del segmento según su nombre `events-<YYYYmmddTHHMMSS>-<pid>-<seq>...` (UTC)."""
+    try:
+        stamp = path.name.split("-")[1]
+        return calendar.timegm(time.strptime(stamp, "%Y%m%dT%H%M%S"))
+    except (IndexError, ValueError):
+        return 0.0
@@ -0,0 +1,123 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from app.application.ports.support_services import MatrixImageRenderer
+from app.domain.services.matrix_generator import GENERATOR_VERSION, OPTION_KEYS, MatrixCell, MatrixItemGenerator
+
+PARTS = ("base",) + OPTION_KEYS
+
+_BG = "#16171D"
+_BORDER = "#2A2D36"
+_INK = "#4A5568"
+_ACCENT = "#3B82F6"
+_CELL = 80
+
+
+class CachedMatrixSvgRenderer(MatrixImageRenderer):
+    """Renderiza SVG de matrices procedurales a demanda, con un LRU acotado en bytes por hash de parámetros."""
+
+    def __init__(self, generator: MatrixItemGenerator, max_bytes: int = 8 * 1024 * 1024) -> None:
+        self._generator = generator
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def etag(self, token: str, part: str) -> str:
+        """Hash de los parámetros: la salida es determinística, así que sirve de ETag sin renderizar."""
+        if part not in PARTS:
+            raise ValueError(f"parte de matriz inválida: {part}")
+        return hashlib.blake2b(f"{GENERATOR_VERSION}|{token}|{part}".encode("utf-8"), digest_size=12).hexdigest()
+
+    def render(self, token: str, part: str) -> Tuple[bytes, str]:
+        key = self.etag(token, part)
+        with self._lock:
+            svg = self._cache.get(key)
+            if svg is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return svg, key
+            self.misses += 1
+        puzzle = self._generator.puzzle(token)
+        if part == "base":
+            svg = _grid_svg(puzzle.grid[:-1]).encode("utf-8")
+        else:
+            svg = _option_svg(puzzle.options[OPTION_KEYS.index(part)]).encode("utf-8")
+        with self._lock:
+            if key not in self._cache and len(svg) <= self._max_bytes:
+                self._cache[key] = svg
+                self._bytes += len(svg)
+                while self._bytes > self._max_bytes:
+                    _, evicted = self._cache.popitem(last=False)
+                    self._bytes -= len(evicted)
+        return svg, key
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+def _grid_svg(cells: Tuple[MatrixCell, ...]) -> str:
+    size = _CELL * 3 + 20
+    parts = [_open(size, size), f'<rect width="{size}" height="{size}" rx="16" fill="{_BG}" stroke="{_BORDER}"/>']
+    for index, cell in enumerate(cells):
+        x, y = 10 + (index % 3) * _CELL, 10 + (index // 3) * _CELL
+        parts.append(
+            f'<rect x="{x + 4}" y="{y + 4}" width="{_CELL - 8}" height="{_CELL - 8}" rx="8" stroke="{_BORDER}"/>'
+        )
+        parts.extend(_cell_shapes(cell, x, y, _INK))
+    x = y = 10 + 2 * _CELL
+    parts.append(
+        f'<rect x="{x + 4}" y="{y + 4}" width="{_CELL - 8}" height="{_CELL - 8}" rx="8" fill="#0F172A" '
+        f'stroke="{_ACCENT}" stroke-width="4"/>'
+        f'<text x="{x + _CELL // 2}" y="{y + _CELL // 2 + 14}" text-anchor="middle" font-size="40" '
+        f'fill="{_ACCENT}" font-family="Arial" font-weight="700">?</text>'
+    )
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _option_svg(cell: MatrixCell) -> str:
+    size = _CELL + 20
+    parts = [_open(size, size), f'<rect width="{size}" height="{size}" rx="12" fill="{_BG}" stroke="{_BORDER}"/>']
+    parts.extend(_cell_shapes(cell, 10, 10, _INK))
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+def _open(width: int, height: int) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" fill="none">'
+    )
+
+
+def _cell_shapes(cell: MatrixCell, x: int, y: int, color: str) -> List[str]:
+    # `count` copias en fila dentro de la celda, cada una rotada sobre su centro.
+    radius = 10 * cell.size if cell.count > 1 else 22 * cell.size
+    step = _CELL / (cell.count + 1)
+    cy = y + _CELL / 2
+    return [
+        _shape(cell.shape, x + step * (i + 1), cy, radius, cell.rotation, color) for i in range(cell.count)
+    ]
+
+
+def _shape(shape: str, cx: float, cy: float, r: float, rotation: int, color: str) -> str:
+    transform = f' transform="rotate({rotation} {cx:.1f} {cy:.1f})"' if rotation else ""
+    style = f'stroke="{color}" stroke-width="4" stroke-linejoin="round"'
+    if shape == "circle":
+        return f'<circle cx="{cx:.1f}" cy="{cy:.1f}" r="{r:.1f}" {style}/>'
+    if shape == "square":
+        return f'<rect x="{cx - r:.1f}" y="{cy - r:.1f}" width="{2 * r:.1f}" height="{2 * r:.1f}" {style}{transform}/>'
+    if shape == "triangle":
+        points = f"{cx:.1f},{cy - r:.1f} {cx + r * 0.87:.1f},{cy + r / 2:.1f} {cx - r * 0.87:.1f},{cy + r / 2:.1f}"
+        return f'<polygon points="{points}" {style}{transform}/>'
+    if shape == "diamond":
+        points = f"{cx:.1f},{cy - r:.1f} {cx + r:.1f},{cy:.1f} {cx:.1f},{cy + r:.1f} {cx - r:.1f},{cy:.1f}"
+        return f'<polygon points="{points}" {style}{transform}/>'
+    path = f"M{cx - r:.1f} {cy:.1f}H{cx + r:.1f}M{cx:.1f} {cy - r:.1f}V{cy + r:.1f}"
+    return f'<path d="{path}" stroke="{color}" stroke-width="5" stroke-linecap="round"{transform}/>'
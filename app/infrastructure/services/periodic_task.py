@@ -0,0 +1,45 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+logger = logging.getLogger("app.tasks")
+
+
+class PeriodicTask:
+    """Ejecuta una función cada `interval_sec` en un hilo daemon, arrancado por proceso.
+
+    Con `once=True` corre una sola vez, `interval_sec` después de arrancar (trabajo de warm-up).
+    """
+
+    def __init__(self, name: str, interval_sec: float, fn: Callable[[], object], once: bool = False) -> None:
+        self._name = name
+        self._interval = interval_sec
+        self._fn = fn
+        self._once = once
+        self._lock = threading.Lock()
+        self._thread = None
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def ensure_started(self) -> None:
+        if self._thread is not None or self._interval <= 0:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+    def _reset_after_fork(self) -> None:
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self._interval)
+            try:
+                self._fn()
+            except Exception as exc:  # una corrida fallida no detiene las siguientes
+                logger.info("%s_error: %s", self._name, exc)
+            if self._once:
+                return
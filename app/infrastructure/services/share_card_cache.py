@@ -0,0 +1,180 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.application.ports.share_repositories import ShareCardCache, ShareCardRenderer
+from app.domain.entities.share_result import ShareResult
+
+logger = logging.getLogger("app.share")
+
+_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+class DiskShareCardCache(ShareCardCache):
+    """Tarjetas OG renderizadas una vez por token en un pool de workers y guardadas en disco.
+
+    El directorio se acota a `max_bytes` desalojando las tarjetas menos usadas; los renders en curso se
+    comparten, así N crawlers pidiendo la misma tarjeta nueva esperan un único render.
+    """
+
+    def __init__(
+        self, renderer: ShareCardRenderer, directory: Path, max_bytes: int = 64 * 1024 * 1024, workers: int = 2
+    ) -> None:
+        self._renderer = renderer
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._workers = workers
+        self._suffix = ".svg" if renderer.media_type == "image/svg+xml" else ".png"
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        # token -> (tamaño, etag) en orden de uso; el contenido vive en disco, acá sólo el tamaño y el ETag.
+        self._index: "OrderedDict[str, Tuple[int, Optional[str]]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.renders = 0
+        self.evictions = 0
+        directory.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+        os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    @property
+    def media_type(self) -> str:
+        return self._renderer.media_type
+
+    def get(self, share_token: str) -> Optional[Tuple[bytes, str]]:
+        if not _TOKEN_RE.match(share_token):
+            return None
+        with self._lock:
+            entry = self._index.get(share_token)
+            if entry is None:
+                return None
+            self._index.move_to_end(share_token)
+        try:
+            card = self._path(share_token).read_bytes()
+        except FileNotFoundError:
+            # Desalojada por otro proceso que comparte el directorio.
+            with self._lock:
+                self._forget(share_token)
+            return None
+        etag = entry[1] or _etag(card)
+        with self._lock:
+            self.hits += 1
+            if share_token in self._index:
+                self._index[share_token] = (len(card), etag)
+        return card, etag
+
+    def prerender(self, share: ShareResult) -> None:
+        self._submit(share)
+
+    def render(self, share: ShareResult) -> Tuple[bytes, str]:
+        for _ in range(2):
+            cached = self.get(share.share_token)
+            if cached is not None:
+                return cached
+            future = self._submit(share)
+            if future is not None:
+                return future.result()
+            # Indexada entre el get y el submit, pero otro worker que comparte el directorio puede haber
+            # borrado el archivo: el próximo get la olvida y la vuelta siguiente la re-encola.
+        # Desalojos concurrentes repetidos: se responde renderizando en línea, sin cachear.
+        card = self._renderer.render(share)
+        return card, _etag(card)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._bytes,
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "renders": self.renders,
+                "evictions": self.evictions,
+            }
+
+    def _submit(self, share: ShareResult) -> Optional[Future]:
+        token = share.share_token
+        if not _TOKEN_RE.match(token):
+            raise ValueError(f"token inválido: {token}")
+        with self._lock:
+            if token in self._index:
+                return None
+            future = self._pending.get(token)
+            if future is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self._workers, thread_name_prefix="share_card")
+                future = self._executor.submit(self._render, share)
+                self._pending[token] = future
+        return future
+
+    def _render(self, share: ShareResult) -> Tuple[bytes, str]:
+        token = share.share_token
+        try:
+            card = self._renderer.render(share)
+            etag = _etag(card)
+            path = self._path(token)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(card)
+            tmp.replace(path)
+            with self._lock:
+                self.renders += 1
+                self._forget(token)
+                self._index[token] = (len(card), etag)
+                self._bytes += len(card)
+                self._evict()
+            return card, etag
+        except Exception as exc:
+            logger.warning("share_card_render_error %s: %s", token, exc)
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(token, None)
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and len(self._index) > 1:
+            token, (size, _) = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                self._path(token).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _forget(self, token: str) -> None:
+        entry = self._index.pop(token, None)
+        if entry is not None:
+            self._bytes -= entry[0]
+
+    def _load_index(self) -> None:
+        # Al arrancar se reconstruye el índice desde el directorio (más viejas primero, para desalojar).
+        files = []
+        for path in self._directory.glob(f"*{self._suffix}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, path.stem, stat.st_size))
+        for _, token, size in sorted(files):
+            if _TOKEN_RE.match(token):
+                self._index[token] = (size, None)
+                self._bytes += size
+        self._evict()
+
+    def _path(self, token: str) -> Path:
+        return self._directory / f"{token}{self._suffix}"
+
+    def _reset_after_fork(self) -> None:
+        # Los hilos del pool no sobreviven al fork: cada worker crea el suyo al primer render.
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.Lock()
+
+
+def _etag(card: bytes) -> str:
+    return hashlib.blake2b(card, digest_size=12).hexdigest()
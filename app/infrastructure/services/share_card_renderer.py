@@ -0,0 +1,69 @@
+import textwrap
+from html import escape
+from typing import List
+
+from app.application.ports.share_repositories import ShareCardRenderer
+from app.domain.entities.share_result import ShareResult
+
+WIDTH = 1200
+HEIGHT = 630
+
+_BG_FROM = "#0B1020"
+_BG_TO = "#1B2550"
+_ACCENT = "#6C7BFF"
+_ACCENT_2 = "#22D3A6"
+_TEXT = "#E9F1FF"
+_MUTED = "#A8B3CC"
+_FONT = "Space Grotesk, Arial, sans-serif"
+
+
+class SvgShareCardRenderer(ShareCardRenderer):
+    """Tarjeta Open Graph 1200x630 en SVG: nombre del test, perfil y puntaje."""
+
+    media_type = "image/svg+xml"
+
+    def render(self, share: ShareResult) -> bytes:
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+            f'viewBox="0 0 {WIDTH} {HEIGHT}">',
+            '<defs><linearGradient id="bg" x1="0" y1="0" x2="1" y2="1">'
+            f'<stop offset="0" stop-color="{_BG_FROM}"/><stop offset="1" stop-color="{_BG_TO}"/>'
+            "</linearGradient></defs>",
+            f'<rect width="{WIDTH}" height="{HEIGHT}" fill="url(#bg)"/>',
+            f'<rect x="64" y="64" width="72" height="72" rx="20" fill="{_ACCENT}"/>',
+            f'<text x="100" y="112" text-anchor="middle" font-family="{_FONT}" font-size="30" font-weight="700" '
+            f'fill="{_BG_FROM}">MA</text>',
+            _text(160, 110, share.test_title, 34, _MUTED),
+        ]
+        y = 250
+        for line in _wrap(share.title, 28):
+            parts.append(_text(64, y, line, 64, _TEXT, weight=700))
+            y += 78
+        if share.summary:
+            for line in _wrap(share.summary, 60):
+                parts.append(_text(64, y + 10, line, 30, _MUTED))
+                y += 42
+        if share.score is not None:
+            parts.append(
+                f'<rect x="64" y="{HEIGHT - 150}" width="300" height="86" rx="18" fill="none" '
+                f'stroke="{_ACCENT_2}" stroke-width="3"/>'
+            )
+            parts.append(_text(92, HEIGHT - 94, f"Puntaje {share.score:g}", 38, _ACCENT_2, weight=700))
+        parts.append(_text(WIDTH - 64, HEIGHT - 90, "Micro-Advisor", 30, _MUTED, anchor="end"))
+        parts.append("</svg>")
+        return "".join(parts).encode("utf-8")
+
+
+def _wrap(text: str, width: int) -> List[str]:
+    lines = textwrap.wrap(text, width)
+    if len(lines) > 2:
+        lines = lines[:2]
+        lines[1] = lines[1][: width - 1].rstrip() + "…"
+    return lines
+
+
+def _text(x: int, y: int, text: str, size: int, color: str, weight: int = 500, anchor: str = "start") -> str:
+    return (
+        f'<text x="{x}" y="{y}" text-anchor="{anchor}" font-family="{_FONT}" font-size="{size}" '
+        f'font-weight="{weight}" fill="{color}">{escape(text)}</text>'
+    )
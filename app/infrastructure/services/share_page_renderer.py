@@ -0,0 +1,31 @@
+from html import escape
+from pathlib import Path
+from string import Template
+
+from app.application.ports.share_repositories import SharePageRenderer
+from app.application.services.result_sharer import CARD_SUFFIX, SHARE_PATH
+from app.domain.entities.share_result import ShareResult
+
+
+class TemplateSharePageRenderer(SharePageRenderer):
+    """Página pública estática de un resultado: plantilla HTML (`$campo`) leída una vez y valores escapados."""
+
+    def __init__(self, template_path: Path, base_url: str = "") -> None:
+        self._template = Template(template_path.read_text(encoding="utf-8"))
+        # Los crawlers (og:url, og:image) necesitan URLs absolutas.
+        self._base_url = base_url.rstrip("/")
+
+    def render(self, share: ShareResult) -> bytes:
+        score = "" if share.score is None else f"Puntaje: {share.score:g}"
+        description = share.summary or share.title
+        html = self._template.substitute(
+            test_title=escape(share.test_title),
+            title=escape(share.title),
+            summary=escape(share.summary or ""),
+            description=escape(description),
+            score=escape(score),
+            recommendations="".join(f"<li>{escape(text)}</li>" for text in share.recommendations),
+            share_url=escape(self._base_url + SHARE_PATH + share.share_token),
+            card_url=escape(self._base_url + SHARE_PATH + share.share_token + CARD_SUFFIX),
+        )
+        return html.encode("utf-8")
@@ -0,0 +1,82 @@
+import hashlib
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from app.application.ports.share_repositories import SharePageStore
+
+logger = logging.getLogger("app.share")
+
+_TOKEN_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+
+class CachedSharePageStore(SharePageStore):
+    """Páginas compartidas ya renderizadas: LRU acotado en bytes y, si hay directorio, copia en disco.
+
+    Con disco, una página desalojada del LRU (o de otro worker/proceso) se relee del archivo sin renderizar.
+    """
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = 16 * 1024 * 1024) -> None:
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, share_token: str) -> Optional[Tuple[bytes, str]]:
+        if not _TOKEN_RE.match(share_token):
+            return None
+        with self._lock:
+            entry = self._cache.get(share_token)
+            if entry is not None:
+                self._cache.move_to_end(share_token)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        if self._directory is None:
+            return None
+        try:
+            page = (self._directory / f"{share_token}.html").read_bytes()
+        except FileNotFoundError:
+            return None
+        return page, self._remember(share_token, page)
+
+    def put(self, share_token: str, page: bytes) -> str:
+        if not _TOKEN_RE.match(share_token):
+            raise ValueError(f"token inválido: {share_token}")
+        if self._directory is not None:
+            path = self._directory / f"{share_token}.html"
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            try:
+                tmp.write_bytes(page)
+                tmp.replace(path)
+            except OSError as exc:
+                # Sin disco la página sigue en memoria; sólo se pierde la copia persistente.
+                logger.warning("share_page_write_error %s: %s", share_token, exc)
+        return self._remember(share_token, page)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._cache), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+    def _remember(self, share_token: str, page: bytes) -> str:
+        etag = hashlib.blake2b(page, digest_size=12).hexdigest()
+        with self._lock:
+            previous = self._cache.pop(share_token, None)
+            if previous is not None:
+                self._bytes -= len(previous[0])
+            if len(page) <= self._max_bytes:
+                self._cache[share_token] = (page, etag)
+                self._bytes += len(page)
+                while self._bytes > self._max_bytes:
+                    _, (evicted, _) = self._cache.popitem(last=False)
+                    self._bytes -= len(evicted)
+        return etag
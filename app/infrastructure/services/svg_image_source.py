@@ -0,0 +1,29 @@
+import re
+from pathlib import Path
+from typing import Optional
+
+from app.application.ports.support_services import ImageSource, MatrixImageRenderer
+
+_MATRIX_URL_RE = re.compile(r"^/api/matrix/([\w-]+)/(\w+)\.svg$")
+
+
+class SvgImageSource(ImageSource):
+    """Resuelve URLs de imágenes de ítems: `/static/...` desde el frontend y `/api/matrix/...` con el renderer."""
+
+    def __init__(self, static_dir: Path, matrix_renderer: MatrixImageRenderer) -> None:
+        self._static_dir = static_dir.resolve()
+        self._matrix_renderer = matrix_renderer
+
+    def load(self, url: str) -> Optional[bytes]:
+        if url.startswith("/static/"):
+            path = (self._static_dir / url[len("/static/"):]).resolve()
+            if self._static_dir not in path.parents or path.suffix != ".svg" or not path.is_file():
+                return None
+            return path.read_bytes()
+        match = _MATRIX_URL_RE.match(url)
+        if match:
+            try:
+                return self._matrix_renderer.render(match.group(1), match.group(2))[0]
+            except ValueError:
+                return None
+        return None
@@ -0,0 +1,37 @@
+"""Export en streaming de sesiones, respuestas o resultados: `python -m app.interfaces.cli.export`."""
+
+import argparse
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+from app.application.use_cases.data_export import DATASETS, FORMATS, ExportSessionDataUseCase, export_window
+from app.infrastructure.services.journal_event_source import JournalEventSource
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exporta eventos del journal como CSV o NDJSON.")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--journal-dir", default=os.getenv("EVENT_JOURNAL_DIR", "journal"))
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="YYYY-MM-DD (UTC, inclusivo)")
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="YYYY-MM-DD (UTC, inclusivo)")
+    parser.add_argument("--test", help="slug del test, p. ej. iq-general")
+    parser.add_argument("--output", help="archivo de salida (default: stdout)")
+    args = parser.parse_args()
+
+    use_case = ExportSessionDataUseCase(JournalEventSource(Path(args.journal_dir)))
+    since, until = export_window(args.date_from, args.date_to)
+    chunks = use_case.execute(args.dataset, args.format, since, until, args.test)
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
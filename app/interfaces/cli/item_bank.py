@@ -0,0 +1,29 @@
+"""Banco de ítems en archivo: `python -m app.interfaces.cli.item_bank {export,check} PATH`."""
+
+import argparse
+import json
+from pathlib import Path
+
+from app.iq_items import get_item_pool
+from app.infrastructure.providers.file_iq_item_provider import load_item_bank, write_item_bank
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Exporta o valida bancos de ítems IQ (JSON o SQLite).")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="escribe los ítems de app/iq_items.py (punto de partida del banco)")
+    export.add_argument("path", type=Path, help=".json, o .sqlite/.db para SQLite")
+    export.add_argument("--version", required=True, help="versión del banco, p. ej. 2026-10-19")
+    check = sub.add_parser("check", help="compila el banco como lo haría el servidor, sin publicarlo")
+    check.add_argument("path", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        write_item_bank(args.path, args.version, get_item_pool())
+    bank = load_item_bank(args.path)
+    counts = {str(d): len(items) for d, items in bank.by_difficulty.items()}
+    print(json.dumps({"version": bank.version, "items": len(bank.items), "by_difficulty": counts}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""Rollup diario incremental del journal: `python -m app.interfaces.cli.rollup`."""
+
+import argparse
+import json
+import logging
+import os
+from pathlib import Path
+
+from app.infrastructure.repositories.daily_rollup_sinks import JsonFileDailyRollupSink, PostgresDailyRollupSink
+from app.infrastructure.services.daily_rollup import DailyRollupJob
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Agrega eventos del journal en analytics_daily*.")
+    parser.add_argument("--journal-dir", default=os.getenv("EVENT_JOURNAL_DIR", "journal"))
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"), help="upsert en Postgres")
+    parser.add_argument("--output", help="sin BD: archivo JSON con los agregados")
+    parser.add_argument("--checkpoint", help="default: <journal-dir>/.rollup-checkpoint.json")
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    journal_dir = Path(args.journal_dir)
+    if args.output:
+        sink = JsonFileDailyRollupSink(Path(args.output))
+    elif args.database_url:
+        sink = PostgresDailyRollupSink(args.database_url)
+    else:
+        parser.error("indicar --database-url (o DATABASE_URL) o --output")
+    checkpoint = Path(args.checkpoint) if args.checkpoint else journal_dir / ".rollup-checkpoint.json"
+    job = DailyRollupJob(journal_dir, sink, checkpoint, chunk_size=args.chunk_size)
+    print(json.dumps(job.run()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+"""Reporte de costo de arranque: `python -m app.interfaces.cli.startup_report [--warm]`."""
+
+import argparse
+import json
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mide import y wiring del contenedor.")
+    parser.add_argument("--warm", action="store_true", help="construye todos los casos de uso y mide cada componente")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    from app.main import app  # el import es justamente lo que se mide
+
+    report = {"app_import_ms": round((time.perf_counter() - started) * 1000, 3)}
+    container = app.extensions["container"]
+    if args.warm:
+        started = time.perf_counter()
+        container.warm_up()
+        report["warm_up_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    report.update(container.startup_report())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List
 
 from app.domain.entities.iq_item import IqItem
 
@@ -339,32 +339,40 @@ MATRIX_VISUAL_ITEMS = [
 
 def get_item_pool() -> List[IqItem]:
     """Devuelve el pool fijo de ítems (sistemas lógicos + matrices visuales)."""
-    items: List[IqItem] = []
-    for spec in SYSTEM_ITEMS:
-        items.append(
-            IqItem(
-                item_id=spec["id"],
-                domain="system-logic",
-                difficulty=spec["difficulty"],
-                prompt=spec["prompt"],
-                options=spec["options"],
-                correct=spec["correct"],
-                difficulty_b=BETA_BY_DIFFICULTY.get(spec["difficulty"], 0.0),
-                t_ref=TREF_BY_DIFFICULTY.get(spec["difficulty"], 10.0),
-            )
-        )
-    for spec in MATRIX_VISUAL_ITEMS:
-        items.append(
-            IqItem(
-                item_id=spec["id"],
-                domain="matrix-visual",
-                difficulty=spec["difficulty"],
-                prompt=spec["prompt"],
-                options=spec["options"],
-                correct=spec["correct"],
-                visual=spec.get("visual"),
-                difficulty_b=BETA_BY_DIFFICULTY.get(spec["difficulty"], 0.0),
-                t_ref=TREF_BY_DIFFICULTY.get(spec["difficulty"], 10.0),
-            )
-        )
+    items = [item_from_spec({**spec, "domain": "system-logic"}) for spec in SYSTEM_ITEMS]
+    items += [item_from_spec({**spec, "domain": "matrix-visual"}) for spec in MATRIX_VISUAL_ITEMS]
     return items
+
+
+def item_from_spec(spec: Dict[str, Any]) -> IqItem:
+    """Construye un ítem desde su forma serializada (la de los archivos del banco)."""
+    difficulty = int(spec["difficulty"])
+    difficulty_b = spec.get("difficulty_b")
+    t_ref = spec.get("t_ref")
+    return IqItem(
+        item_id=spec["id"],
+        domain=spec["domain"],
+        difficulty=difficulty,
+        prompt=spec["prompt"],
+        options=spec["options"],
+        correct=spec["correct"],
+        visual=spec.get("visual"),
+        difficulty_b=BETA_BY_DIFFICULTY.get(difficulty, 0.0) if difficulty_b is None else float(difficulty_b),
+        t_ref=TREF_BY_DIFFICULTY.get(difficulty, 10.0) if t_ref is None else float(t_ref),
+    )
+
+
+def item_to_spec(item: IqItem) -> Dict[str, Any]:
+    spec = {
+        "id": item.item_id,
+        "domain": item.domain,
+        "difficulty": item.difficulty,
+        "prompt": item.prompt,
+        "options": item.options,
+        "correct": item.correct,
+        "difficulty_b": item.difficulty_b,
+        "t_ref": item.t_ref,
+    }
+    if item.visual is not None:
+        spec["visual"] = item.visual
+    return spec
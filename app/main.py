@@ -1,12 +1,26 @@
+import gc
+import hashlib
 import logging
+import os
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
 
-from flask import Flask, Response, jsonify, request, send_from_directory
+from flask import Flask, Response, g, jsonify, request, send_from_directory, stream_with_context
 
+from app.application.use_cases.data_export import DATASETS, FORMATS, export_window
 from app.container import AppContainer
 from app.domain.entities.iq_answer import IqAnswer
-from app.domain.exceptions import SessionNotFoundError
+from app.domain.exceptions import (
+    InvalidAnswerError,
+    ItemNotFoundError,
+    QuestionnaireDefinitionError,
+    QuestionnaireNotFoundError,
+    SessionNotFoundError,
+    ShareNotFoundError,
+)
+from app.domain.value_objects.test_catalog import IQ_TEST_SLUG, TEST_SLUGS
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 FRONTEND_DIR = BASE_DIR / "Frontend"
@@ -18,6 +32,10 @@ NO_CACHE_HEADERS = {
     "Expires": "0",
 }
 
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+BULK_START_MAX = 200
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("app")
 
@@ -45,10 +63,91 @@ def _get_int_query(
     return value, None
 
 
+def _get_test_query(
+    is_questionnaire: Callable[[str], bool]
+) -> Tuple[Optional[str], Optional[int], Optional[Response]]:
+    """`?test=<slug>&version=<n>` de las rutas de analytics (default: IQ, todas las versiones).
+
+    Acepta los tests fijos y los cuestionarios publicados, que registran en el mismo repositorio de analytics.
+    """
+    test = request.args.get("test", IQ_TEST_SLUG)
+    if test not in TEST_SLUGS and not is_questionnaire(test):
+        return None, None, _validation_error(
+            "test", f"value must be one of {', '.join(TEST_SLUGS)} or a published questionnaire", "value_error.enum"
+        )
+    if "version" not in request.args:
+        return test, None, None
+    version, error = _get_int_query("version", 1, min_value=1)
+    return test, version, error
+
+
+def _get_date_query(param: str) -> Tuple[Optional[date], Optional[Response]]:
+    raw_value = request.args.get(param)
+    if not raw_value:
+        return None, None
+    try:
+        return date.fromisoformat(raw_value), None
+    except ValueError:
+        return None, _validation_error(param, "value is not a valid date (YYYY-MM-DD)", "type_error.date")
+
+
+def _attribution() -> Tuple[Optional[str], Optional[str]]:
+    """Fuente y campaña del inicio de sesión (`source`/`campaign` o sus variantes utm_*)."""
+    source = request.args.get("source") or request.args.get("utm_source")
+    campaign = request.args.get("campaign") or request.args.get("utm_campaign")
+    return (source[:64] if source else None), (campaign[:64] if campaign else None)
+
+
+def _visitor_key() -> Optional[str]:
+    """Hash de IP + User-Agent (como `sessions.ip_hash`/`user_agent_hash`); nunca se guarda el dato crudo."""
+    ip = request.remote_addr or ""
+    user_agent = request.headers.get("User-Agent", "")
+    if not ip and not user_agent:
+        return None
+    salt = os.getenv("VISITOR_HASH_SALT", "")
+    return hashlib.sha256(f"{salt}|{ip}|{user_agent}".encode("utf-8")).hexdigest()
+
+
 def create_app(container: AppContainer | None = None) -> Flask:
     """AppFactory principal que configura Flask y DI."""
     container = container or AppContainer()
     flask_app = Flask(__name__, static_folder=None)
+    flask_app.extensions["container"] = container
+    # Preload (p.ej. `gunicorn --preload`): todo lo inmutable se arma en el master y se comparte por COW.
+    preload = os.getenv("APP_PRELOAD", "0") == "1"
+    views: Dict[str, bytes] = {}
+    if preload:
+        report = container.preload()
+        views = {path.name: path.read_bytes() for path in FRONTEND_DIR.glob("*.html")}
+        logger.info("preload_ready built=%s build_ms=%s", report["built"], report["build_ms"])
+    metrics = container.metrics
+    profiler = container.profiler
+    tracer = container.tracer
+
+    @flask_app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        container.start_background_tasks()
+        if profiler.enabled:
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            g.profile_handle = profiler.begin(route, request.path, request.headers.get("X-Profile"))
+        if tracer.enabled:
+            g.trace_handle = tracer.begin(f"{request.method} {request.path}", "http")
+
+    @flask_app.after_request
+    def record_request_metrics(response: Response):
+        profiler.end(g.pop("profile_handle", None))
+        tracer.end(g.pop("trace_handle", None))
+        started = g.pop("request_started", None)
+        if started is not None:
+            # Se usa la regla (/static/<path:filename>) para acotar la cardinalidad.
+            route = request.url_rule.rule if request.url_rule else "unmatched"
+            labels = (("route", route), ("method", request.method))
+            metrics.inc("http_requests_total", labels + (("status", str(response.status_code)),))
+            if response.status_code >= 500:
+                metrics.inc("http_request_errors_total", labels)
+            metrics.observe("http_request_duration_seconds", labels, time.perf_counter() - started)
+        return response
 
     @flask_app.after_request
     def no_cache_static_headers(response: Response):
@@ -58,8 +157,12 @@ def create_app(container: AppContainer | None = None) -> Flask:
 
     def _render_view(filename: str):
         try:
-            html_path = FRONTEND_DIR / filename
-            html = html_path.read_text(encoding="utf-8")
+            html = views.get(filename)
+            if html is None:
+                html = (FRONTEND_DIR / filename).read_bytes()
+                # Se lee una vez por proceso; en debug se relee para ver los cambios sin reiniciar.
+                if not flask_app.debug:
+                    views[filename] = html
             return Response(html, mimetype="text/html", headers=NO_CACHE_HEADERS)
         except Exception as exc:  # burbujea y loguea en capa externa
             logger.info("view_error_%s: %s", filename, exc)
@@ -81,6 +184,36 @@ def create_app(container: AppContainer | None = None) -> Flask:
     def resultado_view():
         return _render_view("resultado.html")
 
+    @flask_app.get("/r/<token>")
+    def share_view(token: str):
+        # Página estática ya renderizada al finalizar: no toca sesiones ni recalcula nada.
+        try:
+            page, etag = container.get_share_page().execute(token, request.headers.get("If-None-Match"))
+        except ShareNotFoundError:
+            return jsonify(error="not_found"), 404
+        except Exception as exc:
+            logger.info("share_view_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+        headers = {"ETag": f'"{etag}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if page is None:
+            return Response(status=304, headers=headers)
+        return Response(page, mimetype="text/html", headers=headers)
+
+    @flask_app.get("/r/<token>/card")
+    def share_card(token: str):
+        # Imagen OG: se renderiza una vez por token en el pool y después se sirve desde disco.
+        try:
+            card, etag = container.get_share_card().execute(token, request.headers.get("If-None-Match"))
+        except ShareNotFoundError:
+            return jsonify(error="not_found"), 404
+        except Exception as exc:
+            logger.info("share_card_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+        headers = {"ETag": f'"{etag}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if card is None:
+            return Response(status=304, headers=headers)
+        return Response(card, mimetype=container.share_cards.media_type, headers=headers)
+
     @flask_app.get("/analitica")
     def analitica_view():
         return _render_view("analitica.html")
@@ -99,6 +232,37 @@ def create_app(container: AppContainer | None = None) -> Flask:
         response.headers.update(NO_CACHE_HEADERS)
         return response
 
+    @flask_app.get("/api/matrix/<token>/<part>.svg")
+    def matrix_svg(token: str, part: str):
+        try:
+            svg, etag = container.get_matrix_svg().execute(token, part, request.headers.get("If-None-Match"))
+        except ValueError:
+            return jsonify(error="not_found"), 404
+        except Exception as exc:
+            logger.info("matrix_svg_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+        # El token fija el contenido: cacheable para siempre (CDN / navegador).
+        headers = {"ETag": f'"{etag}"', "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        if svg is None:
+            return Response(status=304, headers=headers)
+        return Response(svg, mimetype="image/svg+xml", headers=headers)
+
+    @flask_app.get("/api/iq/sprite/<item_id>.svg")
+    def item_sprite(item_id: str):
+        try:
+            svg, etag = container.get_item_sprite().execute(item_id, request.headers.get("If-None-Match"))
+        except ItemNotFoundError:
+            return jsonify(error="not_found"), 404
+        except Exception as exc:
+            logger.info("item_sprite_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+        # Inmutable sólo si el cliente pidió esta versión (`?v=<etag>` del payload del bloque).
+        cache_control = IMMUTABLE_CACHE_CONTROL if request.args.get("v") == etag else "no-cache"
+        headers = {"ETag": f'"{etag}"', "Cache-Control": cache_control}
+        if svg is None:
+            return Response(status=304, headers=headers)
+        return Response(svg, mimetype="image/svg+xml", headers=headers)
+
     @flask_app.get("/health")
     def health():
         try:
@@ -107,6 +271,14 @@ def create_app(container: AppContainer | None = None) -> Flask:
             logger.info("health_error: %s", exc)
             return jsonify(error="internal_error"), 500
 
+    @flask_app.get("/metrics")
+    def metrics_endpoint():
+        try:
+            return Response(metrics.render(), mimetype="text/plain; version=0.0.4", headers=NO_CACHE_HEADERS)
+        except Exception as exc:
+            logger.info("metrics_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
     @flask_app.get("/db-check")
     def db_check():
         try:
@@ -126,21 +298,38 @@ def create_app(container: AppContainer | None = None) -> Flask:
     @flask_app.get("/api/analytics/summary")
     def analytics_summary():
         days, error = _get_int_query("days", 7, min_value=1, max_value=365)
+        if error:
+            return error
+        test, version, error = _get_test_query(container.questionnaire_catalog.is_published)
         if error:
             return error
         try:
-            return container.get_analytics_summary().execute(days)
+            return container.get_analytics_summary().execute(days, test=test, version=version)
         except Exception as exc:
             logger.info("analytics_summary_error: %s", exc)
             return jsonify(error="internal_error"), 500
 
+    @flask_app.get("/api/analytics/tests")
+    def analytics_tests():
+        days, error = _get_int_query("days", 7, min_value=1, max_value=365)
+        if error:
+            return error
+        try:
+            return container.get_analytics_tests().execute(days)
+        except Exception as exc:
+            logger.info("analytics_tests_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
     @flask_app.get("/api/analytics/funnel")
     def analytics_funnel():
         days, error = _get_int_query("days", 7, min_value=1, max_value=365)
+        if error:
+            return error
+        test, version, error = _get_test_query(container.questionnaire_catalog.is_published)
         if error:
             return error
         try:
-            return container.get_analytics_funnel().execute(days)
+            return container.get_analytics_funnel().execute(days, test=test, version=version)
         except Exception as exc:
             logger.info("analytics_funnel_error: %s", exc)
             return jsonify(error="internal_error"), 500
@@ -148,14 +337,52 @@ def create_app(container: AppContainer | None = None) -> Flask:
     @flask_app.get("/api/analytics/profiles")
     def analytics_profiles():
         days, error = _get_int_query("days", 7, min_value=1, max_value=365)
+        if error:
+            return error
+        test, version, error = _get_test_query(container.questionnaire_catalog.is_published)
         if error:
             return error
         try:
-            return container.get_analytics_profiles().execute(days)
+            return container.get_analytics_profiles().execute(days, test=test, version=version)
         except Exception as exc:
             logger.info("analytics_profiles_error: %s", exc)
             return jsonify(error="internal_error"), 500
 
+    @flask_app.get("/api/analytics/quantiles")
+    def analytics_quantiles():
+        days, error = _get_int_query("days", 7, min_value=1, max_value=365)
+        if error:
+            return error
+        try:
+            return container.get_analytics_quantiles().execute(days)
+        except Exception as exc:
+            logger.info("analytics_quantiles_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
+    @flask_app.get("/api/analytics/items")
+    def analytics_items():
+        days, error = _get_int_query("days", 7, min_value=1, max_value=365)
+        if error:
+            return error
+        try:
+            return container.get_analytics_items().execute(days)
+        except Exception as exc:
+            logger.info("analytics_items_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
+    @flask_app.get("/api/analytics/visitors")
+    def analytics_visitors():
+        days, error = _get_int_query("days", 7, min_value=1, max_value=365)
+        if error:
+            return error
+        try:
+            return container.get_analytics_visitors().execute(
+                days, test=request.args.get("test"), campaign=request.args.get("campaign")
+            )
+        except Exception as exc:
+            logger.info("analytics_visitors_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
     @flask_app.get("/api/analytics/dropoff")
     def analytics_dropoff():
         days, error = _get_int_query("days", 7, min_value=1, max_value=365)
@@ -167,17 +394,66 @@ def create_app(container: AppContainer | None = None) -> Flask:
             logger.info("analytics_dropoff_error: %s", exc)
             return jsonify(error="internal_error"), 500
 
+    @flask_app.get("/api/export/<dataset>")
+    def export_data(dataset: str):
+        if dataset not in DATASETS:
+            return jsonify(error="unknown_dataset", datasets=sorted(DATASETS)), 404
+        fmt = request.args.get("format", "csv")
+        if fmt not in FORMATS:
+            return _validation_error("format", f"value must be one of {', '.join(FORMATS)}", "value_error.enum")
+        date_from, error = _get_date_query("from")
+        if error:
+            return error
+        date_to, error = _get_date_query("to")
+        if error:
+            return error
+        if not container.journal_dir:
+            return jsonify(error="export_disabled"), 503
+        since, until = export_window(date_from, date_to)
+        try:
+            chunks = container.get_export_data().execute(dataset, fmt, since, until, request.args.get("test"))
+        except Exception as exc:
+            logger.info("export_data_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+        mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+        filename = f"{dataset}.{fmt}"
+        return Response(
+            stream_with_context(chunks),
+            mimetype=mimetype,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"', **NO_CACHE_HEADERS},
+        )
+
     @flask_app.post("/api/iq/start")
     def iq_start():
         block_size, error = _get_int_query("block_size", 3, min_value=1, max_value=3)
         if error:
             return error
         try:
-            return container.get_start_iq().execute(block_size=block_size)
+            source, campaign = _attribution()
+            return container.get_start_iq().execute(
+                block_size=block_size, source=source, campaign=campaign, visitor=_visitor_key()
+            )
         except Exception as exc:
             logger.info("iq_start_error: %s", exc)
             return jsonify(error="internal_error"), 500
 
+    @flask_app.post("/api/iq/bulk-start")
+    def iq_bulk_start():
+        count, error = _get_int_query("count", 30, min_value=1, max_value=BULK_START_MAX)
+        if error:
+            return error
+        block_size, error = _get_int_query("block_size", 3, min_value=1, max_value=3)
+        if error:
+            return error
+        try:
+            source, campaign = _attribution()
+            return container.get_start_iq().execute_bulk(
+                count=count, block_size=block_size, source=source, campaign=campaign, visitor=_visitor_key()
+            )
+        except Exception as exc:
+            logger.info("iq_bulk_start_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
     @flask_app.post("/api/iq/answer")
     def iq_answer():
         try:
@@ -231,11 +507,26 @@ def create_app(container: AppContainer | None = None) -> Flask:
     @flask_app.post("/api/stroop/start")
     def stroop_start():
         try:
-            return container.get_stroop_start().execute()
+            source, campaign = _attribution()
+            return container.get_stroop_start().execute(source=source, campaign=campaign, visitor=_visitor_key())
         except Exception as exc:
             logger.info("stroop_start_error: %s", exc)
             return jsonify(error="internal_error"), 500
 
+    @flask_app.post("/api/stroop/bulk-start")
+    def stroop_bulk_start():
+        count, error = _get_int_query("count", 30, min_value=1, max_value=BULK_START_MAX)
+        if error:
+            return error
+        try:
+            source, campaign = _attribution()
+            return container.get_stroop_start().execute_bulk(
+                count=count, source=source, campaign=campaign, visitor=_visitor_key()
+            )
+        except Exception as exc:
+            logger.info("stroop_bulk_start_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
     @flask_app.post("/api/stroop/answer")
     def stroop_answer():
         try:
@@ -270,7 +561,14 @@ def create_app(container: AppContainer | None = None) -> Flask:
         if error:
             return error
         try:
-            return container.get_mixed_start().execute(iq_count=iq_count, stroop_count=stroop_count)
+            source, campaign = _attribution()
+            return container.get_mixed_start().execute(
+                iq_count=iq_count,
+                stroop_count=stroop_count,
+                source=source,
+                campaign=campaign,
+                visitor=_visitor_key(),
+            )
         except Exception as exc:
             logger.info("mixed_start_error: %s", exc)
             return jsonify(error="internal_error"), 500
@@ -298,6 +596,70 @@ def create_app(container: AppContainer | None = None) -> Flask:
             logger.info("mixed_finish_error: %s", exc)
             return jsonify(error="internal_error"), 500
 
+    # Cuestionarios definidos por datos
+    @flask_app.get("/api/q")
+    def questionnaire_list():
+        try:
+            return container.get_questionnaire_list().execute()
+        except Exception as exc:
+            logger.info("questionnaire_list_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
+    @flask_app.post("/api/q/<slug>/start")
+    def questionnaire_start(slug: str):
+        version = None
+        if "version" in request.args:
+            version, error = _get_int_query("version", 1, min_value=1)
+            if error:
+                return error
+        try:
+            source, campaign = _attribution()
+            return container.get_questionnaire_start().execute(
+                slug, version=version, source=source, campaign=campaign, visitor=_visitor_key()
+            )
+        except QuestionnaireNotFoundError:
+            return jsonify(error="not_found"), 404
+        except QuestionnaireDefinitionError as exc:
+            logger.warning("questionnaire_definition_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+        except Exception as exc:
+            logger.info("questionnaire_start_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
+    @flask_app.post("/api/q/answer")
+    def questionnaire_answer():
+        try:
+            payload = request.get_json(silent=True) or {}
+            session_id = payload.get("session_id")
+            return container.get_questionnaire_answer().execute(
+                session_id=session_id, option_id=payload.get("option_id")
+            )
+        except SessionNotFoundError:
+            return jsonify(error="invalid_session"), 400
+        except InvalidAnswerError as exc:
+            return jsonify(error="invalid_option", detail=str(exc)), 422
+        except Exception as exc:
+            logger.info("questionnaire_answer_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
+    @flask_app.post("/api/q/finish")
+    def questionnaire_finish():
+        try:
+            payload = request.get_json(silent=True) or {}
+            session_id = payload.get("session_id")
+            resp, status = container.get_questionnaire_finish().execute(session_id=session_id)
+            return resp, status
+        except SessionNotFoundError:
+            return jsonify(error="invalid_session"), 400
+        except Exception as exc:
+            logger.info("questionnaire_finish_error: %s", exc)
+            return jsonify(error="internal_error"), 500
+
+    if preload:
+        # Mueve los objetos vivos a la generación permanente: el GC no los recorre
+        # (ni toca sus refcounts/headers), así las páginas siguen compartidas tras el fork.
+        gc.collect()
+        gc.freeze()
     return flask_app
 
 
@@ -0,0 +1,38 @@
+import pytest
+
+
+@pytest.fixture
+def container(app_client):
+    return app_client.application.extensions["container"]
+
+
+def test_iq_bulk_start_shares_the_first_block(app_client, container):
+    reply = app_client.post("/api/iq/bulk-start?count=4&block_size=2&source=aula").get_json()
+    assert len(set(reply["session_ids"])) == 4 and len(reply["block"]) == 2
+    block_ids = [item["item_id"] for item in reply["block"]]
+    sessions = [container.session_repo.get(session_id) for session_id in reply["session_ids"]]
+    assert all(session.used_items == block_ids and session.source == "aula" for session in sessions)
+    # Cada sesión es independiente aunque compartan el bloque inicial.
+    assert len({id(session.used_items) for session in sessions}) == 4
+    answers = [{"item_id": item_id, "answer": "x", "seconds": 4} for item_id in block_ids]
+    app_client.post("/api/iq/answer", json={"session_id": reply["session_ids"][0], "answers": answers})
+    assert sessions[0].answers_count == 2 and sessions[1].answers_count == 0
+    assert container.analytics_repo.get_stats("iq-general").starts == 4
+
+
+def test_stroop_bulk_start_gives_each_session_a_pending_trial(app_client, container):
+    reply = app_client.post("/api/stroop/bulk-start?count=30").get_json()
+    assert len({entry["session_id"] for entry in reply["sessions"]}) == 30
+    for entry in reply["sessions"]:
+        pending = container.stroop_repo.get_pending_trial(entry["session_id"])
+        assert (pending.word, pending.ink) == (entry["trial"]["word"], entry["trial"]["ink"])
+    first = reply["sessions"][0]["session_id"]
+    answer = app_client.post("/api/stroop/answer", json={"session_id": first, "answer": "rojo", "rt_ms": 600})
+    assert answer.status_code == 200
+    assert container.analytics_repo.get_stats("stroop-wcst").starts == 30
+
+
+@pytest.mark.parametrize("path", ["/api/iq/bulk-start", "/api/stroop/bulk-start"])
+@pytest.mark.parametrize("count", ["0", "201", "muchos"])
+def test_bulk_start_validates_count(app_client, path, count):
+    assert app_client.post(f"{path}?count={count}").status_code == 422
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from datetime import date
+
+import pytest
+
+from app.application.use_cases.data_export import ExportSessionDataUseCase, export_window
+
+
+class _Source:
+    def __init__(self, records):
+        self.records = records
+        self.calls = []
+
+    def iter_events(self, since, until, test):
+        self.calls.append((since, until, test))
+        return iter(self.records)
+
+
+RECORDS = [
+    {"ts": 1.0, "test": "iq-general", "version": 1, "event": "start", "session_id": "a", "source": "qr"},
+    {"ts": 2.0, "test": "iq-general", "version": 1, "event": "answer", "session_id": "a", "item_id": "X",
+     "correct": True, "seconds": 4.2},
+    {"ts": 3.0, "test": "iq-general", "version": 1, "event": "finish", "session_id": "a", "score": 71,
+     "profile": {"code": "alto"}},
+]
+
+
+def test_csv_uses_dataset_columns_and_events():
+    export = ExportSessionDataUseCase(_Source(RECORDS))
+    rows = list(csv.DictReader(io.StringIO("".join(export.execute("sessions", "csv")))))
+    assert [row["event"] for row in rows] == ["start", "finish"]
+    assert rows[0]["source"] == "qr" and rows[0]["duration_sec"] == ""
+
+    results = list(csv.DictReader(io.StringIO("".join(export.execute("results", "csv")))))
+    assert len(results) == 1
+    assert json.loads(results[0]["profile"]) == {"code": "alto"}
+
+
+def test_ndjson_keeps_whole_records():
+    export = ExportSessionDataUseCase(_Source(RECORDS))
+    lines = "".join(export.execute("answers", "ndjson")).splitlines()
+    assert [json.loads(line) for line in lines] == [RECORDS[1]]
+
+
+@pytest.mark.parametrize("fmt", ["csv", "ndjson"])
+def test_large_exports_stream_in_chunks(fmt):
+    records = [dict(RECORDS[1], session_id=f"s{n}") for n in range(5_000)]
+    chunks = list(ExportSessionDataUseCase(_Source(records)).execute("answers", fmt))
+    assert len(chunks) > 1
+    assert all(len(chunk) < 2 * 64 * 1024 for chunk in chunks)
+    lines = "".join(chunks).splitlines()
+    assert len(lines) == 5_000 + (fmt == "csv")
+
+
+def test_rejects_unknown_dataset_or_format():
+    export = ExportSessionDataUseCase(_Source([]))
+    with pytest.raises(ValueError):
+        export.execute("visitors", "csv")
+    with pytest.raises(ValueError):
+        export.execute("answers", "xlsx")
+
+
+def test_export_window_is_inclusive_utc_days():
+    since, until = export_window(date(2026, 1, 1), date(2026, 1, 2))
+    assert (since, until) == (1767225600.0, 1767225600.0 + 2 * 86400)
+    assert export_window(None, None) == (None, None)
@@ -0,0 +1,119 @@
+import xml.etree.ElementTree as ET
+from urllib.parse import unquote
+
+import pytest
+
+from app.application.services.iq_item_serializer import IqItemSerializer
+from app.application.services.matrix_image_bundler import MatrixImageBundler, minify_svg
+from app.domain.entities.iq_item import IqItem
+from app.domain.value_objects.test_config import DEFAULT_IQ_CONFIG
+from app.infrastructure.services.svg_image_source import SvgImageSource
+
+SVG = "{http://www.w3.org/2000/svg}"
+
+
+def _svg(width, height, label):
+    return (
+        '<?xml version="1.0"?>\n<!-- fuente -->\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">\n'
+        f'  <rect width="{width}" height="{height}" />\n  <text>{label}</text>\n</svg>\n'
+    ).encode("utf-8")
+
+
+class _Source:
+    def __init__(self):
+        self.loads = []
+        self.images = {"/img/base.svg": _svg(260, 260, "base"), "/img/a.svg": _svg(100, 100, "a"),
+                       "/img/b.svg": _svg(100, 80, "b")}
+
+    def load(self, url):
+        self.loads.append(url)
+        return self.images.get(url)
+
+
+ITEM = IqItem(
+    item_id="V 1",
+    domain="matrices",
+    difficulty=3,
+    prompt="?",
+    options=[{"value": "a", "image": "/img/a.svg"}, {"value": "b", "image": "/img/b.svg"},
+             {"value": "c", "image": "/img/falta.svg"}],
+    correct="a",
+    visual={"base": {"src": "/img/base.svg", "alt": "grilla"}},
+)
+
+
+def test_minify_strips_prolog_comments_and_whitespace():
+    svg = minify_svg(_svg(10, 10, "x").decode())
+    assert svg == ('<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10">'
+                   '<rect width="10" height="10"/><text>x</text></svg>')
+
+
+def test_url_mode_keeps_the_item_as_is():
+    assert MatrixImageBundler(_Source()).bundle(ITEM) == (ITEM.visual, ITEM.options)
+
+
+def test_inline_mode_embeds_minified_data_uris():
+    source = _Source()
+    bundler = MatrixImageBundler(source, mode="inline")
+    visual, options = bundler.bundle(ITEM)
+    assert visual["base"]["alt"] == "grilla"
+    uri = options[0]["image"]
+    assert uri.startswith("data:image/svg+xml,")
+    expected = minify_svg(source.images["/img/a.svg"].decode()).replace('"', "'")
+    assert unquote(uri[len("data:image/svg+xml,"):]) == expected
+    # Imagen inexistente: queda la URL original.
+    assert options[2]["image"] == "/img/falta.svg" and options[2]["value"] == "c"
+    bundler.bundle(ITEM)
+    assert len(source.loads) == 4  # minificado una vez por URL
+
+
+def test_sprite_mode_stacks_parts_with_one_view_each():
+    bundler = MatrixImageBundler(_Source(), mode="sprite")
+    visual, options = bundler.bundle(ITEM)
+    sprite, etag = bundler.sprite(ITEM)
+    assert visual["base"]["src"] == f"/api/iq/sprite/V%201.svg?v={etag}#base"
+    assert [option["image"] for option in options[:2]] == [
+        f"/api/iq/sprite/V%201.svg?v={etag}#o0", f"/api/iq/sprite/V%201.svg?v={etag}#o1"
+    ]
+    root = ET.fromstring(sprite)
+    views = {view.get("id"): view.get("viewBox") for view in root.iter(f"{SVG}view")}
+    assert views == {"base": "0 0 260 260", "o0": "0 260 100 100", "o1": "0 360 100 80"}
+    assert (root.get("width"), root.get("height")) == ("260", "440")
+    assert bundler.sprite(ITEM)[0] is sprite
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        MatrixImageBundler(_Source(), mode="base64")
+
+
+def test_serializer_caches_per_item_and_time_limit():
+    serializer = IqItemSerializer(MatrixImageBundler(_Source(), mode="inline"))
+    payload = serializer.serialize(ITEM, DEFAULT_IQ_CONFIG)
+    assert serializer.serialize(ITEM, DEFAULT_IQ_CONFIG) is payload
+    assert payload["time_limit"] == DEFAULT_IQ_CONFIG.time_limits[3]
+    # Un ítem recargado con el mismo id no reutiliza el payload viejo.
+    reloaded = IqItem(**{**ITEM.__dict__, "prompt": "nuevo"})
+    assert serializer.serialize(reloaded, DEFAULT_IQ_CONFIG)["prompt"] == "nuevo"
+
+
+def test_svg_source_stays_inside_the_static_dir(tmp_path):
+    (tmp_path / "static").mkdir()
+    (tmp_path / "static" / "m.svg").write_bytes(b"<svg/>")
+    (tmp_path / "secreto.svg").write_bytes(b"<svg/>")
+    source = SvgImageSource(tmp_path / "static", matrix_renderer=None)
+    assert source.load("/static/m.svg") == b"<svg/>"
+    assert source.load("/static/../secreto.svg") is None
+    assert source.load("/otra/m.svg") is None
+
+
+def test_sprite_route_serves_matrix_items(make_client):
+    client = make_client(PROCEDURAL_MATRIX_ITEMS="5", MATRIX_IMAGE_MODE="sprite")
+    bank = client.application.extensions["container"].item_provider.get_bank()
+    item = next(item for item in bank.items if item.item_id.startswith("PM-"))
+    response = client.get(f"/api/iq/sprite/{item.item_id}.svg")
+    assert response.status_code == 200 and response.mimetype == "image/svg+xml"
+    etag = response.headers["ETag"].strip('"')
+    assert client.get(f"/api/iq/sprite/{item.item_id}.svg?v={etag}").headers["Cache-Control"].startswith("public")
+    assert client.get("/api/iq/sprite/no-existe.svg").status_code == 404
@@ -0,0 +1,26 @@
+def _answer(client, session_id, option_id):
+    return client.post("/api/q/answer", json={"session_id": session_id, "option_id": option_id}).get_json()
+
+
+def test_flujo_completo_por_http(app_client):
+    listed = app_client.get("/api/q").get_json()
+    assert "perfil-ahorrista" in [test["slug"] for test in listed["tests"]]
+
+    start = app_client.post("/api/q/perfil-ahorrista/start").get_json()
+    session_id = start["session_id"]
+    assert start["question"]["question_id"] == 1
+
+    assert app_client.post("/api/q/finish", json={"session_id": session_id}).status_code == 409
+    bad = app_client.post("/api/q/answer", json={"session_id": session_id, "option_id": 99})
+    assert bad.status_code == 422 and bad.get_json()["error"] == "invalid_option"
+
+    answers = [_answer(app_client, session_id, option_id) for option_id in (11, 23, 31, None, 51)]
+    assert [answer["done"] for answer in answers] == [False, False, False, False, True]
+
+    result = app_client.post("/api/q/finish", json={"session_id": session_id}).get_json()
+    assert result["profile_code"] == "ahorrista" and result["score"] == 11
+    # Repetir el finish devuelve el mismo resultado.
+    assert app_client.post("/api/q/finish", json={"session_id": session_id}).get_json() == result
+
+    assert app_client.post("/api/q/nope/start").status_code == 404
+    assert app_client.post("/api/q/answer", json={"session_id": "nope", "option_id": 11}).status_code == 400
@@ -0,0 +1,59 @@
+import pytest
+
+from app.application.use_cases.session_reaper import AbandonIdleSessionsUseCase
+from app.domain.entities.iq_session import IqSession
+from app.infrastructure.repositories import idle_tracker
+from app.infrastructure.repositories.in_memory_session_repository import InMemoryIqSessionRepository
+
+
+class _Journal:
+    def __init__(self):
+        self.events = []
+
+    def record(self, test, version, event, session_id, data=None):
+        self.events.append((test, event, session_id, data))
+
+
+def _session(session_id, answers=0, result=None):
+    return IqSession(
+        session_id=session_id,
+        started_at=0.0,
+        difficulty=1,
+        score=0.0,
+        answers_count=answers,
+        used_items=[],
+        n_items=20,
+        block_size=5,
+        scoring_mode=2,
+        finished=result is not None,
+        result=result,
+    )
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(idle_tracker.time, "time", lambda: now[0])
+    return now
+
+
+def test_reaper_journals_abandons_and_keeps_finished_results(clock):
+    repo = InMemoryIqSessionRepository()
+    journal = _Journal()
+    repo.save(_session("idle", answers=3))
+    repo.save(_session("done", answers=20, result={"score": 40}))
+    clock[0] += 500
+    repo.save(_session("active", answers=1))
+    clock[0] += 200
+
+    reaper = AbandonIdleSessionsUseCase([("iq-general", repo)], journal, max_idle_sec=600)
+    assert reaper.execute() == {"iq-general": 1}
+    assert [(e[1], e[2], e[3]["answers"]) for e in journal.events] == [("abandon", "idle", 3)]
+    assert repo.get("idle") is None
+    # El resultado cacheado es la única copia: la sesión finalizada sigue disponible.
+    assert repo.get("done").result == {"score": 40}
+    assert repo.get("active") is not None
+
+    clock[0] += 10_000
+    assert reaper.execute() == {"iq-general": 1}
+    assert repo.get("done") is not None and repo.count() == 1
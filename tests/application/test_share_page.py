@@ -0,0 +1,58 @@
+from app.application.services.result_sharer import ResultSharer
+from app.infrastructure.repositories.share_result_repository import InMemoryShareResultRepository
+from app.infrastructure.services.share_page_store import CachedSharePageStore
+
+
+class _CountingRenderer:
+    def __init__(self):
+        self.calls = 0
+
+    def render(self, share):
+        self.calls += 1
+        return f"<h1>{share.title}</h1>".encode("utf-8")
+
+
+def _finish_questionnaire(client):
+    session_id = client.post("/api/q/perfil-ahorrista/start").get_json()["session_id"]
+    for option_id in (13, 32, 53):
+        client.post("/api/q/answer", json={"session_id": session_id, "option_id": option_id})
+    return client.post("/api/q/finish", json={"session_id": session_id}).get_json()
+
+
+def test_share_emite_token_y_renderiza_una_vez():
+    repo, renderer, store = InMemoryShareResultRepository(), _CountingRenderer(), CachedSharePageStore()
+    sharer = ResultSharer(repo, renderer, store)
+    shared = sharer.share("s1", "perfil-ahorrista", 1, "Perfil", profile_code="x" * 40, title="Gastador")
+    token = shared["share_token"]
+    assert shared["share_url"] == f"/r/{token}"
+    # profile_code se recorta al VARCHAR(20) de share_results.
+    assert repo.get(token).profile_code == "x" * 20
+    assert store.get(token)[0] == b"<h1>Gastador</h1>"
+    assert renderer.calls == 1
+    assert sharer.share("s2", "perfil-ahorrista", 1, "Perfil", None, "Otro")["share_token"] != token
+
+
+def test_pagina_publica_con_etag(app_client):
+    result = _finish_questionnaire(app_client)
+    page = app_client.get(result["share_url"])
+    assert page.status_code == 200 and page.mimetype == "text/html"
+    html = page.get_data(as_text=True)
+    assert "Gastador" in html and f'{result["share_url"]}/card' in html
+    assert "immutable" in page.headers["Cache-Control"]
+
+    cached = app_client.get(result["share_url"], headers={"If-None-Match": page.headers["ETag"]})
+    assert cached.status_code == 304
+    assert app_client.get("/r/inexistente123").status_code == 404
+
+
+def test_pagina_desalojada_se_re_renderiza_desde_la_fila(app_client):
+    result = _finish_questionnaire(app_client)
+    container = app_client.application.extensions["container"]
+    before = app_client.get(result["share_url"])
+    # Sin cache ni archivo: la página sale de share_results, no de la sesión.
+    container.share_store._cache.clear()
+    for path in container.share_store._directory.iterdir():
+        path.unlink()
+    after = app_client.get(result["share_url"])
+    assert after.status_code == 200 and after.get_data() == before.get_data()
+    assert after.headers["ETag"] == before.headers["ETag"]
@@ -0,0 +1,19 @@
+import pytest
+
+from app.application.use_cases.stroop_finish import FinishStroopUseCase
+
+
+@pytest.mark.parametrize(
+    "flexibility, impulse_control, stroop_control, expected",
+    [
+        (1.0, 1.0, 1.0, "estable"),
+        (0.6, 0.7, 0.7, "estable"),  # el umbral pertenece al rango alto
+        (0.59, 0.1, 0.1, "baja-flexibilidad"),  # la flexibilidad tiene prioridad
+        (0.9, 0.69, 0.1, "impulsivo"),
+        (0.9, 0.9, 0.69, "interferencia"),
+    ],
+)
+def test_profile_by_priority(flexibility, impulse_control, stroop_control, expected):
+    metrics = {"flexibility": flexibility, "impulse_control": impulse_control, "stroop_control": stroop_control}
+    code, _ = FinishStroopUseCase._profile(FinishStroopUseCase.__new__(FinishStroopUseCase), metrics)
+    assert code == expected
@@ -0,0 +1,53 @@
+import pytest
+
+from app.application.use_cases.analytics import GetAnalyticsSummaryUseCase, GetAnalyticsTestsUseCase
+from app.infrastructure.repositories.in_memory_analytics_repository import InMemoryTestAnalyticsRepository
+from app.infrastructure.repositories.in_memory_quantile_repository import InMemoryQuantileSketchRepository
+
+
+@pytest.fixture
+def repo():
+    repo = InMemoryTestAnalyticsRepository(profile_labels={"iq-general": ("bajo", "medio", "alto")})
+    for version, (duration, profile, score) in ((1, (100, "alto", 82)), (2, (60, "medio", 51))):
+        repo.record("iq-general", version, "start")
+        repo.record("iq-general", version, "finish", duration_sec=duration, profile=profile, score=score)
+    repo.record("iq-general", 2, "start")
+    repo.record("stroop-wcst", 1, "start")
+    repo.record("stroop-wcst", 1, "finish", duration_sec=40, profile="flexible", score=73.5)
+    return repo
+
+
+def test_stats_per_version_and_merged(repo):
+    v2 = repo.get_stats("iq-general", 2)
+    assert (v2.starts, v2.finishes, v2.avg_time_sec) == (2, 1, 60)
+    merged = repo.get_stats("iq-general")
+    assert (merged.starts, merged.finishes, merged.finish_rate, merged.mean_score) == (3, 2, 2 / 3, 66.5)
+    # Las bandas conocidas aparecen con 0 aunque no haya datos.
+    assert merged.profiles == {"bajo": 0, "medio": 1, "alto": 1}
+    assert repo.get_stats("iq-general", 9).profiles == {"bajo": 0, "medio": 0, "alto": 0}
+
+
+def test_stats_are_copies(repo):
+    repo.get_stats("iq-general", 1).profiles["alto"] = 99
+    assert repo.get_stats("iq-general", 1).profiles["alto"] == 1
+
+
+def test_tests_side_by_side(repo):
+    tests = {t["test"]: t for t in GetAnalyticsTestsUseCase(repo).execute(7)["tests"]}
+    assert set(tests) == {"iq-general", "stroop-wcst"}
+    assert tests["stroop-wcst"]["finish_rate"] == 100.0 and tests["stroop-wcst"]["mean_score"] == 73.5
+    assert tests["iq-general"]["scores"] == {"bucket": 5, "labels": [50, 80], "values": [1, 1]}
+
+
+def test_summary_per_test(repo):
+    summary = GetAnalyticsSummaryUseCase(repo, InMemoryQuantileSketchRepository()).execute(7, test="stroop-wcst")
+    assert summary["active_tests"] == 2
+    assert (summary["finish_rate"], summary["avg_time_sec"], summary["time_sec_p50"]) == (100.0, 40, None)
+
+
+@pytest.mark.parametrize(
+    "test, status",
+    [("iq-general", 200), ("stroop-wcst", 200), ("perfil-ahorrista", 200), ("no-existe", 422)],
+)
+def test_route_accepts_fixed_tests_and_published_questionnaires(app_client, test, status):
+    assert app_client.get(f"/api/analytics/summary?test={test}").status_code == status
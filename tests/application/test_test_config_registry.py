@@ -0,0 +1,45 @@
+import pytest
+
+from app.application.services import test_config_registry
+from app.domain.exceptions import InvalidTestConfigError
+from app.domain.value_objects.test_config import DEFAULT_IQ_CONFIG
+
+# Se importa el módulo y no la clase: pytest intentaría recolectar `TestConfigRegistry` como tests.
+Registry = test_config_registry.TestConfigRegistry
+
+
+class _Source:
+    def __init__(self, configs, published=None):
+        self.configs = configs
+        self.published = published
+        self.loads = 0
+
+    def published_version(self, slug):
+        return self.published
+
+    def load(self, slug, version):
+        self.loads += 1
+        config = self.configs.get(version)
+        return None if config is None else {"slug": slug, "version": version, "config_json": config}
+
+
+def test_config_se_compila_una_vez_por_version():
+    source = _Source({2: {"iq": {"n_items": 12}}}, published=2)
+    registry = Registry(source)
+    config = registry.current("iq-general")
+    assert config.version == 2 and config.iq.n_items == 12
+    assert registry.get("iq-general", 2) is config
+    assert source.loads == 1
+    # Una versión sin fila usa los defaults.
+    assert registry.get("iq-general", 1).iq == DEFAULT_IQ_CONFIG
+
+
+def test_sin_fuente_usa_la_version_por_defecto():
+    config = Registry().current("stroop")
+    assert config.version == 1 and config.iq == DEFAULT_IQ_CONFIG
+
+
+def test_config_invalida():
+    registry = Registry(_Source({3: {"iq": {"n_items": 0}}}))
+    with pytest.raises(InvalidTestConfigError, match="iq-general v3"):
+        registry.get("iq-general", 3)
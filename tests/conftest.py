@@ -0,0 +1,29 @@
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    """Fábrica de apps Flask con un container nuevo; todo lo que escribe en disco va a `tmp_path`."""
+
+    def make(**env):
+        monkeypatch.setenv("QUESTIONNAIRE_DIR", str(REPO_DIR / "questionnaires"))
+        monkeypatch.setenv("SHARE_CARD_DIR", str(tmp_path / "cards"))
+        monkeypatch.setenv("SHARE_PAGE_DIR", str(tmp_path / "pages"))
+        monkeypatch.delenv("EVENT_JOURNAL_DIR", raising=False)
+        monkeypatch.delenv("ITEM_BANK_PATH", raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        from app.main import create_app
+
+        return create_app().test_client()
+
+    return make
+
+
+@pytest.fixture
+def app_client(make_client):
+    return make_client()
@@ -0,0 +1,41 @@
+import pytest
+
+from app.domain.services.hyperloglog import HyperLogLog
+
+
+def _filled(values, precision=12):
+    sketch = HyperLogLog(precision)
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+@pytest.mark.parametrize("distinct", [50, 1_000, 20_000, 100_000])
+def test_estimate_error(distinct):
+    sketch = _filled(f"visitor-{i}" for i in range(distinct))
+    # Error estándar 1.04 / sqrt(4096) ~ 1.6%: 4 sigmas de margen.
+    assert sketch.estimate() == pytest.approx(distinct, rel=0.065)
+
+
+def test_duplicates_do_not_count():
+    sketch = _filled(f"visitor-{i % 500}" for i in range(20_000))
+    assert sketch.estimate() == pytest.approx(500, rel=0.05)
+
+
+def test_merge_is_union():
+    a = _filled(f"v-{i}" for i in range(0, 30_000))
+    b = _filled(f"v-{i}" for i in range(20_000, 50_000))
+    union = _filled(f"v-{i}" for i in range(0, 50_000))
+    a.merge(b)
+    assert a.to_dict() == union.to_dict()
+    assert a.estimate() == pytest.approx(50_000, rel=0.065)
+
+
+def test_merge_rejects_different_precision():
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+
+
+def test_round_trip():
+    sketch = _filled(str(i) for i in range(3_000))
+    assert HyperLogLog.from_dict(sketch.to_dict()).estimate() == sketch.estimate()
@@ -0,0 +1,49 @@
+import pytest
+
+from app.domain.value_objects.interval_table import IntervalTable
+
+
+@pytest.fixture
+def profiles():
+    return IntervalTable.build([(9, 20, "ahorrista"), (0, 3, "gastador"), (4, 8, "en-camino")])
+
+
+@pytest.mark.parametrize(
+    "score, expected",
+    [
+        (-1, None),
+        (0, "gastador"),
+        (3, "gastador"),
+        (3.5, "gastador"),  # fraccionario entre rangos enteros: cae en el inferior
+        (4, "en-camino"),
+        (8, "en-camino"),
+        (9, "ahorrista"),
+        (20, "ahorrista"),
+        (20.5, None),
+    ],
+)
+def test_integer_ranges(profiles, score, expected):
+    assert profiles.resolve(score) == expected
+
+
+def test_continuous_cut_belongs_to_upper_range():
+    table = IntervalTable.build([(0.0, 0.6, "baja"), (0.6, 1.0, None)], step=0)
+    assert table.resolve(0.5999) == "baja"
+    assert table.resolve(0.6) is None
+    assert table.resolve(1.0) is None
+    assert table.resolve(-0.1) is None
+
+
+@pytest.mark.parametrize(
+    "ranges, message",
+    [
+        ([], "vacía"),
+        ([(5, 3, "x")], "inválido"),
+        ([(0, 5, "a"), (5, 9, "b")], "superpone"),
+        ([(0, 3, "a"), (5, 9, "b")], "hueco"),
+        ([(0, float("inf"), "a"), (10, 20, "b")], "superpone"),
+    ],
+)
+def test_build_rejects_invalid_ranges(ranges, message):
+    with pytest.raises(ValueError, match=message):
+        IntervalTable.build(ranges)
@@ -0,0 +1,87 @@
+import random
+from collections import Counter
+from dataclasses import replace
+
+import pytest
+
+from app.domain.entities.iq_answer import IqAnswer
+from app.domain.entities.iq_item import IqItem
+from app.domain.entities.iq_session import IqSession
+from app.domain.services.iq_scoring_modes import IqScoringModesService, parse_cohorts
+from app.domain.value_objects.test_config import DEFAULT_SCORING_PARAMS
+
+PARAMS = DEFAULT_SCORING_PARAMS
+
+
+def _session(mode):
+    return IqSession(
+        session_id="s",
+        started_at=0.0,
+        difficulty=1,
+        score=0.0,
+        answers_count=0,
+        used_items=[],
+        n_items=20,
+        block_size=5,
+        scoring_mode=mode,
+    )
+
+
+def _run(service, mode, seed=3):
+    rng = random.Random(seed)
+    session = _session(mode)
+    for n in range(20):
+        difficulty = rng.randint(1, 5)
+        item = IqItem(f"I{n}", "logica", difficulty, "?", ["a", "b"], "a", difficulty_b=(difficulty - 3) * 0.8)
+        seconds = rng.choice([0, 1.5, 6, 20])
+        answer = IqAnswer(item.item_id, rng.choice("ab"), seconds=seconds, changes=rng.randint(0, 1))
+        service.process_answer(session, item, answer, PARAMS)
+    return session
+
+
+def test_parse_cohorts_ignores_invalid_entries():
+    assert parse_cohorts("2:90,1:10") == {2: 90, 1: 10}
+    assert parse_cohorts("0,3:5,x:1,1:0,1:abc,2:4") == {0: 1, 2: 4}
+    assert parse_cohorts("") == {}
+
+
+def test_cohort_assignment_is_stable_and_weighted():
+    service = IqScoringModesService()
+    assert service.assign_mode("any") == 2
+    service.set_cohorts({2: 80, 0: 20})
+    modes = [service.assign_mode(f"session-{n}") for n in range(5_000)]
+    assert modes == [service.assign_mode(f"session-{n}") for n in range(5_000)]
+    counts = Counter(modes)
+    assert set(counts) == {0, 2}
+    assert counts[0] / 5_000 == pytest.approx(0.2, abs=0.03)
+
+
+def test_shadow_pass_matches_dedicated_runs():
+    shadow = IqScoringModesService(shadow=True)
+    session = _run(shadow, mode=2)
+    alternatives = shadow.shadow_scores(session, PARAMS)
+    assert set(alternatives) == {0, 1}
+    plain = IqScoringModesService()
+    for mode in (0, 1, 2):
+        expected = plain.finalize_scores(_run(plain, mode), PARAMS)
+        got = alternatives[mode] if mode != 2 else shadow.finalize_scores(session, PARAMS)
+        assert got == pytest.approx(expected)
+
+
+def test_without_shadow_only_the_session_mode_is_tracked():
+    service = IqScoringModesService()
+    session = _run(service, mode=2)
+    assert (session.simple_corrects, session.weighted_total) == (0, 0.0)
+    assert service.shadow_scores(session, PARAMS) == {}
+    counters = _run(service, mode=0)
+    assert counters.theta == 0.0 and counters.answers_count == 20
+
+
+def test_finalize_uses_version_params():
+    service = IqScoringModesService()
+    session = _run(service, mode=2)
+    wide = replace(PARAMS, theta_scale=PARAMS.theta_scale * 4)
+    assert session.theta != 0
+    narrow_score = service.finalize_scores(session, PARAMS)["score"]
+    wide_score = service.finalize_scores(session, wide)["score"]
+    assert abs(wide_score - 50) < abs(narrow_score - 50)
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from app.domain.entities.iq_item import IqItem
+from app.domain.services.iq_logic import IqSelectorService
+from app.domain.services.item_exposure import SympsonHetterExposure
+from app.domain.value_objects.item_bank import ItemBank
+
+
+def _window(exposure, selections, sessions):
+    rng = random.Random(0)
+    for item_id, count in selections.items():
+        for _ in range(count):
+            exposure.admit(item_id, rng)
+    exposure.record([], new_sessions=sessions)
+
+
+def test_admits_everything_before_calibration():
+    exposure = SympsonHetterExposure(max_rate=0.2, min_sessions=10)
+    rng = random.Random(1)
+    assert all(exposure.admit("A", rng) for _ in range(100))
+
+
+def test_recalibrate_waits_for_min_sessions():
+    exposure = SympsonHetterExposure(max_rate=0.2, min_sessions=100)
+    _window(exposure, {"A": 90}, sessions=99)
+    assert exposure.recalibrate() == 0
+    assert exposure.rates() == {}
+
+
+def test_disabled_when_max_rate_is_one():
+    exposure = SympsonHetterExposure(max_rate=1.0, min_sessions=1)
+    _window(exposure, {"A": 100}, sessions=100)
+    assert not exposure.enabled
+    assert exposure.recalibrate() == 0
+
+
+def test_k_caps_selection_rate():
+    exposure = SympsonHetterExposure(max_rate=0.25, min_sessions=100)
+    _window(exposure, {"A": 100, "B": 50, "C": 10}, sessions=100)
+    assert exposure.recalibrate() == 2
+    rng = random.Random(42)
+    draws = 20_000
+    admitted = {item: sum(exposure.admit(item, rng) for _ in range(draws)) / draws for item in ("A", "B", "C")}
+    # K_A = 0.25 / 1.0, K_B = 0.25 / 0.5, C por debajo del tope no se restringe.
+    assert admitted["A"] == pytest.approx(0.25, abs=0.02)
+    assert admitted["B"] == pytest.approx(0.5, abs=0.02)
+    assert admitted["C"] == 1.0
+
+
+def test_unselected_item_keeps_previous_k():
+    exposure = SympsonHetterExposure(max_rate=0.25, min_sessions=10)
+    _window(exposure, {"A": 10}, sessions=10)
+    exposure.recalibrate()
+    _window(exposure, {"B": 1}, sessions=10)
+    assert exposure.recalibrate() == 1
+    rng = random.Random(5)
+    assert sum(exposure.admit("A", rng) for _ in range(10_000)) / 10_000 == pytest.approx(0.25, abs=0.02)
+
+
+def test_rates_follow_recorded_administrations():
+    exposure = SympsonHetterExposure(max_rate=0.5, min_sessions=1)
+    exposure.record(["A", "B"], new_sessions=4, copies=4)
+    exposure.record(["A"], new_sessions=0)
+    rates = exposure.rates()
+    assert rates["A"]["exposure_rate"] == pytest.approx(5 / 4)
+    assert rates["B"] == {"exposure_rate": 1.0, "k": 1.0}
+
+
+def _calibrated(hot_ids):
+    # Ítems "hot" elegidos en todas las sesiones de la ventana: K = 0.2 / 1.0.
+    exposure = SympsonHetterExposure(max_rate=0.2, min_sessions=10)
+    _window(exposure, {item_id: 10 for item_id in hot_ids}, sessions=10)
+    exposure.recalibrate()
+    return exposure
+
+
+@pytest.mark.parametrize("max_draws", [0, IqSelectorService.MAX_DRAWS_PER_ITEM])
+def test_exposure_control_holds_when_the_pool_runs_low(max_draws):
+    hot = [f"H{n}" for n in range(4)]
+    cold = [f"C{n}" for n in range(4)]
+    items = [IqItem(item_id, "logica", 3, "?", ["a", "b"], "a") for item_id in hot + cold]
+    filler = [IqItem(f"F{n}", "logica", 3, "?", ["a", "b"], "a") for n in range(8)]
+    bank = ItemBank.build("v1", items + filler)
+    selector = IqSelectorService(_calibrated(hot), random.Random(42))
+    selector.MAX_DRAWS_PER_ITEM = max_draws  # 0: todo el bloque sale del recorrido de respaldo
+    used = [item.item_id for item in filler]  # quedan 8 de 16 en el bucket
+
+    blocks = 4_000
+    counts = {item_id: 0 for item_id in hot + cold}
+    for _ in range(blocks):
+        for item in selector.select_block(bank, 3, used, 4):
+            counts[item.item_id] += 1
+    # Sin control, cada uno de los 8 restantes saldría en la mitad de los bloques.
+    for item_id in hot:
+        assert counts[item_id] / blocks < 0.2
+    for item_id in cold:
+        assert counts[item_id] / blocks > 0.8
+    # Orden aleatorio: los hot rechazados que completan el bloque se reparten parejo.
+    assert max(counts[i] for i in hot) - min(counts[i] for i in hot) < 0.05 * blocks
+
+
+def test_rejected_items_complete_the_block_as_last_resort():
+    hot = [f"H{n}" for n in range(4)]
+    bank = ItemBank.build("v1", [IqItem(item_id, "logica", 3, "?", ["a", "b"], "a") for item_id in hot])
+    selector = IqSelectorService(_calibrated(hot), random.Random(7))
+    assert sorted(item.item_id for item in selector.select_block(bank, 3, [], 4)) == hot
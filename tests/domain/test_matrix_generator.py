@@ -0,0 +1,65 @@
+import pytest
+
+from app.domain.services.matrix_generator import (
+    ATTRIBUTES,
+    MATRIX_DOMAIN,
+    OPTION_KEYS,
+    RULES_BY_DIFFICULTY,
+    MatrixItemGenerator,
+)
+
+generator = MatrixItemGenerator()
+TOKENS = [generator.token(difficulty, seed) for difficulty in RULES_BY_DIFFICULTY for seed in range(1, 41)]
+
+
+def _follows_rules(grid, rules):
+    """Atributo con regla: 3 valores por fila y cada fila es la primera corrida `s` lugares por fila
+    (nivel = a*col + b*fila + c mod 3). Atributo sin regla: constante en toda la grilla."""
+    for attr in ATTRIBUTES:
+        values = [getattr(cell, attr) for cell in grid]
+        if attr not in rules:
+            if len(set(values)) != 1:
+                return False
+            continue
+        first = values[:3]
+        if len(set(first)) != 3:
+            return False
+        shifts = [s for s in range(3) if all(
+            values[row * 3 + col] == first[(col + s * row) % 3] for row in range(3) for col in range(3)
+        )]
+        if not shifts:
+            return False
+    return True
+
+
+@pytest.mark.parametrize("token", TOKENS)
+def test_exactly_one_option_completes_the_grid(token):
+    puzzle = generator.puzzle(token)
+    assert _follows_rules(puzzle.grid, puzzle.rules)
+    assert len(set(puzzle.options)) == len(OPTION_KEYS)
+    completing = [key for key, option in zip(OPTION_KEYS, puzzle.options)
+                  if _follows_rules(puzzle.grid[:-1] + (option,), puzzle.rules)]
+    assert completing == [puzzle.correct]
+
+
+def test_same_token_same_puzzle():
+    token = generator.token(4, 123)
+    assert generator.puzzle(token) == MatrixItemGenerator().puzzle(token)
+    assert generator.puzzle(token) != generator.puzzle(generator.token(4, 124))
+
+
+@pytest.mark.parametrize("token", ["m1-d6-s1", "m1-d3-sx", "m0-d3-s1", "m1-d3-s1/../x", "m1-d3-s1234567890"])
+def test_rejects_invalid_tokens(token):
+    with pytest.raises(ValueError):
+        generator.puzzle(token)
+
+
+def test_items_cover_every_difficulty_and_point_to_their_images():
+    items = generator.items(10)
+    assert [item.difficulty for item in items] == [1, 2, 3, 4, 5] * 2
+    item = items[0]
+    token = item.item_id[len("PM-"):]
+    assert item.domain == MATRIX_DOMAIN
+    assert item.visual["base"]["src"] == f"/api/matrix/{token}/base.svg"
+    assert [option["image"] for option in item.options] == [f"/api/matrix/{token}/{k}.svg" for k in OPTION_KEYS]
+    assert item.correct == f"{token}-{generator.puzzle(token).correct}"
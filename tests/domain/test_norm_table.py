@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from app.application.use_cases.norms_rebuild import RebuildNormTablesUseCase
+from app.domain.value_objects.norm_table import NormTable, normal_percentile, percentile_rank
+from app.infrastructure.repositories.in_memory_norm_repository import InMemoryNormRepository
+
+
+def test_percentile_uses_mid_rank():
+    table = NormTable.build([3.0, 1.0, 2.0, 2.0, 4.0], built_at=0)
+    assert table.thetas == (1.0, 2.0, 2.0, 3.0, 4.0)
+    assert table.percentile(0.0) == 0.0
+    assert table.percentile(1.0) == 10.0
+    assert table.percentile(2.0) == 40.0  # los empates cuentan la mitad
+    assert table.percentile(2.5) == 60.0
+    assert table.percentile(9.0) == 100.0
+
+
+def test_empirical_tracks_the_normal_with_a_large_sample():
+    rng = random.Random(39)
+    table = NormTable.build((rng.gauss(0, 1) for _ in range(20_000)), built_at=0)
+    for theta in (-2, -1, 0, 0.5, 1.5):
+        assert table.percentile(theta) == pytest.approx(normal_percentile(theta), abs=1.0)
+
+
+def test_percentile_rank_falls_back_to_the_normal():
+    small = NormTable.build([0.0] * 10, built_at=0)
+    assert percentile_rank(None, 0.0, min_size=1) == (50.0, "normal")
+    assert percentile_rank(small, 1.0, min_size=11) == (pytest.approx(84.13, abs=0.01), "normal")
+    assert percentile_rank(small, 1.0, min_size=10) == (100.0, "empirical")
+
+
+def test_reservoir_keeps_a_bounded_uniform_sample():
+    repo = InMemoryNormRepository(max_samples=1_000)
+    repo._random.seed(1)
+    for n in range(20_000):
+        repo.add_sample("iq:2", float(n))
+    samples = repo.samples()["iq:2"]
+    assert len(samples) == 1_000
+    # Cada resultado histórico tiene la misma probabilidad: la media de la muestra ~ la de 0..19999.
+    assert sum(samples) / len(samples) == pytest.approx(10_000, rel=0.06)
+
+
+def test_rebuild_publishes_one_table_per_norm_key():
+    repo = InMemoryNormRepository()
+    for theta in (0.5, -0.5, 1.0):
+        repo.add_sample("iq-general:mode-2", theta)
+    repo.add_sample("iq-general:mode-0", 0.0)
+    assert RebuildNormTablesUseCase(repo).execute() == {"iq-general:mode-2": 3, "iq-general:mode-0": 1}
+    assert repo.get_table("iq-general:mode-2").thetas == (-0.5, 0.5, 1.0)
+
+
+def _finish_iq(client, complete):
+    session_id = client.post("/api/iq/start", json={}).get_json()["session_id"]
+    if complete:
+        # El banco estático se agota antes de n_items si siempre se falla: se marca la sesión como completa.
+        session = client.application.extensions["container"].session_repo.get(session_id)
+        session.answers_count = session.n_items
+    return client.post("/api/iq/finish", json={"session_id": session_id}).get_json()
+
+
+def test_only_completed_sessions_feed_the_norms(app_client):
+    norm_repo = app_client.application.extensions["container"].norm_repo
+    early = _finish_iq(app_client, complete=False)
+    assert early["percentile_source"] == "normal"
+    assert not any(norm_repo.samples().values())
+    _finish_iq(app_client, complete=True)
+    # Una muestra por modo: el principal y los dos del shadow scoring.
+    assert sorted(len(samples) for samples in norm_repo.samples().values()) == [1, 1, 1]
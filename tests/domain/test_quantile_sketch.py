@@ -0,0 +1,72 @@
+import math
+import random
+
+import pytest
+
+from app.domain.services.quantile_sketch import DDSketch
+
+QUANTILES = (0.01, 0.1, 0.5, 0.9, 0.95, 0.99)
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+def _assert_relative_error(sketch, values, accuracy):
+    for q in QUANTILES:
+        exact = _exact(values, q)
+        assert sketch.quantile(q) == pytest.approx(exact, rel=accuracy), q
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.02, 0.05])
+def test_quantiles_within_relative_accuracy(accuracy):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(6, 1.2) for _ in range(20_000)]
+    sketch = DDSketch(relative_accuracy=accuracy)
+    for value in values:
+        sketch.add(value)
+    assert sketch.count == len(values)
+    _assert_relative_error(sketch, values, accuracy)
+
+
+def test_merge_matches_single_sketch():
+    rng = random.Random(11)
+    left = [rng.expovariate(1 / 800) for _ in range(5_000)]
+    right = [rng.uniform(2_000, 9_000) for _ in range(3_000)] + [0.0] * 50
+    merged, a, b = DDSketch(), DDSketch(), DDSketch()
+    for value in left:
+        a.add(value)
+        merged.add(value)
+    for value in right:
+        b.add(value)
+        merged.add(value)
+    a.merge(b)
+    assert a.to_dict() == merged.to_dict()
+    _assert_relative_error(a, left + right, 0.01)
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        DDSketch(0.01).merge(DDSketch(0.02))
+
+
+def test_collapse_keeps_high_quantiles():
+    rng = random.Random(3)
+    values = [10 ** rng.uniform(-3, 6) for _ in range(10_000)]
+    sketch = DDSketch(relative_accuracy=0.01, max_bins=128)
+    for value in values:
+        sketch.add(value)
+    assert len(sketch.to_dict()["bins"]) <= 128
+    for q in (0.9, 0.99):
+        assert sketch.quantile(q) == pytest.approx(_exact(values, q), rel=0.01)
+
+
+def test_round_trip_and_empty():
+    assert DDSketch().quantile(0.5) is None
+    sketch = DDSketch()
+    for value in (1, 5, 50, 500):
+        sketch.add(value)
+    restored = DDSketch.from_dict(sketch.to_dict())
+    assert restored.quantile(0.5) == sketch.quantile(0.5)
+    assert (restored.min, restored.max) == (1, 500)
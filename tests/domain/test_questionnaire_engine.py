@@ -0,0 +1,93 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from app.domain.entities.questionnaire_session import QuestionnaireSession
+from app.domain.exceptions import InvalidAnswerError, QuestionnaireDefinitionError
+from app.domain.services.questionnaire_engine import compile_questionnaire
+
+FIXTURE = Path(__file__).resolve().parents[2] / "questionnaires" / "perfil-ahorrista" / "1.json"
+
+
+def _definition():
+    return {"slug": "perfil-ahorrista", "version": 1, **json.loads(FIXTURE.read_text(encoding="utf-8"))}
+
+
+def _run(questionnaire, options):
+    session = QuestionnaireSession("s1", questionnaire.slug, questionnaire.version, scores=questionnaire.new_scores())
+    for option_id in options:
+        assert session.current is not None
+        questionnaire.answer(session, option_id)
+    return session
+
+
+def test_recorrido_completo_con_regla_de_puntaje_y_pregunta_omitida():
+    questionnaire = compile_questionnaire(_definition())
+    # 11 (+3) -> 23 (+3) -> 31 (+2, y la regla suma inversión con ahorro >= 5) -> omitir 4 -> 51 (+2)
+    session = _run(questionnaire, [11, 23, 31, None, 51])
+    assert session.current is None
+    scores = dict(zip(questionnaire.dimensions, session.scores))
+    assert scores == {"total": 11.0, "ahorro": 10.0, "inversion": 1.0}
+    assert questionnaire.profile(session.scores).code == "ahorrista"
+    assert session.answers == [(1, 11), (2, 23), (3, 31), (4, None), (5, 51)]
+
+
+def test_next_question_id_y_goto_por_puntaje_saltan_preguntas():
+    questionnaire = compile_questionnaire(_definition())
+    session = _run(questionnaire, [13])
+    # "Nunca" salta directo a la pregunta 3.
+    assert questionnaire.questions[session.current].question_id == 3
+    # Con ahorro <= 2 la regla de la pregunta 3 salta a la 5.
+    questionnaire.answer(session, 32)
+    assert questionnaire.questions[session.current].question_id == 5
+    questionnaire.answer(session, 53)
+    assert session.current is None
+    assert questionnaire.profile(session.scores).code == "gastador"
+
+
+def test_respuestas_invalidas():
+    questionnaire = compile_questionnaire(_definition())
+    session = _run(questionnaire, [])
+    with pytest.raises(InvalidAnswerError):
+        questionnaire.answer(session, 99)
+    # La pregunta 1 es obligatoria: no se puede omitir.
+    with pytest.raises(InvalidAnswerError):
+        questionnaire.answer(session, None)
+    assert session.current == 0 and session.answers == []
+
+
+def test_payload_de_pregunta():
+    payload = compile_questionnaire(_definition()).questions[3].payload
+    assert payload["question_id"] == 4 and payload["is_required"] is False
+    assert (payload["position"], payload["total"]) == (4, 5)
+    assert [o["option_id"] for o in payload["options"]] == [41, 42, 43]
+
+
+def _broken(mutate):
+    definition = copy.deepcopy(_definition())
+    mutate(definition)
+    return definition
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda d: d.update(questions=[]),
+        lambda d: d.update(profiles=[]),
+        lambda d: d["questions"][1].update(id=1),
+        lambda d: d["questions"][1].update(order=1),
+        lambda d: d["questions"][1].update(type="free_text"),
+        lambda d: d["questions"][1].update(options=[]),
+        lambda d: d["questions"][2]["options"][0].update(next_question_id=1),
+        lambda d: d["questions"][0]["options"][0].update(next_question_id=42),
+        lambda d: d["questions"][2]["rules_json"]["next"].append({"when": {"weekday": 1}, "goto": 5}),
+        lambda d: d["profiles"][1].update(min_score=5),
+        lambda d: d["profiles"][1].update(min_score=3),
+    ],
+)
+def test_definiciones_invalidas_se_rechazan_al_compilar(mutate):
+    with pytest.raises(QuestionnaireDefinitionError):
+        compile_questionnaire(_broken(mutate))
+
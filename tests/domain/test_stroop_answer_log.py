@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from app.application.use_cases.stroop_finish import FinishStroopUseCase
+from app.domain.entities.stroop_session import RT_MS_MAX, STROOP_TRIAL_TYPES, StroopAnswer, StroopAnswerLog
+from app.domain.services.stroop_engine import StroopEngine
+from app.domain.value_objects.test_config import STROOP_RULES
+
+
+def _list_score(answers):
+    """Scoring previo a las columnas, sobre la lista de `StroopAnswer`."""
+    total = len(answers)
+    incong = [a for a in answers if a.trial.trial_type == "incongruente"]
+    cong = [a for a in answers if a.trial.trial_type == "congruente"]
+    correct = sum(1 for a in answers if a.correct)
+    correct_incong = sum(1 for a in incong if a.correct)
+    accuracy_weighted = (correct + correct_incong * 0.2) / total
+
+    def avg_rt(arr):
+        vals = [a.rt_ms for a in arr if a.rt_ms > 0]
+        return sum(vals) / len(vals) if vals else 0
+
+    rt_incong, rt_cong = avg_rt(incong), avg_rt(cong)
+    stroop_control = 1.0
+    if rt_cong and rt_incong:
+        stroop_control = max(0.0, min(1.0, 1 - (rt_incong - rt_cong) / 800.0))
+    switch_errors = sum(1 for a in answers if a.rule_changed_before and not a.correct)
+    switch_trials = max(1, sum(1 for a in answers if a.rule_changed_before))
+    impulse_errors = sum(1 for a in answers if a.rt_ms < 2500 and not a.correct)
+    score = (
+        0.40 * accuracy_weighted
+        + 0.20 * stroop_control
+        + 0.25 * (1 - switch_errors / switch_trials)
+        + 0.15 * (1 - impulse_errors / max(1, total))
+    ) * 100
+    return max(0, min(100, round(score, 1)))
+
+
+@pytest.fixture
+def engine():
+    return StroopEngine()
+
+
+def test_views_decode_every_trial(engine):
+    trials = engine.all_trials()
+    log = StroopAnswerLog()
+    for n, trial in enumerate(trials):
+        log.append(StroopAnswer(trial, trial.expected, n % 2 == 0, n, n % 3 == 0))
+    assert len(log) == len(trials)
+    assert [STROOP_TRIAL_TYPES[code] for code in log.trial_types()] == [t.trial_type for t in trials]
+    assert [STROOP_RULES[code] for code in log.rules()] == [t.rule_id for t in trials]
+    assert list(log.correct()) == [1 if n % 2 == 0 else 0 for n in range(len(trials))]
+    assert list(log.rule_changed()) == [1 if n % 3 == 0 else 0 for n in range(len(trials))]
+    assert list(log.rt_ms) == list(range(len(trials)))
+
+
+def test_register_answer_clamps_rt_and_unknown_selection(engine):
+    session, trial = engine.start_session("s-clamp")
+    engine.register_answer(session, trial, ["no-es-color"], 10**12)
+    engine.register_answer(session, trial, None, -40)
+    assert list(session.answers.rt_ms) == [RT_MS_MAX, 0]
+    assert [flags & 7 for flags in session.answers.flags] == [7, 7]
+
+
+def test_score_matches_list_based_scoring(engine):
+    rng = random.Random(50)
+    random.seed(50)  # el motor sortea trials con el `random` del módulo
+    scorer = FinishStroopUseCase.__new__(FinishStroopUseCase)
+    for n in range(200):
+        session, trial = engine.start_session(f"s{n}")
+        answers = []
+        while trial is not None:
+            selected = trial.expected if rng.random() < 0.7 else rng.choice(engine.COLORS + [None, "x"])
+            rt_ms = rng.choice([-5, 0, 400, 1200, 3000, 9000])
+            answers.append(engine.register_answer(session, trial, selected, rt_ms))
+            trial = engine.next_trial(session)
+        assert scorer._score(session)["score"] == _list_score(answers), n
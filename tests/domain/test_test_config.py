@@ -0,0 +1,56 @@
+import pytest
+
+from app.domain.value_objects import test_config
+from app.domain.value_objects.test_config import DEFAULT_IQ_CONFIG, DEFAULT_SCORING_PARAMS
+
+# Se importa el módulo y no la clase: pytest intentaría recolectar `TestVersionConfig` como tests.
+build = test_config.TestVersionConfig.build
+
+
+def test_defaults_and_overrides():
+    assert build("iq-general", 1, None).iq == DEFAULT_IQ_CONFIG
+    config = build(
+        "iq-general",
+        "3",
+        {
+            "iq": {"n_items": 12, "time_limits": {"5": 60}},
+            "scoring": {"eta": 1},
+            "stroop": {"rule_cycle": ["word", "ink"]},
+            "profile_dimension": "estilo",
+        },
+    )
+    assert config.version == 3
+    assert config.iq.n_items == 12
+    # Las dificultades no indicadas heredan el default; las claves JSON se pasan a int.
+    assert dict(config.iq.time_limits) == {**DEFAULT_IQ_CONFIG.time_limits, 5: 60}
+    assert config.scoring.eta == 1.0 and isinstance(config.scoring.eta, float)
+    assert config.scoring.time_k == DEFAULT_SCORING_PARAMS.time_k
+    assert config.stroop.rule_cycle == ("word", "ink")
+    assert config.iq_payload["n_items"] == 12 and config.iq_payload["time_limits"][5] == 60
+
+
+@pytest.mark.parametrize(
+    "config_json, message",
+    [
+        ({"iqq": {}}, "secciones de config desconocidas: iqq"),
+        ({"iq": {"items": 10}}, "claves desconocidas en iq: items"),
+        ({"iq": {"n_items": 10.5}}, "iq.n_items"),
+        ({"iq": {"n_items": True}}, "iq.n_items"),
+        ({"iq": {"n_items": "10"}}, "iq.n_items"),
+        ({"iq": {"n_items": 0}}, "n_items y score_max"),
+        ({"iq": {"time_limits": [25, 25]}}, "objeto por dificultad"),
+        ({"iq": {"time_limits": {"6": 30}}}, "iq.time_limits: se requieren las dificultades"),
+        ({"iq": {"time_limits": {"1": 0}}}, "los tiempos deben ser positivos"),
+        ({"scoring": {"eta": 0}}, "eta y theta_scale"),
+        ({"scoring": {"time_min": 1.2, "time_max": 1.1}}, "time_min <= time_max"),
+        ({"scoring": {"t_ref_by_difficulty": {"3": -1}}}, "t_ref_by_difficulty"),
+        ({"stroop": {"rule_cycle": []}}, "sin repetir"),
+        ({"stroop": {"rule_cycle": ["ink", "ink"]}}, "sin repetir"),
+        ({"stroop": {"rule_cycle": ["ink", "shape"]}}, "reglas válidas"),
+        ({"stroop": {"rule_cycle": "ink"}}, "lista de strings"),
+        ({"stroop": {"max_trials": 0}}, "change_threshold y max_trials"),
+    ],
+)
+def test_build_rejects_invalid_config(config_json, message):
+    with pytest.raises(ValueError, match=message):
+        build("iq-general", 2, config_json)
@@ -0,0 +1,137 @@
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("numpy")  # dependencia opcional del job de rollup
+
+from app.infrastructure.repositories.daily_rollup_sinks import JsonFileDailyRollupSink, PostgresDailyRollupSink
+from app.infrastructure.services.daily_rollup import DailyRollup, DailyRollupJob
+
+DAY = 20_000 * 86400  # 2024-10-04
+DAY_ISO = "2024-10-04"
+
+
+def _segment(directory, name, records):
+    with gzip.open(directory / f"events-{name}.ndjson.gz", "wt", encoding="utf-8") as fh:
+        for record in records:
+            fh.write(json.dumps(record) + "\n")
+
+
+def _event(event, session_id, ts=DAY, test="iq-general", **data):
+    return {"ts": ts, "test": test, "version": 1, "event": event, "session_id": session_id, **data}
+
+
+class _Sink:
+    def __init__(self):
+        self.rollups = []
+
+    def upsert(self, rollup):
+        self.rollups.append(rollup)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    directory = tmp_path / "journal"
+    directory.mkdir()
+    _segment(
+        directory,
+        "0001",
+        [
+            _event("start", "a", source="qr"),
+            _event("answer", "a", item_id="X"),
+            _event("finish", "a", source="qr", duration_sec=100, band="alto"),
+            _event("start", "b"),
+            _event("finish", "b", duration_sec=50, band="medio"),
+            _event("start", "c"),
+            _event("abandon", "c", answers=2),
+            _event("start", "d", ts=DAY + 86400, test="stroop-wcst"),
+            _event("finish", "d", ts=DAY + 86400, test="stroop-wcst", duration_sec=30, profile_code="flexible"),
+        ],
+    )
+    return directory
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 50_000])
+def test_aggregates_match_events(journal, chunk_size):
+    sink = _Sink()
+    stats = DailyRollupJob(journal, sink, journal / ".ckpt.json", chunk_size=chunk_size).run()
+    assert stats == {"segments": 1, "events": 9, "rows": 3}
+    rollup = sink.rollups[0]
+    iq = (DAY_ISO, "iq-general", 1, "", "")
+    iq_qr = (DAY_ISO, "iq-general", 1, "qr", "")
+    stroop = ("2024-10-05", "stroop-wcst", 1, "", "")
+    assert rollup.daily == {iq_qr: [1, 1, 100], iq: [2, 1, 50], stroop: [1, 1, 30]}
+    assert rollup.profiles == {(iq_qr, "alto"): 1, (iq, "medio"): 1, (stroop, "flexible"): 1}
+    # El abandono se atribuye a la pregunta siguiente a la última respondida.
+    assert rollup.drops == {(iq, 3): 1}
+
+
+def test_checkpoint_only_processes_new_segments(journal, tmp_path):
+    output = tmp_path / "rollup.json"
+    job = DailyRollupJob(journal, JsonFileDailyRollupSink(output), journal / ".ckpt.json")
+    job.run()
+    assert job.run() == {"segments": 0, "events": 0, "rows": 0}
+    _segment(journal, "0002", [_event("start", "e"), _event("finish", "e", duration_sec=150, band="medio")])
+    assert job.run()["segments"] == 1
+    row = json.loads(output.read_text())[f"{DAY_ISO}|iq-general|1||"]
+    assert (row["starts"], row["finishes"], row["avg_time_sec"]) == (3, 2, 100)
+    assert row["profiles"] == {"medio": 2} and row["drops"] == {"3": 1}
+
+
+class _Cursor:
+    def __init__(self, questions):
+        self.questions = questions
+        self.upserted = []
+        self._row = None
+
+    def execute(self, sql, params):
+        if "FROM test_versions" in sql:
+            self._row = (10,)
+        elif "FROM questions" in sql:
+            self._row = (self.questions[params[1]],) if params[1] in self.questions else None
+        elif "analytics_daily_question" in sql:
+            self.upserted.append(params)
+        elif "RETURNING id" in sql:
+            self._row = (99,)
+
+    def fetchone(self):
+        return self._row
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _Connection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self):
+        return self._cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_postgres_sink_skips_drops_without_questions_row(caplog):
+    cursor = _Cursor(questions={2: 501})
+    sink = PostgresDailyRollupSink.__new__(PostgresDailyRollupSink)
+    sink._dsn = "postgres://test"
+    sink._psycopg = type("psycopg", (), {"connect": staticmethod(lambda dsn: _Connection(cursor))})
+    quiz = (DAY_ISO, "habitos-ahorro", 1, "", "")
+    iq = (DAY_ISO, "iq-general", 1, "", "")
+    rollup = DailyRollup(
+        daily={quiz: [3, 0, 0], iq: [1, 0, 0]},
+        drops={(quiz, 2): 2, (quiz, 7): 1, (iq, 4): 1},
+    )
+    with caplog.at_level("INFO", logger="app.rollup"):
+        sink.upsert(rollup)
+    assert cursor.upserted == [(99, 501, 2)]
+    assert "iq-general reason=no_questions drops=1" in caplog.text
+    assert "habitos-ahorro reason=unknown_position drops=1" in caplog.text
@@ -0,0 +1,52 @@
+import gzip
+
+from app.infrastructure.services.event_journal import (
+    AsyncFileEventJournal,
+    iter_segment_records,
+    list_closed_segments,
+)
+
+
+def _records(directory):
+    return [record for path in list_closed_segments(directory) for record in iter_segment_records(path)]
+
+
+def test_flush_writes_closed_segment_in_order(tmp_path):
+    journal = AsyncFileEventJournal(tmp_path)
+    journal._ensure_thread = lambda: None  # sin hilo escritor: el test escribe con flush
+    journal.record("iq-general", 1, "start", "s1", {"source": "qr"})
+    journal.record("iq-general", 1, "answer", "s1", {"item_id": "A", "seconds": 3.5})
+    journal.record("iq-general", 1, "finish", "s1")
+    journal.flush()
+    records = _records(tmp_path)
+    assert [r["event"] for r in records] == ["start", "answer", "finish"]
+    assert records[0]["source"] == "qr" and records[1]["seconds"] == 3.5
+    assert not list(tmp_path.glob("*.part"))
+    assert journal.stats() == {"queued": 0, "written": 3, "dropped": 0, "segments": 1}
+
+
+def test_full_queue_drops_events(tmp_path):
+    journal = AsyncFileEventJournal(tmp_path, capacity=2)
+    journal._ensure_thread = lambda: None
+    for n in range(5):
+        journal.record("stroop-wcst", 1, "answer", f"s{n}")
+    assert journal.stats()["dropped"] == 3
+    journal.flush()
+    assert [r["session_id"] for r in _records(tmp_path)] == ["s0", "s1"]
+
+
+def test_segments_rotate_by_size(tmp_path):
+    journal = AsyncFileEventJournal(tmp_path, batch_size=1, segment_max_bytes=1)
+    journal._ensure_thread = lambda: None
+    for n in range(3):
+        journal.record("iq-general", 1, "start", f"s{n}")
+    journal.flush()
+    assert len(list_closed_segments(tmp_path)) == 3
+    assert [r["session_id"] for r in _records(tmp_path)] == ["s0", "s1", "s2"]
+
+
+def test_truncated_segment_yields_complete_lines(tmp_path):
+    path = tmp_path / "events-20260101T000000-1-0001.ndjson.gz"
+    data = gzip.compress(b'{"event":"start"}\n{"event":"answer"}\n{"event":"fin')
+    path.write_bytes(data[:-12])
+    assert [r["event"] for r in iter_segment_records(path)] == ["start", "answer"]
@@ -0,0 +1,82 @@
+import json
+import logging
+
+import pytest
+
+from app.iq_items import get_item_pool
+from app.infrastructure.providers.file_iq_item_provider import FileIqItemProvider, load_item_bank, write_item_bank
+from app.infrastructure.providers.static_iq_item_provider import StaticIqItemProvider
+
+
+def _rewrite(path, version, prompt_prefix=""):
+    data = json.loads(path.read_text())
+    data["version"] = version
+    for spec in data["items"]:
+        spec["prompt"] = prompt_prefix + spec["prompt"]
+    # Un ítem más: cambia el tamaño y con él el stamp, aunque el mtime no avance.
+    data["items"].append(dict(data["items"][0], id=f"EXTRA-{len(data['items'])}"))
+    path.write_text(json.dumps(data))
+
+
+@pytest.fixture
+def bank_path(tmp_path):
+    path = tmp_path / "banco.json"
+    write_item_bank(path, "v1", get_item_pool())
+    return path
+
+
+@pytest.fixture
+def provider(bank_path):
+    return FileIqItemProvider(bank_path, StaticIqItemProvider().get_bank(), keep_versions=2)
+
+
+@pytest.mark.parametrize("name", ["banco.json", "banco.sqlite"])
+def test_round_trip(tmp_path, name):
+    write_item_bank(tmp_path / name, "v1", get_item_pool())
+    bank = load_item_bank(tmp_path / name)
+    assert bank.version == "v1" and bank.items == tuple(get_item_pool())
+
+
+def test_reload_keeps_previous_versions_for_running_sessions(provider, bank_path):
+    assert provider.get_bank().version == "v1" and provider.refresh() is False
+    _rewrite(bank_path, "v2", "V2 ")
+    assert provider.refresh() is True
+    assert provider.get_bank().items[0].prompt.startswith("V2 ")
+    assert not provider.get_bank("v1").items[0].prompt.startswith("V2 ")
+
+
+def test_broken_file_keeps_the_current_bank(provider, bank_path):
+    bank_path.write_text("{roto")
+    with pytest.raises(ValueError):
+        provider.refresh()
+    assert provider.get_bank().version == "v1" and provider.refresh() is False
+
+
+def test_evicted_version_falls_back_and_is_counted(provider, bank_path):
+    for version in ("v2", "v3"):
+        _rewrite(bank_path, version)
+        provider.refresh()
+    assert provider.get_bank("v1").version == "v3"
+    assert provider.stats()["stale_fallbacks"] == 1 and provider.stats()["versions"] == 2
+
+
+def test_content_change_without_new_version_is_reported(provider, bank_path, caplog):
+    _rewrite(bank_path, "v1", "CAMBIO ")
+    with caplog.at_level(logging.WARNING, logger="app.item_bank"):
+        assert provider.refresh() is False
+    assert "item_bank_version_unchanged version=v1" in caplog.text
+    assert provider.stats()["ignored_changes"] == 1
+    assert not provider.get_bank().items[0].prompt.startswith("CAMBIO ")
+
+
+def test_session_keeps_its_bank_version_across_reloads(make_client, bank_path):
+    client = make_client(ITEM_BANK_PATH=str(bank_path), ITEM_BANK_RELOAD_SEC="0")
+    container = client.application.extensions["container"]
+    start = client.post("/api/iq/start?block_size=2").get_json()
+    assert container.session_repo.get(start["session_id"]).bank_version == "v1"
+    _rewrite(bank_path, "v2", "V2 ")
+    container._reload_item_bank()
+    answers = [{"item_id": item["item_id"], "answer": "x"} for item in start["block"]]
+    reply = client.post("/api/iq/answer", json={"session_id": start["session_id"], "answers": answers}).get_json()
+    assert not reply["block"][0]["prompt"].startswith("V2 ")
+    assert client.post("/api/iq/start?block_size=2").get_json()["block"][0]["prompt"].startswith("V2 ")
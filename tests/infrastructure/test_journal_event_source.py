@@ -0,0 +1,43 @@
+import calendar
+import gzip
+import json
+
+from app.infrastructure.services.journal_event_source import JournalEventSource
+
+JAN_1 = calendar.timegm((2026, 1, 1, 0, 0, 0))
+
+
+def _segment(directory, stamp, records, suffix=".ndjson.gz"):
+    with gzip.open(directory / f"events-{stamp}-100-0001{suffix}", "wt", encoding="utf-8") as fh:
+        for record in records:
+            fh.write(json.dumps(record) + "\n")
+
+
+def _ids(source, since=None, until=None, test=None):
+    return [record["session_id"] for record in source.iter_events(since, until, test)]
+
+
+def test_filters_by_window_and_test_across_closed_and_open_segments(tmp_path):
+    _segment(tmp_path, "20260101T000000", [
+        {"ts": JAN_1 + 10, "test": "iq-general", "session_id": "a"},
+        {"ts": JAN_1 + 86400, "test": "stroop-wcst", "session_id": "b"},
+    ])
+    _segment(tmp_path, "20260102T120000", [{"ts": JAN_1 + 1.5 * 86400, "test": "iq-general", "session_id": "c"}],
+             suffix=".ndjson.gz.part")
+    source = JournalEventSource(tmp_path)
+    assert _ids(source) == ["a", "b", "c"]
+    assert _ids(source, test="iq-general") == ["a", "c"]
+    assert _ids(source, until=JAN_1 + 86400) == ["a"]
+    assert _ids(source, since=JAN_1 + 86400, until=JAN_1 + 2 * 86400) == ["b", "c"]
+
+
+def test_segment_stamp_is_utc(tmp_path):
+    # Un segmento abierto después de `until` (hora UTC del nombre) se poda sin leerlo.
+    _segment(tmp_path, "20260102T000001", [{"ts": JAN_1, "test": "iq-general", "session_id": "late-stamp"}])
+    source = JournalEventSource(tmp_path)
+    assert _ids(source, until=JAN_1 + 86400) == []
+    assert _ids(source, until=JAN_1 + 86401) == ["late-stamp"]
+
+
+def test_missing_directory_is_empty(tmp_path):
+    assert _ids(JournalEventSource(tmp_path / "nada")) == []
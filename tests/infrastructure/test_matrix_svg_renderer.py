@@ -0,0 +1,52 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from app.domain.services.matrix_generator import MatrixItemGenerator
+from app.infrastructure.services.matrix_svg_renderer import PARTS, CachedMatrixSvgRenderer
+
+SVG = "{http://www.w3.org/2000/svg}"
+TOKEN = "m1-d5-s7"
+
+
+@pytest.fixture
+def renderer():
+    return CachedMatrixSvgRenderer(MatrixItemGenerator())
+
+
+def test_parts_are_well_formed_svg(renderer):
+    puzzle = MatrixItemGenerator().puzzle(TOKEN)
+    for part in PARTS:
+        svg, etag = renderer.render(TOKEN, part)
+        root = ET.fromstring(svg)
+        assert root.tag == f"{SVG}svg" and etag == renderer.etag(TOKEN, part)
+    base = ET.fromstring(renderer.render(TOKEN, "base")[0])
+    # 8 celdas visibles + la del "?": la respuesta nunca se dibuja en la grilla.
+    assert len([rect for rect in base.iter(f"{SVG}rect") if rect.get("rx") == "8"]) == 9
+    assert base.find(f"{SVG}text").text == "?"
+    option = ET.fromstring(renderer.render(TOKEN, "a")[0])
+    assert len(list(option)) == 1 + puzzle.options[0].count
+
+
+def test_cache_hits_and_byte_bound():
+    renderer = CachedMatrixSvgRenderer(MatrixItemGenerator(), max_bytes=4_000)
+    first, _ = renderer.render(TOKEN, "base")
+    assert renderer.render(TOKEN, "base")[0] is first
+    for seed in range(1, 30):
+        renderer.render(f"m1-d3-s{seed}", "a")
+    stats = renderer.stats()
+    assert stats["hits"] == 1 and stats["bytes"] <= 4_000
+    assert stats["entries"] < 30
+
+
+def test_invalid_part_is_rejected(renderer):
+    with pytest.raises(ValueError):
+        renderer.etag(TOKEN, "e")
+
+
+def test_route_answers_304_for_a_known_etag(app_client):
+    first = app_client.get(f"/api/matrix/{TOKEN}/base.svg")
+    assert first.status_code == 200 and first.mimetype == "image/svg+xml"
+    again = app_client.get(f"/api/matrix/{TOKEN}/base.svg", headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert app_client.get("/api/matrix/m1-d9-s1/base.svg").status_code == 404
@@ -0,0 +1,21 @@
+import os
+
+from app.infrastructure.observability.profiler import RequestProfiler
+
+
+def _profile_request(profiler, route):
+    handle = profiler.begin(route, "/api/iq/start", header_token="tok")
+    assert handle is not None
+    profiler.end(handle)
+
+
+def test_rotation_only_removes_profiler_output(tmp_path):
+    foreign = [tmp_path / "app.log", tmp_path / "notes.txt", tmp_path / "dump.json"]
+    for n, path in enumerate(foreign):
+        path.write_text("ajeno")
+        os.utime(path, (n, n))  # más viejos que cualquier perfil
+    profiler = RequestProfiler(tmp_path, max_files=2, token="tok")
+    for n in range(4):
+        _profile_request(profiler, f"/api/iq/start/{n}")
+    assert all(path.exists() for path in foreign)
+    assert len(list(tmp_path.glob("*.pstats"))) == 2
@@ -0,0 +1,95 @@
+import threading
+import time
+
+from app.domain.entities.share_result import ShareResult
+from app.infrastructure.services.share_card_cache import DiskShareCardCache
+from app.infrastructure.services.share_card_renderer import SvgShareCardRenderer
+
+
+class _SlowRenderer:
+    media_type = "image/svg+xml"
+
+    def __init__(self, size=100, delay=0.0):
+        self.size = size
+        self.delay = delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def render(self, share):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return share.share_token.encode("ascii").ljust(self.size, b"#")
+
+
+def _share(token):
+    return ShareResult(token, "s", "iq", 1, "Test IQ", "110-119", "Por encima del promedio", score=112)
+
+
+def test_render_una_vez_por_token(tmp_path):
+    renderer = _SlowRenderer(delay=0.05)
+    cache = DiskShareCardCache(renderer, tmp_path)
+    share = _share("tokenAAAA")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.render(share))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Los pedidos concurrentes esperan el mismo render.
+    assert renderer.calls == 1
+    assert len({etag for _, etag in results}) == 1
+    assert (tmp_path / "tokenAAAA.svg").read_bytes() == results[0][0]
+    assert cache.get("tokenAAAA") == results[0]
+    cache.prerender(share)
+    assert renderer.calls == 1 and cache.stats()["hits"] >= 1
+
+
+def test_desaloja_las_menos_usadas_por_bytes(tmp_path):
+    cache = DiskShareCardCache(_SlowRenderer(size=100), tmp_path, max_bytes=250)
+    for token in ("tokenAAAA", "tokenBBBB"):
+        cache.render(_share(token))
+    cache.get("tokenAAAA")  # A pasa a ser la más usada
+    cache.render(_share("tokenCCCC"))
+    assert cache.get("tokenBBBB") is None and not (tmp_path / "tokenBBBB.svg").exists()
+    assert cache.get("tokenAAAA") is not None
+    assert cache.stats()["bytes"] == 200 and cache.stats()["evictions"] == 1
+
+
+def test_indice_se_reconstruye_desde_el_directorio(tmp_path):
+    first = DiskShareCardCache(_SlowRenderer(), tmp_path)
+    card, etag = first.render(_share("tokenAAAA"))
+    renderer = _SlowRenderer()
+    second = DiskShareCardCache(renderer, tmp_path)
+    assert second.get("tokenAAAA") == (card, etag)
+    assert renderer.calls == 0
+
+
+def test_archivo_borrado_por_otro_proceso_se_vuelve_a_encolar(tmp_path):
+    renderer = _SlowRenderer()
+    cache = DiskShareCardCache(renderer, tmp_path)
+    share = _share("tokenAAAA")
+    cache.render(share)
+    (tmp_path / "tokenAAAA.svg").unlink()
+    card, _ = cache.render(share)
+    assert renderer.calls == 2
+    assert (tmp_path / "tokenAAAA.svg").read_bytes() == card
+
+
+def test_svg_escapa_el_texto():
+    share = ShareResult("tokenAAAA", "s", "q", 1, "Test <b>", "p", "A & B", summary="x" * 200)
+    svg = SvgShareCardRenderer().render(share).decode("utf-8")
+    assert "Test &lt;b&gt;" in svg and "A &amp; B" in svg and "Puntaje" not in svg
+    assert svg.count("…") == 1
+
+
+def test_endpoint_de_tarjeta(app_client):
+    session_id = app_client.post("/api/q/perfil-ahorrista/start").get_json()["session_id"]
+    for option_id in (13, 32, 53):
+        app_client.post("/api/q/answer", json={"session_id": session_id, "option_id": option_id})
+    share_url = app_client.post("/api/q/finish", json={"session_id": session_id}).get_json()["share_url"]
+    card = app_client.get(share_url + "/card")
+    assert card.status_code == 200 and card.mimetype == "image/svg+xml"
+    assert b"Gastador" in card.get_data()
+    assert app_client.get(share_url + "/card", headers={"If-None-Match": card.headers["ETag"]}).status_code == 304
+    assert app_client.get("/r/inexistente123/card").status_code == 404
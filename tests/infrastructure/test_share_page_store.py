@@ -0,0 +1,34 @@
+import pytest
+
+from app.infrastructure.services.share_page_store import CachedSharePageStore
+
+TOKEN_A = "tokenAAAA"
+TOKEN_B = "tokenBBBB"
+
+
+def test_lru_acotado_en_bytes_sin_disco():
+    store = CachedSharePageStore(max_bytes=10)
+    etag = store.put(TOKEN_A, b"123456")
+    assert store.get(TOKEN_A) == (b"123456", etag)
+    store.put(TOKEN_B, b"abcdef")
+    # No entran las dos: se desaloja la menos usada y, sin disco, se pierde.
+    assert store.get(TOKEN_A) is None
+    assert store.get(TOKEN_B)[0] == b"abcdef"
+    assert store.stats()["bytes"] == 6
+
+
+def test_pagina_desalojada_se_relee_de_disco(tmp_path):
+    store = CachedSharePageStore(tmp_path, max_bytes=10)
+    etag = store.put(TOKEN_A, b"123456")
+    store.put(TOKEN_B, b"abcdef")
+    # Mismo contenido, mismo ETag: la relectura no cambia lo que ya tienen los clientes.
+    assert store.get(TOKEN_A) == (b"123456", etag)
+    # Otro proceso que comparte el directorio también la encuentra.
+    assert CachedSharePageStore(tmp_path).get(TOKEN_B)[0] == b"abcdef"
+
+
+def test_tokens_invalidos():
+    store = CachedSharePageStore()
+    assert store.get("../../etc/passwd") is None
+    with pytest.raises(ValueError):
+        store.put("corto", b"x")
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+from app.infrastructure.repositories.in_memory_visitor_repository import InMemoryVisitorSketchRepository
+
+
+def test_snapshot_merges_peer_processes(tmp_path):
+    peer = InMemoryVisitorSketchRepository(export_dir=tmp_path)
+    local = InMemoryVisitorSketchRepository(export_dir=tmp_path)
+    for n in range(3_000):
+        peer.add("iq-general", "radio", f"v{n}")
+    for n in range(2_000, 5_000):
+        local.add("iq-general", "radio", f"v{n}")
+    local.add("stroop-wcst", None, "v1")
+    peer.publish()
+    # El snapshot propio se ignora al leer: se publica como si fuera de otro worker.
+    own = tmp_path / f"visitors-{os.getpid()}.json"
+    own.rename(tmp_path / "visitors-1.json")
+
+    merged = {key[1:]: sketch.estimate() for key, sketch in local.snapshot().items()}
+    assert merged[("iq-general", "radio")] == pytest.approx(5_000, rel=0.065)
+    assert merged[("stroop-wcst", "")] == pytest.approx(1, abs=0.5)